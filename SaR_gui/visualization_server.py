@@ -1,6 +1,7 @@
 import threading
 import logging
 from flask import Flask, render_template, request, jsonify, send_from_directory
+from loggers.TickMetrics import tick_metrics
 
 '''
 This file holds the code for the MATRX RESTful api. 
@@ -123,6 +124,17 @@ def external_media(filename):
     return send_from_directory(ext_media_folder, filename, as_attachment=True)
 
 
+@app.route('/metrics')
+def metrics():
+    """ Rolling percentiles of the time of every stage of the ticks of the world loop, and the number of overruns
+
+    Returns
+    -------
+        Returns a JSON object with the p50, p95, p99 and max milliseconds per stage, see loggers.TickMetrics
+    """
+    return jsonify(tick_metrics.snapshot())
+
+
 #########################################################################
 # Visualization Flask methods
 #########################################################################
@@ -1,11 +1,139 @@
+import weakref
+import functools
+import collections
 import numpy as np
 from matrx.actions.action import Action, ActionResult
 from matrx.objects.agent_body import AgentBody
 from matrx.objects.standard_objects import AreaTile
 from matrx.actions.object_actions import _is_drop_poss, _act_drop, _possible_drop, _find_drop_loc, GrabObject, GrabObjectResult, RemoveObject, RemoveObjectResult, DropObject
 from matrx.utils import get_distance
+from loggers.TickMetrics import tick_metrics
 import random
 
+
+def _reports_drop_zone_changes(mutate):
+    """ Decorator for the mutate method of actions that pick up or drop victims.
+    The goal of the world is told at which cells the victims were before and after the action, so it only checks
+    those drop zone cells again.
+    """
+    @functools.wraps(mutate)
+    def mutate_and_report(self, grid_world, agent_id, world_state, **kwargs):
+        objects = list(grid_world.registered_agents[agent_id].is_carrying)
+        if kwargs.get('object_id') in grid_world.environment_objects:
+            objects.append(grid_world.environment_objects[kwargs['object_id']])
+        locations = [obj.location for obj in objects]
+        result = mutate(self, grid_world, agent_id, world_state, **kwargs)
+        cell_changed = getattr(grid_world.simulation_goal, 'cell_changed', None)
+        if cell_changed is not None:
+            for location in locations + [obj.location for obj in objects]:
+                cell_changed(location)
+        return result
+    return mutate_and_report
+
+
+def _get_object(grid_world, object_id):
+    """ Looks up an object or agent of the world by its id.
+    Returns None when there is no such object or agent.
+    """
+    if object_id in grid_world.environment_objects:
+        return grid_world.environment_objects[object_id]
+    return grid_world.registered_agents.get(object_id)
+
+
+class CarriedObjects(list):
+    """ The objects carried by an agent, in the order in which they were picked up.
+    Behaves as the list MATRX expects for the is_carrying of an agent body, but also keeps the objects by their id so
+    the carry and drop actions find a carried object without going through the whole list.
+    """
+    def __init__(self, objects=()):
+        super().__init__(objects)
+        self._by_id = {obj.obj_id: obj for obj in self}
+
+    def get(self, obj_id):
+        """ Returns the carried object with the given id, or None when it is not carried.
+        """
+        return self._by_id.get(obj_id)
+
+    def append(self, obj):
+        super().append(obj)
+        self._by_id[obj.obj_id] = obj
+
+    def insert(self, index, obj):
+        super().insert(index, obj)
+        self._by_id[obj.obj_id] = obj
+
+    def extend(self, objects):
+        for obj in objects:
+            self.append(obj)
+
+    def remove(self, obj):
+        super().remove(obj)
+        self._by_id.pop(obj.obj_id, None)
+
+    def pop(self, index=-1):
+        obj = super().pop(index)
+        self._by_id.pop(obj.obj_id, None)
+        return obj
+
+    def clear(self):
+        super().clear()
+        self._by_id.clear()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._by_id = {obj.obj_id: obj for obj in self}
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._by_id = {obj.obj_id: obj for obj in self}
+
+    def __iadd__(self, objects):
+        self.extend(objects)
+        return self
+
+    def __reduce__(self):
+        # Copy and pickle as a new CarriedObjects of the same objects. The default of a list subclass appends the
+        # objects before it restores _by_id, so append would fail
+        return self.__class__, (list(self),)
+
+
+def _carried_objects(agent):
+    """ Returns the objects carried by the agent body. The is_carrying list MATRX gives an agent body is replaced by
+    CarriedObjects the first time.
+    """
+    if not isinstance(agent.is_carrying, CarriedObjects):
+        agent.is_carrying = CarriedObjects(agent.is_carrying)
+    return agent.is_carrying
+
+
+# Per world whether an object is an area tile, by object id. The class of an object never changes, also not when it is
+# dropped again under the same id
+_area_tiles = weakref.WeakKeyDictionary()
+
+
+def _cell_occupancy(grid_world, location, agent_id):
+    """ Counts the objects at a location of the world that are not area tiles, and how many of those are
+    intraversable. The agent with the given id is not counted.
+    The grid of the world keeps the ids of the objects at every location and is updated by the world when objects are
+    added, removed or moved, so only the few objects at the location are looked at.
+    """
+    area_tiles = _area_tiles.setdefault(grid_world, {})
+    nr_objects = nr_intraversable = 0
+    for obj_id in grid_world.grid[location[1], location[0]] or ():
+        if obj_id == agent_id:
+            continue
+        obj = _get_object(grid_world, obj_id)
+        if obj is None:
+            continue
+        if obj_id not in area_tiles:
+            area_tiles[obj_id] = AreaTile.__name__ in obj.class_inheritance
+        if not area_tiles[obj_id]:
+            nr_objects += 1
+            if not obj.is_traversable:
+                nr_intraversable += 1
+    return nr_objects, nr_intraversable
+
+
 class Idle(Action):
     """ Let's an agent be idle for a specified number of ticks.
     Parameters
@@ -28,6 +156,7 @@ class Idle(Action):
     def __init__(self, duration_in_ticks=1):
         super().__init__(duration_in_ticks)
 
+    @tick_metrics.timed('actions')
     def is_possible(self, grid_world, agent_id, **kwargs):
         return IdleResult(IdleResult.RESULT_SUCCESS, True)
 
@@ -65,6 +194,7 @@ class RemoveObjectTogether(Action):
     def __init__(self, duration_in_ticks=0):
         super().__init__(duration_in_ticks)
 
+    @tick_metrics.timed('actions')
     def mutate(self, grid_world, agent_id, world_state, **kwargs):
         """ Removes the specified object.
         Removes a specific :class:`matrx.objects.env_object.EnvObject` from
@@ -112,15 +242,13 @@ class RemoveObjectTogether(Action):
         agent_avatar = grid_world.registered_agents[agent_id]
         agent_loc = agent_avatar.location  # current location
 
-        # Get all objects in the remove_range
-        objects_in_range = grid_world.get_objects_in_range(agent_loc, object_type="*", sense_range=remove_range)
-
-        # You can't remove yourself
-        objects_in_range.pop(agent_id)
-
-        for obj in objects_in_range:  # loop through all objects in range
-            if obj == object_id and get_distance(other_agent['location'], world_state[obj]['location'])<=remove_range and get_distance(other_human['location'], world_state[obj]['location'])<=remove_range and 'rock' in obj or \
-            obj == object_id and get_distance(other_agent['location'], world_state[obj]['location'])<=remove_range and get_distance(other_human['location'], world_state[obj]['location'])<=remove_range and 'stone' in obj:  # if object is in that list
+        # Look up the object by its id and check that it is in the remove_range, you can't remove yourself
+        env_obj = _get_object(grid_world, object_id)
+        if env_obj is not None and object_id != agent_id and get_distance(env_obj.location, agent_loc) <= remove_range:
+            obj_loc = world_state[object_id]['location']
+            # rocks and stones can only be removed together, when both agents are in range of the object
+            if get_distance(other_agent['location'], obj_loc)<=remove_range and get_distance(other_human['location'], obj_loc)<=remove_range and \
+                    ('rock' in object_id or 'stone' in object_id):
                 success = grid_world.remove_from_grid(object_id)  # remove it, success is whether GridWorld succeeded
                 if success:  # if we succeeded in removal return the appropriate ActionResult
                     return RemoveObjectResult(RemoveObjectResult.OBJECT_REMOVED.replace('object_id'.upper(),
@@ -134,6 +262,7 @@ class RemoveObjectTogether(Action):
                                   .replace('remove_range'.upper(), str(remove_range))
                                   .replace('object_id'.upper(), str(object_id)), False)
 
+    @tick_metrics.timed('actions')
     def is_possible(self, grid_world, agent_id, **kwargs):
         """ Checks if an object can be removed.
         Parameters
@@ -166,25 +295,21 @@ class RemoveObjectTogether(Action):
         """
         agent_avatar = grid_world.get_env_object(agent_id, obj_type=AgentBody)  # get ourselves
         assert agent_avatar is not None  # check if we actually exist
-        agent_loc = agent_avatar.location  # get our location
 
         remove_range = np.inf  # we do not know the intended range, so assume infinite
-        # get all objects within infinite range
-        objects_in_range = grid_world.get_objects_in_range(agent_loc, object_type="*", sense_range=remove_range)
+        # all objects and agents are within infinite range, so count them instead of collecting them
+        nr_objects = len(grid_world.environment_objects) + len(grid_world.registered_agents) - 1
 
-        # You can't remove yourself
-        objects_in_range.pop(agent_avatar.obj_id)
-
-        if len(objects_in_range) == 0:  # if there are no objects in infinite range besides ourselves, we return fail
+        if nr_objects == 0:  # if there are no objects in infinite range besides ourselves, we return fail
             return RemoveObjectResult(RemoveObjectResult.NO_OBJECTS_IN_RANGE.replace('remove_range'.upper(),
                                                                                      str(remove_range)), False)
         # need an object id to remove an object
         if 'object_id' not in kwargs:
             return RemoveObjectResult(RemoveObjectResult.REMOVAL_FAILED.replace('object_id'.upper(),
                                                                                 str(None)), False)
-        # check if the object is actually within removal range
+        # check if the object exists by looking up its id, you can't remove yourself
         object_id = kwargs['object_id']
-        if object_id not in objects_in_range:
+        if object_id == agent_avatar.obj_id or _get_object(grid_world, object_id) is None:
             return RemoveObjectResult(RemoveObjectResult.REMOVAL_FAILED.replace('object_id'.upper(),
                                                                                 str(object_id)), False)
 
@@ -263,6 +388,7 @@ class CarryObject(Action):
     def __init__(self, duration_in_ticks=0):
         super().__init__(duration_in_ticks)
 
+    @tick_metrics.timed('actions')
     def is_possible(self, grid_world, agent_id, world_state, **kwargs):
         """ Checks if the object can be grabbed.
         Parameters
@@ -307,6 +433,8 @@ class CarryObject(Action):
             return _is_possible_grab(grid_world, agent_id=agent_id, object_id=object_id, grab_range=grab_range,
                                     max_objects=max_objects) 
 
+    @tick_metrics.timed('actions')
+    @_reports_drop_zone_changes
     def mutate(self, grid_world, agent_id, world_state, **kwargs):
         """ Grabs an object.
         Alters the properties of the agent doing the grabbing, and the object
@@ -365,7 +493,7 @@ class CarryObject(Action):
 
         # Updating properties
         env_obj.carried_by.append(agent_id)
-        reg_ag.is_carrying.append(env_obj)  # we add the entire object!
+        _carried_objects(reg_ag).append(env_obj)  # we add the entire object!
 
         if 'healthy' in object_id and kwargs['human_name'] in agent_id:
             reg_ag.change_property("img_name", "/images/carry-healthy-human.svg")
@@ -484,6 +612,7 @@ class Drop(Action):
     def __init__(self, duration_in_ticks=0):
         super().__init__(duration_in_ticks)
 
+    @tick_metrics.timed('actions')
     def is_possible(self, grid_world, agent_id, world_state, **kwargs):
         """ Checks if the object can be dropped.
         Parameters
@@ -537,6 +666,8 @@ class Drop(Action):
 
             
 
+    @tick_metrics.timed('actions')
+    @_reports_drop_zone_changes
     def mutate(self, grid_world, agent_id, world_state, **kwargs):
         """ Drops the carried object.
         Parameters
@@ -586,7 +717,7 @@ class Drop(Action):
         # If no object id is given, the last item is dropped
         if 'object_id' in kwargs:
             obj_id = kwargs['object_id']
-            env_obj = [obj for obj in reg_ag.is_carrying if obj.obj_id == obj_id][0]
+            env_obj = _carried_objects(reg_ag).get(obj_id)
         elif len(reg_ag.is_carrying) > 0:
             env_obj = reg_ag.is_carrying[-1]
         else:
@@ -704,6 +835,7 @@ class CarryObjectTogether(Action):
     def __init__(self, duration_in_ticks=0):
         super().__init__(duration_in_ticks)
 
+    @tick_metrics.timed('actions')
     def is_possible(self, grid_world, agent_id, world_state, **kwargs):
         """ Checks if the object can be grabbed.
         Parameters
@@ -748,6 +880,8 @@ class CarryObjectTogether(Action):
             return _is_possible_grab(grid_world, agent_id=agent_id, object_id=object_id, grab_range=grab_range,
                                  max_objects=max_objects)
 
+    @tick_metrics.timed('actions')
+    @_reports_drop_zone_changes
     def mutate(self, grid_world, agent_id, world_state, **kwargs):
         """ Grabs an object.
         Alters the properties of the agent doing the grabbing, and the object
@@ -806,7 +940,7 @@ class CarryObjectTogether(Action):
 
         # Updating properties
         env_obj.carried_by.append(agent_id)
-        reg_ag.is_carrying.append(env_obj)  # we add the entire object!
+        _carried_objects(reg_ag).append(env_obj)  # we add the entire object!
 
         other_agent_id = world_state[{"name": "RescueBot"}]['obj_id']
 
@@ -932,6 +1066,7 @@ class DropObjectTogether(Action):
     def __init__(self, duration_in_ticks=0):
         super().__init__(duration_in_ticks)
 
+    @tick_metrics.timed('actions')
     def is_possible(self, grid_world, agent_id, world_state, **kwargs):
         """ Checks if the object can be dropped.
         Parameters
@@ -979,6 +1114,8 @@ class DropObjectTogether(Action):
         else:
             return _possible_drop(grid_world, agent_id=agent_id, obj_id=obj_id, drop_range=drop_range)
 
+    @tick_metrics.timed('actions')
+    @_reports_drop_zone_changes
     def mutate(self, grid_world, agent_id, world_state, **kwargs):
         """ Drops the carried object.
         Parameters
@@ -1026,7 +1163,7 @@ class DropObjectTogether(Action):
         # If no object id is given, the last item is dropped
         if 'object_id' in kwargs:
             obj_id = kwargs['object_id']
-            env_obj = [obj for obj in reg_ag.is_carrying if obj.obj_id == obj_id][0]
+            env_obj = _carried_objects(reg_ag).get(obj_id)
         elif len(reg_ag.is_carrying) > 0:
             env_obj = reg_ag.is_carrying[-1]
         else:
@@ -1224,25 +1361,15 @@ def _is_drop_poss(grid_world, env_obj, drop_location, agent_id):
     """
 
     # Count the intraversable objects at the current location if we would drop the
-    # object here
-    objs_at_loc = grid_world.get_objects_in_range(drop_location, object_type="*", sense_range=0)
-
-    # Remove area objects from the list
-    for key in list(objs_at_loc.keys()):
-        if AreaTile.__name__ in objs_at_loc[key].class_inheritance:
-            objs_at_loc.pop(key)
-
-    # Remove the agent who drops the object from the list (an agent can always drop the
+    # object here. The agent who drops the object is not counted (an agent can always drop the
     # traversable object its carrying at its feet, even if the agent is intraversable)
-    if agent_id in objs_at_loc.keys():
-        objs_at_loc.pop(agent_id)
-
+    nr_objs_at_loc, nr_in_trav_objs_at_loc = _cell_occupancy(grid_world, drop_location, agent_id)
     in_trav_objs_count = 1 if not env_obj.is_traversable else 0
-    in_trav_objs_count += len([obj for obj in objs_at_loc if not objs_at_loc[obj].is_traversable])
+    in_trav_objs_count += nr_in_trav_objs_at_loc
 
     # check if we would have an in_traversable object and other objects in
     # the same location (which is impossible)
-    if in_trav_objs_count >= 1 and (len(objs_at_loc) + 1) >= 2:
+    if in_trav_objs_count >= 1 and (nr_objs_at_loc + 1) >= 2:
         return False
     else:
         return True
@@ -1287,7 +1414,7 @@ def _possible_drop(grid_world, agent_id, obj_id, drop_range):
         return DropObjectResult(DropObjectResult.RESULT_NONE_GIVEN, False)
 
     # No object with that name
-    if isinstance(obj_id, str) and not any([obj_id == obj.obj_id for obj in reg_ag.is_carrying]):
+    if isinstance(obj_id, str) and _carried_objects(reg_ag).get(obj_id) is None:
         return DropObjectResult(DropObjectResult.RESULT_NO_OBJECT, False)
 
     if len(loc_obj_ids) == 1:
@@ -1318,17 +1445,19 @@ def _find_drop_loc(grid_world, agent, env_obj, drop_range, start_loc):
     boolean
         False if no valid drop location can be found, otherwise the [x,y] coordinates of the closest drop location.
     """
-    queue = collections.deque([[start_loc]])
+    # Only the cells are queued, not the paths to them, as only the found cell is used
+    start_loc = tuple(start_loc)
+    queue = collections.deque([start_loc])
     seen = {start_loc}
 
     width = grid_world.shape[0]
     height = grid_world.shape[1]
 
     while queue:
-        path = queue.popleft()
-        x, y = path[-1]
+        x, y = queue.popleft()
 
-        # check if we are still within drop_range
+        # the cells are visited ring by ring around the start location, so the search ends at the first cell that is
+        # out of drop_range
         if get_distance([x, y], start_loc) > drop_range:
             return False
 
@@ -1339,6 +1468,6 @@ def _find_drop_loc(grid_world, agent, env_obj, drop_range, start_loc):
         # queue unseen neighbouring tiles
         for x2, y2 in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
             if 0 <= x2 < width and 0 <= y2 < height and (x2, y2) not in seen:
-                queue.append(path + [(x2, y2)])
+                queue.append((x2, y2))
                 seen.add((x2, y2))
     return False
\ No newline at end of file
@@ -0,0 +1,85 @@
+from matrx.actions import RemoveObject
+from actions1.CustomActions import CarryObject, RemoveObjectTogether
+
+# The actors and terrains of the duration table
+ROBOT = 'robot'
+HUMAN = 'human'
+LAND = 'land'
+WATER = 'water'
+# The kinds of objects the durations depend on, the kind of an object is the first one its id contains
+KINDS = ('stone', 'rock', 'tree', 'mild', 'critical', 'healthy')
+
+# The number of ticks of the actions of the agents, one row per action class, object kind, actor and terrain.
+# None matches every value, the most specific row wins and a row for an action beats a row for a terrain.
+# Actions without a row keep the default duration of the agent, which is the slowdown of RescueBot.
+ACTION_DURATIONS = [
+    # RescueBot is slowed down by water, except on a doormat
+    (None, None, ROBOT, WATER, 13),
+    (RemoveObject.__name__, 'stone', ROBOT, None, 200),
+    (RemoveObject.__name__, 'tree', ROBOT, None, 100),
+    (CarryObject.__name__, 'mild', ROBOT, None, 150),
+    (RemoveObject.__name__, 'stone', HUMAN, None, 200),
+    (RemoveObjectTogether.__name__, 'stone', HUMAN, None, 25),
+    (RemoveObjectTogether.__name__, 'rock', HUMAN, None, 50),
+]
+
+
+class ActionDurations:
+    '''
+    Immutable table of the number of ticks of the actions of the agents, keyed by action class, object kind, actor and
+    terrain. A key is resolved once against the rows of the table and then kept, so every later lookup is a single
+    dictionary lookup. The brains look up the duration of the action of their agent in it, and the planners the cost
+    of a plan.
+    '''
+    def __init__(self, rows=ACTION_DURATIONS):
+        '''
+        @param rows iterable of (action name, object kind, actor, terrain, ticks), None matches every value
+        '''
+        self._rows = {(action, kind, actor, terrain): ticks for action, kind, actor, terrain, ticks in rows}
+        self._resolved = {}
+        self._kinds = {None: None}
+
+    def kind(self, object_id):
+        '''
+        @return the kind of the object, None when its id contains none of the kinds
+        '''
+        if object_id not in self._kinds:
+            self._kinds[object_id] = next((kind for kind in KINDS if kind in object_id), None)
+        return self._kinds[object_id]
+
+    def duration(self, action, object_id=None, actor=ROBOT, terrain=None, default=None):
+        '''
+        @param action the name of the action class, None for any action
+        @param object_id the id of the object the action is performed on, None when there is none
+        @param terrain LAND or WATER, None when the terrain does not matter
+        @return the number of ticks of the action, the default when the table has no row for it
+        '''
+        key = (action, self.kind(object_id), actor, terrain)
+        if key not in self._resolved:
+            self._resolved[key] = self._resolve(*key)
+        ticks = self._resolved[key]
+        return default if ticks is None else ticks
+
+    def plan_ticks(self, plan, actor=ROBOT, water_map=None, default=1):
+        '''
+        @param plan iterable of (action name, object id, location) of the actions the agent will perform in turn
+        @param water_map the WaterMap that decides the terrain of every location, without it the terrain is land
+        @param default the number of ticks of an action without a row, e.g. the slowdown of the agent
+        @return the number of ticks the plan takes
+        '''
+        ticks = 0
+        for action, object_id, location in plan:
+            terrain = WATER if water_map is not None and water_map.in_water(location) else LAND
+            ticks += self.duration(action, object_id, actor, terrain, default)
+        return ticks
+
+    def _resolve(self, action, kind, actor, terrain):
+        for key in ((action, kind, actor, terrain), (action, kind, actor, None), (action, None, actor, terrain),
+                    (action, None, actor, None), (None, None, actor, terrain), (None, None, actor, None)):
+            if key in self._rows:
+                return self._rows[key]
+        return None
+
+
+# The durations of the actions in the worlds of this process
+action_durations = ActionDurations()
@@ -0,0 +1,58 @@
+from collections import defaultdict, namedtuple
+
+# A cell of a drop zone and the victim that has to be dropped on it
+DropOffRank = namedtuple('DropOffRank', ['location', 'victim'])
+
+
+class DropOffTable:
+    '''
+    Immutable table of the drop zones of a world, computed once from the GhostBlocks of the task.
+    For every zone number it holds the ranks of the zone from top to bottom, which is the order in which the victims
+    have to be dropped. The ranks run up from the bottom cell of a zone, as far as the cells above it belong to the zone.
+    '''
+    def __init__(self, ghost_blocks):
+        '''
+        @param ghost_blocks iterable of (zone number, location, victim) of all GhostBlocks of the world
+        '''
+        cells = defaultdict(dict)
+        for zone_nr, location, victim in ghost_blocks:
+            cells[zone_nr][tuple(location)] = victim
+        zones = {}
+        for zone_nr, victims in cells.items():
+            bottom_x, bottom_y = max(victims, key=lambda location: location[1])
+            ranks = [DropOffRank((bottom_x, bottom_y - rank), victims[(bottom_x, bottom_y - rank)])
+                     for rank in range(len(victims)) if (bottom_x, bottom_y - rank) in victims]
+            zones[zone_nr] = tuple(reversed(ranks))
+        self._zones = tuple(sorted(zones.items()))
+
+    @staticmethod
+    def from_state(state):
+        '''
+        @return the table of the GhostBlocks in the state of an agent
+        '''
+        return DropOffTable((info['drop_zone_nr'], info['location'], info['img_name'][8:-4])
+                            for info in state[{'is_goal_block': True}])
+
+    @staticmethod
+    def from_grid_world(grid_world):
+        '''
+        @return the table of the GhostBlocks in the grid world
+        '''
+        return DropOffTable((obj.properties['drop_zone_nr'], obj.location, obj.properties['img_name'][8:-4])
+                            for obj in grid_world.environment_objects.values()
+                            if obj.properties.get('is_goal_block') and 'drop_zone_nr' in obj.properties)
+
+    def zones(self):
+        '''
+        @return pairs of a zone number and the ranks of that zone, ordered by zone number
+        '''
+        return self._zones
+
+    def ranks(self, zone_nr):
+        '''
+        @return the ranks of the zone from top to bottom, each a DropOffRank with a location and a victim
+        '''
+        for number, ranks in self._zones:
+            if number == zone_nr:
+                return ranks
+        return ()
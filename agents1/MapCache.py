@@ -0,0 +1,72 @@
+class MapCache:
+    '''
+    Cache of the static layout of the map: the door, doormat, area tiles and search route of every area.
+    The layout does not change during a run, so the cache is built once from the state index of the first tick.
+    '''
+    def __init__(self, state_index):
+        self._doors = {}
+        self._doormats = {}
+        self._tiles = {}
+        self._routes = {}
+        for door in state_index.of_class('Door'):
+            if door['room_name'] not in self._doors:
+                self._doors[door['room_name']] = door
+        for room_name in self._doors:
+            tiles = state_index.in_room(room_name, 'AreaTile')
+            self._tiles[room_name] = [info['location'] for info in tiles]
+            # Take the doormat of the area tiles of exactly this area, State.get_room also matches 'area 1' to 'area 10'
+            self._doormats[room_name] = tiles[-1]['doormat'] if tiles else None
+            self._routes[room_name] = efficient_search(self._tiles[room_name])
+
+    def rooms(self):
+        '''
+        @return the names of all areas with a door
+        '''
+        return list(self._doors)
+
+    def door(self, room_name):
+        '''
+        @return the (first) door of the area
+        '''
+        return self._doors[room_name]
+
+    def doormat(self, room_name):
+        '''
+        @return the location in front of the door of the area
+        '''
+        return self._doormats[room_name]
+
+    def tiles(self, room_name):
+        '''
+        @return the locations of the area tiles of the area, an empty list for unknown areas
+        '''
+        return self._tiles.get(room_name, [])
+
+    def search_route(self, room_name):
+        '''
+        @return the waypoints to efficiently search the area
+        '''
+        return self._routes[room_name]
+
+
+def efficient_search(tiles):
+    '''
+    Efficiently traverse an area instead of moving over every single area tile: walk up and down every other column.
+    RescueBot and the simulated human both search areas along this route.
+    @param tiles the locations of the area tiles
+    @return the waypoints of the route
+    '''
+    x = []
+    y = []
+    for i in tiles:
+        if i[0] not in x:
+            x.append(i[0])
+        if i[1] not in y:
+            y.append(i[1])
+    locs = []
+    for i in range(len(x)):
+        if i % 2 == 0:
+            locs.append((x[i], min(y)))
+        else:
+            locs.append((x[i], max(y)))
+    return locs
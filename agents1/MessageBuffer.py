@@ -0,0 +1,83 @@
+from collections import deque
+
+
+class MessageBuffer:
+    '''
+    The messages an agent received since they were last cleared. Only the last `maxlen` Message objects are kept, the
+    contents of all messages are kept once in a set to test whether a content was received.
+    Every message gets the index it has since the last clear. A consumer keeps the number of messages it has read as
+    its cursor and reads the newer messages with `since`. Clearing the buffer increases its generation, which tells the
+    consumers to start reading from index 0 again.
+    '''
+    def __init__(self, maxlen=256):
+        self._messages = deque(maxlen=maxlen)
+        self._contents = set()
+        self._last_content = None
+        self._count = 0
+        self.generation = 0
+
+    def append(self, message):
+        self._messages.append(message)
+        self._contents.add(message.content)
+        self._last_content = message.content
+        self._count += 1
+
+    def clear(self):
+        self._messages.clear()
+        self._contents.clear()
+        self._last_content = None
+        self._count = 0
+        self.generation += 1
+
+    def __len__(self):
+        '''
+        @return the number of messages received since the last clear, including those no longer kept
+        '''
+        return self._count
+
+    def __iter__(self):
+        '''
+        @return an iterator over the kept messages, from the oldest to the last received one
+        '''
+        return iter(self._messages)
+
+    def __getitem__(self, index):
+        '''
+        @param index the index of a message since the last clear, or a slice of them; negative indexes count back from
+        the last received message
+        @return the Message, or a list of the kept messages of the slice
+        @raise IndexError when the index is out of range or the message is no longer kept
+        '''
+        first = self._count - len(self._messages)
+        if isinstance(index, slice):
+            return [self._messages[i - first] for i in range(*index.indices(self._count)) if i >= first]
+        if index < 0:
+            index += self._count
+        if not first <= index < self._count:
+            raise IndexError('message index out of range')
+        return self._messages[index - first]
+
+    def contents(self):
+        '''
+        @return the contents of the kept messages, from the oldest to the last received one
+        '''
+        return [message.content for message in self._messages]
+
+    def last_content(self):
+        '''
+        @return the content of the last received message, None when no message was received since the last clear
+        '''
+        return self._last_content
+
+    def has_content(self, content):
+        '''
+        @return whether a message with the content was received since the last clear
+        '''
+        return content in self._contents
+
+    def since(self, cursor):
+        '''
+        @return pairs of the index and the Message of the kept messages from the cursor onwards
+        '''
+        first = self._count - len(self._messages)
+        return [(first + i, self._messages[i]) for i in range(max(cursor - first, 0), len(self._messages))]
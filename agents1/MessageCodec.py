@@ -0,0 +1,67 @@
+import sys
+
+# The victims that can be reported in the chat of the human agent
+VICTIMS = ['critically injured girl', 'critically injured elderly woman', 'critically injured man',
+           'critically injured dog', 'mildly injured boy', 'mildly injured elderly man', 'mildly injured woman',
+           'mildly injured cat']
+
+
+class MessageEvent:
+    '''
+    A message received from a team member, decoded into its kind, victim and area.
+    '''
+    __slots__ = ('kind', 'victim', 'area', 'area_nr', 'tick', 'content')
+
+    def __init__(self, kind, victim, area, area_nr, tick, content):
+        self.kind = kind
+        self.victim = victim
+        self.area = area
+        self.area_nr = area_nr
+        self.tick = tick
+        self.content = content
+
+    def __repr__(self):
+        return 'MessageEvent(' + repr(self.content) + ', tick=' + repr(self.tick) + ')'
+
+
+class MessageCodec:
+    '''
+    Decodes the contents of the messages of the human chat protocol, e.g. 'Search: 5', 'Found: mildly injured cat in 11',
+    'Collect: critically injured girl in 2', 'Remove: at 3', 'Remove together', 'Rescue alone' and 'Continue'.
+    Messages that do not follow the protocol are decoded with kind None.
+    '''
+    def __init__(self, victims=VICTIMS):
+        # Victim names are interned, so all events of the same victim share the same string
+        self._victims = {victim: victim for victim in victims}
+        self._decoded = {}
+
+    def decode(self, content, tick=None):
+        '''
+        @return a MessageEvent for the content of a message received at the given tick
+        '''
+        decoded = self._decoded.get(content)
+        if decoded is None:
+            decoded = self._decode(content)
+            # Only remember the protocol messages, there is a limited number of them
+            if decoded[0]:
+                self._decoded[content] = decoded
+        kind, victim, area, area_nr = decoded
+        return MessageEvent(kind, victim, area, area_nr, tick, content)
+
+    def _decode(self, content):
+        command, _, rest = content.partition(' ')
+        kind = command.rstrip(':')
+        victim = None
+        number = None
+        if command in ['Found:', 'Collect:']:
+            victim, _, number = rest.rpartition(' in ')
+            if not victim:
+                return None, None, None, None
+            victim = self._victims.get(victim) or sys.intern(victim)
+        elif command in ['Search:', 'Remove:'] and rest:
+            number = rest.split()[-1]
+        elif command not in ['Remove', 'Rescue', 'Continue']:
+            return None, None, None, None
+        if number is None:
+            return kind, victim, None, None
+        return kind, victim, 'area ' + number, int(number) if number.isdigit() else None
@@ -1,13 +1,23 @@
 import enum, time, csv
+from bisect import bisect_right
 from re import search
 
 from pyexpat.errors import messages
 
 from agents1.AgentUtils import compute_collected_adjustments, log_info, calculate_wait_time, is_waiting_over
+from agents1.TrustBeliefs import TrustBeliefStore, TrustBeliefWriter
+from agents1.MessageCodec import MessageCodec
+from agents1.StateIndex import StateIndex
+from agents1.MapCache import MapCache
+from agents1.RoutePlanner import RoutePlanner
+from agents1.PathCache import CachedNavigator
+from agents1.PhaseProfiler import PhaseProfiler
+from agents1.DropOffTable import DropOffTable
+from agents1.SentMessages import SentMessages
 from brains1.ArtificialBrain import ArtificialBrain
 from actions1.CustomActions import *
 from matrx import utils
-from matrx.agents.agent_utils.navigator import Navigator
+from matrx.agents.agent_utils.navigator import get_move_actions
 from matrx.agents.agent_utils.state_tracker import StateTracker
 from matrx.actions.object_actions import RemoveObject
 from matrx.messages.message import Message
@@ -54,8 +64,9 @@ class Obstacle(enum.Enum):
 
 
 class BaselineAgent(ArtificialBrain):
-    def __init__(self, slowdown, condition, name, folder):
-        super().__init__(slowdown, condition, name, folder)
+    def __init__(self, slowdown, condition, name, folder, belief_flush_interval=1.0, profile_path=None, drop_off=None,
+                 water_map=None, message_ttl=0):
+        super().__init__(slowdown, condition, name, folder, water_map)
         # Initialization of some relevant variables
         self._tick = None
         self._slowdown = slowdown
@@ -71,7 +82,8 @@ class BaselineAgent(ArtificialBrain):
         self._collected_victims = []
         self._known_victim_logs = {}
         self._found_victims_logs = defaultdict(list)
-        self._send_messages = []
+        # Identical messages are sent at most once every `message_ttl` ticks, with 0 every message is sent
+        self._sent_messages = SentMessages(ttl=message_ttl)
         self._current_door = None
         self._team_members = []
         self._carrying_together = False
@@ -91,7 +103,23 @@ class BaselineAgent(ArtificialBrain):
         self._waiting_time = 0
         self._rescue = None
         self._recent_vic = None
+        self._message_codec = MessageCodec()
         self._received_messages = {}
+        self._received_message_log = []
+        self._message_ticks = []
+        self._message_generation = None
+        self._message_cursor = 0
+        self._live_events = []
+        self._live_victim_rooms = {}
+        self._live_found = {}
+        self._live_collected = {}
+        self._pending_removes = []
+        self._trust_base = None
+        self._message_trust_belief = {}
+        self._trust_cursor = 0
+        self._previous_trust_message = None
+        self._trust_history = []
+        self._unsearched_collects = {}
         self._moving = False
         self._tasks = ['rescue', 'search']
         self._message_count = 0
@@ -99,10 +127,10 @@ class BaselineAgent(ArtificialBrain):
         self._trust_belief = defaultdict(dict)
         self._confirmed_info_map_length = 0
         self._task_information = {
-            "Search:": {"expected_time_to_complete": 1, "task": "search"},
-            "Find:": {"expected_time_to_complete": 1, "task": "rescue"},
-            "Remove:": {"expected_time_to_complete": 10, "task": "search"},
-            "Collect:": {"expected_time_to_complete": 10, "task": "rescue"},
+            "Search": {"expected_time_to_complete": 1, "task": "search"},
+            "Find": {"expected_time_to_complete": 1, "task": "rescue"},
+            "Remove": {"expected_time_to_complete": 10, "task": "search"},
+            "Collect": {"expected_time_to_complete": 10, "task": "rescue"},
         }
         self._base_trust_beliefs = {
             "search": {
@@ -115,20 +143,44 @@ class BaselineAgent(ArtificialBrain):
             }
         }
         self._reserved_names = {'ALWAYS_TRUST', 'NEVER_TRUST', 'RANDOM_TRUST'}
+        # Number of seconds between two writes of the current trust beliefs to disk
+        self._belief_flush_interval = belief_flush_interval
+        self._belief_writer = None
+        self._map = None
+        self._routes = None
+        # The ranks of the drop zones, read from the GhostBlocks in the state once when the world does not give them
+        self._drop_off = drop_off
+        # Time spent per phase and per helper, only measured when a path for the profile is given
+        self._profiler = PhaseProfiler(profile_path)
 
     def initialize(self):
         # Initialization of the state tracker and navigation algorithm
         self._state_tracker = StateTracker(agent_id=self.agent_id)
-        self._navigator = Navigator(agent_id=self.agent_id, action_set=self.action_set,
-                                    algorithm=Navigator.A_STAR_ALGORITHM)
+        # The navigator plans with A* and reuses the planned paths until the traversability of the map changes
+        self._navigator = CachedNavigator(agent_id=self.agent_id, action_set=self.action_set)
+        # Load the trust beliefs of all previous sessions once, the store only rereads the file when it changes
+        self._belief_store = TrustBeliefStore(self._folder + '/beliefs/allTrustBeliefs.csv')
+        self._belief_store.refresh()
+        # The ticks of a new world start at 0 again
+        self._sent_messages.clear()
+        # Write the current trust beliefs to disk on a background thread instead of during every tick
+        if self._belief_writer:
+            self._belief_writer.close()
+        self._belief_writer = TrustBeliefWriter(self._folder + '/beliefs/currentTrustBelief.csv',
+                                                interval=self._belief_flush_interval)
         for task in self._tasks:
             self._trust_belief[self._human_name][task] = {'competence': 0.5, 'willingness': 0.5}
+        self._profiler.instrument_ticks(self)
+        self._profiler.instrument(self, ['_receive_messages', '_process_messages', '_loadBelief', '_trustBelief',
+                                         '_getClosestRoom', '_send_message'])
+        self._profiler.instrument(self._navigator, ['get_move_action', 'add_waypoints', 'reset_full'],
+                                  section='navigator')
 
     def filter_observations(self, state):
         # Filtering of the world state before deciding on an action 
         return state
 
-    def _decay_trust(self, receivedMessages) -> float:
+    def _decay_trust(self, messageTicks) -> float:
         """
         Calculates the total decay to be applied to the trust, based on the timestamps of the messages.
         It looks at the messages within the last `timeframe_to_look_at` and calculates if there is a
@@ -144,12 +196,15 @@ class BaselineAgent(ArtificialBrain):
         total_decay = 0
         previous_tick = max(0, self._tick - timeframe_to_look_at)
 
-        # Compute total decay by going through all messages
-        for message_tick in receivedMessages.values():
-            if message_tick > self._tick - timeframe_to_look_at:
-                time_gap = message_tick - previous_tick  # Compute silence duration
-                if time_gap > max_allowed_gap:
-                    total_decay += decay_rate_per_tick * time_gap  # Accumulate decay
+        # The message ticks are sorted, so only the messages within the timeframe and the one before it are needed
+        first = bisect_right(messageTicks, self._tick - timeframe_to_look_at)
+        if first > 0:
+            previous_tick = messageTicks[first - 1]
+        # Compute total decay by going through the messages within the timeframe
+        for message_tick in messageTicks[first:]:
+            time_gap = message_tick - previous_tick  # Compute silence duration
+            if time_gap > max_allowed_gap:
+                total_decay += decay_rate_per_tick * time_gap  # Accumulate decay
             previous_tick = message_tick  # Update previous tick
 
         if self._tick - previous_tick > max_allowed_gap:
@@ -160,28 +215,35 @@ class BaselineAgent(ArtificialBrain):
 
     def decide_on_actions(self, state):
         self._tick = time.perf_counter()
+        # Index the objects in the state once, so the phases below do not have to scan the whole state
+        self._state_index = StateIndex(state)
+        # Cache the static layout of the map on the first tick
+        if self._map is None:
+            self._map = MapCache(self._state_index)
+            # Compute the walking distances between all doormats once, to plan the order in which to search areas
+            self._routes = RoutePlanner(state, self._state_index, self._map,
+                                        get_move_actions(self.action_set).values(), self._slowdown, self._water_map)
+            # Let the navigator plan the routes that take the fewest ticks with the same water costs
+            self._navigator.use_water_map(self._water_map, self._slowdown)
         # Identify team members
         agent_name = state[self.agent_id]['obj_id']
         for member in state['World']['team_members']:
             if member != agent_name and member not in self._team_members:
                 self._team_members.append(member)
-        # Create a list of received messages from the human team member
-        for i, mssg in enumerate(self.received_messages):
-            for member in self._team_members:
-                if mssg.from_id == member and (mssg.content, i) not in self._received_messages:
-                    self._received_messages[(mssg.content, i)] = self._tick
+        # Decode the messages received from the team members since the previous tick
+        events = self._receive_messages(self._team_members)
 
         # Process messages from team members
-        self._process_messages(state, self._team_members, self._condition)
+        self._process_messages(state, events, self._condition)
         # Initialize and update trust beliefs for team members
         trustBeliefs = self._loadBelief(self._team_members, self._folder)
-        self._trustBelief(self._team_members, trustBeliefs, self._folder, self._received_messages)
+        self._trustBelief(self._team_members, trustBeliefs, self._folder, self._message_ticks)
         self._trust_belief = trustBeliefs
 
         # Check whether human is close in distance
-        if state[{'is_human_agent': True}]:
+        if self._state_index.humans():
             self._distance_human = 'close'
-        if not state[{'is_human_agent': True}]:
+        if not self._state_index.humans():
             # Define distance between human and agent based on last known area locations
             if self._agent_loc in [1, 2, 3, 4, 5, 6, 7] and self._human_loc in [8, 9, 10, 11, 12, 13, 14]:
                 self._distance_human = 'far'
@@ -199,7 +261,7 @@ class BaselineAgent(ArtificialBrain):
             self._distance_drop = 'close'
 
         # Check whether victims are currently being carried together by human and agent 
-        for info in state.values():
+        for info in self._state_index.agents():
             if 'is_human_agent' in info and self._human_name in info['name'] and len(
                     info['is_carrying']) > 0 and 'critical' in info['is_carrying'][0]['obj_id'] or \
                     'is_human_agent' in info and self._human_name in info['name'] and len(
@@ -221,6 +283,7 @@ class BaselineAgent(ArtificialBrain):
 
         # Ongoing loop until the task is terminated, using different phases for defining the agent's behavior
         while True:
+            self._profiler.enter(self._phase)
             if Phase.INTRO == self._phase:
                 # Send introduction message
                 self._send_message('Hello! My name is RescueBot. Together we will collaborate and try to search and rescue the 8 victims on our right as quickly as possible. \
@@ -228,7 +291,7 @@ class BaselineAgent(ArtificialBrain):
                 each mild victim (mildly injured boy/mildly injured elderly man/mildly injured woman/mildly injured cat) 3 points. \
                 If you are ready to begin our mission, you can simply start moving.', 'RescueBot')
                 # Wait until the human starts moving before going to the next phase, otherwise remain idle
-                if not state[{'is_human_agent': True}]:
+                if not self._state_index.humans():
                     self._phase = Phase.FIND_NEXT_GOAL
                 else:
                     return None, {}
@@ -246,11 +309,11 @@ class BaselineAgent(ArtificialBrain):
                 # Identification of the location of the drop zones
                 zones = self._get_drop_zones(state)
                 # Identification of which victims still need to be rescued and on which location they should be dropped
-                for info in zones:
-                    if str(info['img_name'])[8:-4] not in self._collected_victims:
-                        remaining_zones.append(info)
-                        remaining_vics.append(str(info['img_name'])[8:-4])
-                        remaining[str(info['img_name'])[8:-4]] = info['location']
+                for drop in zones:
+                    if drop.victim not in self._collected_victims:
+                        remaining_zones.append(drop)
+                        remaining_vics.append(drop.victim)
+                        remaining[drop.victim] = drop.location
                 if remaining_zones:
                     self._remainingZones = remaining_zones
                     self._remaining = remaining
@@ -305,18 +368,15 @@ class BaselineAgent(ArtificialBrain):
             if Phase.PICK_UNSEARCHED_ROOM == self._phase:
                 agent_location = state[self.agent_id]['location']
                 # Identify which areas are not explored yet
-                unsearched_rooms = [room['room_name'] for room in state.values()
-                                    if 'class_inheritance' in room
-                                    and 'Door' in room['class_inheritance']
-                                    and room['room_name'] not in self._explored_rooms
+                unsearched_rooms = [room['room_name'] for room in self._state_index.of_class('Door')
+                                    if room['room_name'] not in self._explored_rooms
                                     and room['room_name'] not in self._to_search]
                 # If all areas have been searched but the task is not finished, start searching areas again
                 if self._remainingZones and len(unsearched_rooms) == 0:
                     self._to_search = []
                     self._explored_rooms = []
-                    self._send_messages = []
-                    self.received_messages = []
-                    self.received_messages_content = []
+                    self._sent_messages.clear()
+                    self.received_messages.clear()
                     for task in self._tasks:
                         self._base_trust_beliefs[task]['competence'] = trustBeliefs[self._human_name][task][
                             'competence']
@@ -329,25 +389,16 @@ class BaselineAgent(ArtificialBrain):
                     # Identify the closest door when the agent did not search any areas yet
                     if self._current_door == None:
                         # Find all area entrance locations
-                        self._door = \
-                            state.get_room_doors(self._getClosestRoom(state, unsearched_rooms, agent_location))[
-                                0]
-                        self._doormat = \
-                            state.get_room(self._getClosestRoom(state, unsearched_rooms, agent_location))[-1]['doormat']
-                        # Workaround for one area because of some bug
-                        if self._door['room_name'] == 'area 1':
-                            self._doormat = (3, 5)
+                        closest_room = self._getClosestRoom(state, unsearched_rooms, agent_location)
+                        self._door = self._map.door(closest_room)
+                        self._doormat = self._map.doormat(closest_room)
                         # Plan path to area
                         self._phase = Phase.PLAN_PATH_TO_ROOM
                     # Identify the closest door when the agent just searched another area
                     if self._current_door != None:
-                        self._door = \
-                            state.get_room_doors(self._getClosestRoom(state, unsearched_rooms, self._current_door))[0]
-                        self._doormat = \
-                            state.get_room(self._getClosestRoom(state, unsearched_rooms, self._current_door))[-1][
-                                'doormat']
-                        if self._door['room_name'] == 'area 1':
-                            self._doormat = (3, 5)
+                        closest_room = self._getClosestRoom(state, unsearched_rooms, self._current_door)
+                        self._door = self._map.door(closest_room)
+                        self._doormat = self._map.doormat(closest_room)
                         self._phase = Phase.PLAN_PATH_TO_ROOM
 
             if Phase.PLAN_PATH_TO_ROOM == self._phase:
@@ -360,20 +411,14 @@ class BaselineAgent(ArtificialBrain):
                         and 'location' not in self._known_victim_logs[self._goal_vic].keys():
                     # Retrieve the victim's room location and related information
                     victim_location = self._known_victim_logs[self._goal_vic]['room']
-                    self._door = state.get_room_doors(victim_location)[0]
-                    self._doormat = state.get_room(victim_location)[-1]['doormat']
-
-                    # Handle special case for 'area 1'
-                    if self._door['room_name'] == 'area 1':
-                        self._doormat = (3, 5)
+                    self._door = self._map.door(victim_location)
+                    self._doormat = self._map.doormat(victim_location)
 
                     # Set the door location based on the doormat
                     doorLoc = self._doormat
 
                 # If the goal victim's location is known, plan the route to the identified area
                 else:
-                    if self._door['room_name'] == 'area 1':
-                        self._doormat = (3, 5)
                     doorLoc = self._doormat
 
                 # Add the door location as a waypoint for navigation
@@ -436,13 +481,8 @@ class BaselineAgent(ArtificialBrain):
                     # Check for obstacles blocking the path to the area and handle them if needed
                     if action is not None:
                         # Remove obstacles blocking the path to the area 
-                        for info in state.values():
-                            if 'class_inheritance' in info and 'ObstacleObject' in info[
-                                'class_inheritance'] and 'stone' in info['obj_id'] and info['location'] not in [(9, 4),
-                                                                                                                (9, 7),
-                                                                                                                (9, 19),
-                                                                                                                (21,
-                                                                                                                 19)]:
+                        for info in self._state_index.of_class('ObstacleObject'):
+                            if 'stone' in info['obj_id'] and info['location'] not in [(9, 4), (9, 7), (9, 19), (21, 19)]:
                                 self._send_message('Reaching ' + str(self._door['room_name'])
                                                    + ' will take a bit longer because I found stones blocking my path.',
                                                    'RescueBot')
@@ -455,9 +495,8 @@ class BaselineAgent(ArtificialBrain):
                 objects = []
                 agent_location = state[self.agent_id]['location']
                 # Identify which obstacle is blocking the entrance
-                for info in state.values():
-                    if 'class_inheritance' in info and 'ObstacleObject' in info['class_inheritance'] and 'rock' in info[
-                        'obj_id']:
+                for info in self._state_index.of_class('ObstacleObject'):
+                    if 'rock' in info['obj_id']:
                         objects.append(info)
                         # Check whether the wait time is up
                         if self._waiting and is_waiting_over(self._started_waiting_tick, self._tick,
@@ -483,20 +522,18 @@ class BaselineAgent(ArtificialBrain):
                                 self._explored_rooms).replace('area ', '') + ' \
                                 \n clock - removal time: 5 seconds \n afstand - distance between us: ' + self._distance_human + f'\n clock - maximum waiting time: {self._waiting_time} seconds.',
                                                'RescueBot')
-                        if self.received_messages_content and self.received_messages_content[
-                            -1] == 'Continue' and not self._remove:
+                        if self.received_messages.last_content() == 'Continue' and not self._remove:
                             self._answered = True
                             self._waiting = False
                             # Add area to the to do list
                             self._to_search.append(self._door['room_name'])
                             self._phase = Phase.FIND_NEXT_GOAL
                         # Wait for the human to help removing the obstacle and remove the obstacle together
-                        if self.received_messages_content and self.received_messages_content[
-                            -1] == 'Remove' or self._remove:
+                        if self.received_messages.last_content() == 'Remove' or self._remove:
                             if not self._remove:
                                 self._answered = True
                             # Tell the human to come over and be idle until human arrives
-                            if not state[{'is_human_agent': True}]:
+                            if not self._state_index.humans():
                                 self._send_message(
                                     'Please come to ' + str(self._door['room_name']) + ' to remove rock.',
                                     'RescueBot')
@@ -507,7 +544,7 @@ class BaselineAgent(ArtificialBrain):
                                     self._send_message(f"clock - maximum waiting time: {self._waiting_time} seconds.",
                                                        "RescueBot")
                             # Tell the human to remove the obstacle when he/she arrives
-                            if state[{'is_human_agent': True}]:
+                            if self._state_index.humans():
                                 self._send_message('Lets remove rock blocking ' + str(self._door['room_name']) + '!',
                                                    'RescueBot')
                                 if not self._waiting and self._remove:
@@ -519,8 +556,7 @@ class BaselineAgent(ArtificialBrain):
                         # Remain idle until the human communicates what to do with the identified obstacle
                         return None, {}
 
-                    if 'class_inheritance' in info and 'ObstacleObject' in info['class_inheritance'] and 'tree' in info[
-                        'obj_id']:
+                    if 'tree' in info['obj_id']:
                         objects.append(info)
                         # check whether the waiting is over
                         if self._waiting and is_waiting_over(self._started_waiting_tick, self._tick,
@@ -548,16 +584,14 @@ class BaselineAgent(ArtificialBrain):
                                 \n clock - removal time: 10 seconds' + f'\n clock - maximum waiting time: {self._waiting_time} seconds.',
                                                'RescueBot')
                         # Determine the next area to explore if the human tells the agent not to remove the obstacle
-                        if self.received_messages_content and self.received_messages_content[
-                            -1] == 'Continue' and not self._remove:
+                        if self.received_messages.last_content() == 'Continue' and not self._remove:
                             self._answered = True
                             self._waiting = False
                             # Add area to the to do list
                             self._to_search.append(self._door['room_name'])
                             self._phase = Phase.FIND_NEXT_GOAL
                         # Remove the obstacle if the human tells the agent to do so
-                        if self.received_messages_content and self.received_messages_content[
-                            -1] == 'Remove' or self._remove:
+                        if self.received_messages.last_content() == 'Remove' or self._remove:
                             # Tell the human to come over and be idle until human arrives
                             if not self._remove:
                                 self._answered = True
@@ -574,8 +608,7 @@ class BaselineAgent(ArtificialBrain):
                         else:
                             return None, {}
 
-                    if 'class_inheritance' in info and 'ObstacleObject' in info['class_inheritance'] and 'stone' in \
-                            info['obj_id']:
+                    if 'stone' in info['obj_id']:
                         objects.append(info)
                         # Check if waiting time is over
                         if self._waiting and is_waiting_over(self._started_waiting_tick, self._tick,
@@ -603,16 +636,14 @@ class BaselineAgent(ArtificialBrain):
                                 \n clock - removal time together: 3 seconds \n afstand - distance between us: ' + self._distance_human + '\n clock - removal time alone: 20 seconds' + f'\n clock - maximum waiting time: {self._waiting_time} seconds.',
                                                'RescueBot')
                         # Determine the next area to explore if the human tells the agent not to remove the obstacle          
-                        if self.received_messages_content and self.received_messages_content[
-                            -1] == 'Continue' and not self._remove:
+                        if self.received_messages.last_content() == 'Continue' and not self._remove:
                             self._answered = True
                             self._waiting = False
                             # Add area to the to do list
                             self._to_search.append(self._door['room_name'])
                             self._phase = Phase.FIND_NEXT_GOAL
                         # Remove the obstacle alone if the human decides so
-                        if self.received_messages_content and self.received_messages_content[
-                            -1] == 'Remove alone' and not self._remove:
+                        if self.received_messages.last_content() == 'Remove alone' and not self._remove:
                             self._answered = True
                             self._waiting = False
                             self._send_message('Removing stones blocking ' + str(self._door['room_name']) + '.',
@@ -622,12 +653,11 @@ class BaselineAgent(ArtificialBrain):
                             return RemoveObject.__name__, {'object_id': info['obj_id']}
 
                         # Remove the obstacle together if the human decides so
-                        if self.received_messages_content and self.received_messages_content[
-                            -1] == 'Remove together' or self._remove:
+                        if self.received_messages.last_content() == 'Remove together' or self._remove:
                             if not self._remove:
                                 self._answered = True
                             # Tell the human to come over and be idle until human arrives
-                            if not state[{'is_human_agent': True}]:
+                            if not self._state_index.humans():
                                 self._send_message(
                                     'Please come to ' + str(self._door['room_name']) + ' to remove stones together.',
                                     'RescueBot')
@@ -639,7 +669,7 @@ class BaselineAgent(ArtificialBrain):
                                     self._send_message(f"clock - maximum waiting time: {self._waiting_time} seconds.",
                                                        "RescueBot")
                             # Tell the human to remove the obstacle when he/she arrives
-                            if state[{'is_human_agent': True}]:
+                            if self._state_index.humans():
                                 self._send_message('Lets remove stones blocking ' + str(self._door['room_name']) + '!',
                                                    'RescueBot')
                                 if not self._waiting and self._remove:
@@ -691,16 +721,11 @@ class BaselineAgent(ArtificialBrain):
                 self._agent_loc = int(self._door['room_name'].split()[-1])
 
                 # Store the locations of all area tiles in the current room
-                room_tiles = [info['location'] for info in state.values()
-                              if 'class_inheritance' in info
-                              and 'AreaTile' in info['class_inheritance']
-                              and 'room_name' in info
-                              and info['room_name'] == self._door['room_name']]
-                self._roomtiles = room_tiles
+                self._roomtiles = self._map.tiles(self._door['room_name'])
 
                 # Make the plan for searching the area
                 self._navigator.reset_full()
-                self._navigator.add_waypoints(self._efficientSearch(room_tiles))
+                self._navigator.add_waypoints(self._map.search_route(self._door['room_name']))
 
                 # Initialize variables for storing room victims and switch to following the room search path
                 self._room_vics = []
@@ -712,77 +737,76 @@ class BaselineAgent(ArtificialBrain):
                 action = self._navigator.get_move_action(self._state_tracker)
                 if action != None:
                     # Identify victims present in the area
-                    for info in state.values():
-                        if 'class_inheritance' in info and 'CollectableBlock' in info['class_inheritance']:
-                            vic = str(info['img_name'][8:-4])
-                            # Remember which victim the agent found in this area
-                            if vic not in self._room_vics:
-                                self._room_vics.append(vic)
-
-                            # Identify the exact location of the victim that was found by the human earlier
-                            if vic in self._known_victims and 'location' not in self._known_victim_logs[vic].keys():
-                                self._recent_vic = vic
-                                # Add the exact victim location to the corresponding dictionary
-                                self._known_victim_logs[vic] = {'location': info['location'],
-                                                                'room': self._door['room_name'],
-                                                                'obj_id': info['obj_id']}
-                                if vic == self._goal_vic:
-                                    # Communicate which victim was found
-                                    self._send_message('Found ' + vic + ' in ' + self._door[
-                                        'room_name'] + ' because you told me ' + vic + ' was located here.',
-                                                       'RescueBot')
-                                    # Robot confirmed the human information
-                                    self._confirmed_human_info['rescue'].append(
-                                        {'event': InfoEvent.FOUND, 'victim': vic, 'location': self._door['room_name']})
-                                    # Add the area to the list with searched areas
-                                    if self._door['room_name'] not in self._explored_rooms:
-                                        self._explored_rooms.append(self._door['room_name'])
-                                    # Do not continue searching the rest of the area but start planning to rescue the victim
-                                    self._phase = Phase.FIND_NEXT_GOAL
-
-                            # Identify injured victim in the area
-                            if 'healthy' not in vic and not self._found_victims[vic]:
-                                self._found_victims[vic].append(self._tick)
-                                self._found_victims_logs[vic].append({'location': info['location'],
-                                                                      'room': self._door['room_name'],
-                                                                      'obj_id': info['obj_id'],
-                                                                      'tick': self._tick})
-                            if 'healthy' not in vic and vic not in self._known_victims:
-                                self._recent_vic = vic
-                                # Add the victim and the location to the corresponding dictionary
-                                self._known_victims.append(vic)
-                                self._known_victim_logs[vic] = {'location': info['location'],
-                                                                'room': self._door['room_name'],
-                                                                'obj_id': info['obj_id']}
-                                # Communicate which victim the agent found and ask the human whether to rescue the victim now or at a later stage
-                                # Start waiting for an answer
-                                if 'mild' in vic and self._answered == False and not self._waiting:
-                                    self._waiting = True
-                                    self._started_waiting_tick = self._tick
-                                    self._waiting_time = calculate_wait_time(self._distance_human,
-                                                                             trustBeliefs[self._human_name]['rescue'])
-                                    self._send_message('Found ' + vic + ' in ' + self._door['room_name'] + '. Please decide whether to "Rescue together", "Rescue alone", or "Continue" searching. \n \n \
+                    for info in self._state_index.of_class('CollectableBlock'):
+                        vic = str(info['img_name'][8:-4])
+                        # Remember which victim the agent found in this area
+                        if vic not in self._room_vics:
+                            self._room_vics.append(vic)
+
+                        # Identify the exact location of the victim that was found by the human earlier
+                        if vic in self._known_victims and 'location' not in self._known_victim_logs[vic].keys():
+                            self._recent_vic = vic
+                            # Add the exact victim location to the corresponding dictionary
+                            self._known_victim_logs[vic] = {'location': info['location'],
+                                                            'room': self._door['room_name'],
+                                                            'obj_id': info['obj_id']}
+                            if vic == self._goal_vic:
+                                # Communicate which victim was found
+                                self._send_message('Found ' + vic + ' in ' + self._door[
+                                    'room_name'] + ' because you told me ' + vic + ' was located here.',
+                                                   'RescueBot')
+                                # Robot confirmed the human information
+                                self._confirmed_human_info['rescue'].append(
+                                    {'event': InfoEvent.FOUND, 'victim': vic, 'location': self._door['room_name']})
+                                # Add the area to the list with searched areas
+                                if self._door['room_name'] not in self._explored_rooms:
+                                    self._explored_rooms.append(self._door['room_name'])
+                                # Do not continue searching the rest of the area but start planning to rescue the victim
+                                self._phase = Phase.FIND_NEXT_GOAL
+
+                        # Identify injured victim in the area
+                        if 'healthy' not in vic and not self._found_victims[vic]:
+                            self._found_victims[vic].append(self._tick)
+                            self._found_victims_logs[vic].append({'location': info['location'],
+                                                                  'room': self._door['room_name'],
+                                                                  'obj_id': info['obj_id'],
+                                                                  'tick': self._tick})
+                        if 'healthy' not in vic and vic not in self._known_victims:
+                            self._recent_vic = vic
+                            # Add the victim and the location to the corresponding dictionary
+                            self._known_victims.append(vic)
+                            self._known_victim_logs[vic] = {'location': info['location'],
+                                                            'room': self._door['room_name'],
+                                                            'obj_id': info['obj_id']}
+                            # Communicate which victim the agent found and ask the human whether to rescue the victim now or at a later stage
+                            # Start waiting for an answer
+                            if 'mild' in vic and self._answered == False and not self._waiting:
+                                self._waiting = True
+                                self._started_waiting_tick = self._tick
+                                self._waiting_time = calculate_wait_time(self._distance_human,
+                                                                         trustBeliefs[self._human_name]['rescue'])
+                                self._send_message('Found ' + vic + ' in ' + self._door['room_name'] + '. Please decide whether to "Rescue together", "Rescue alone", or "Continue" searching. \n \n \
                                         Important features to consider are: \n safe - victims rescued: ' + str(
-                                        self._collected_victims) + '\n explore - areas searched: area ' + str(
-                                        self._explored_rooms).replace('area ', '') + '\n \
+                                    self._collected_victims) + '\n explore - areas searched: area ' + str(
+                                    self._explored_rooms).replace('area ', '') + '\n \
                                         clock - extra time when rescuing alone: 15 seconds \n afstand - distance between us: ' + self._distance_human + f'\n clock - maximum waiting time: {self._waiting_time} seconds.',
-                                                       'RescueBot')
+                                                   'RescueBot')
 
-                                # Start waiting for an answer
-                                if 'critical' in vic and self._answered == False and not self._waiting:
-                                    self._waiting = True
-                                    self._started_waiting_tick = self._tick
-                                    self._waiting_time = calculate_wait_time(self._distance_human,
-                                                                             trustBeliefs[self._human_name]['rescue'],
-                                                                             must_be_done_together=True)
-                                    self._send_message('Found ' + vic + ' in ' + self._door['room_name'] + '. Please decide whether to "Rescue" or "Continue" searching. \n\n \
+                            # Start waiting for an answer
+                            if 'critical' in vic and self._answered == False and not self._waiting:
+                                self._waiting = True
+                                self._started_waiting_tick = self._tick
+                                self._waiting_time = calculate_wait_time(self._distance_human,
+                                                                         trustBeliefs[self._human_name]['rescue'],
+                                                                         must_be_done_together=True)
+                                self._send_message('Found ' + vic + ' in ' + self._door['room_name'] + '. Please decide whether to "Rescue" or "Continue" searching. \n\n \
                                         Important features to consider are: \n explore - areas searched: area ' + str(
-                                        self._explored_rooms).replace('area',
-                                                                      '') + ' \n safe - victims rescued: ' + str(
-                                        self._collected_victims) + '\n \
+                                    self._explored_rooms).replace('area',
+                                                                  '') + ' \n safe - victims rescued: ' + str(
+                                    self._collected_victims) + '\n \
                                         afstand - distance between us: ' + self._distance_human + f'\n clock - maximum waiting time: {self._waiting_time} seconds.',
-                                                       'RescueBot')
-                                    # Execute move actions to explore the area
+                                                   'RescueBot')
+                                # Execute move actions to explore the area
                     return action, {}
 
                 # Communicate that the agent did not find the target victim in the area while the human previously communicated the victim was located here
@@ -799,8 +823,7 @@ class BaselineAgent(ArtificialBrain):
                     self._known_victims.remove(self._goal_vic)
                     self._room_vics = []
                     # Reset received messages (bug fix)
-                    self.received_messages = []
-                    self.received_messages_content = []
+                    self.received_messages.clear()
                     self._phase = Phase.FIND_NEXT_GOAL
                     return None, {}
                 # Add the area to the list of searched areas
@@ -810,26 +833,24 @@ class BaselineAgent(ArtificialBrain):
                     self._searched_rooms[self._door['room_name']].append({'type': 'Robot', 'tick': self._tick})
 
                 # Check if the robot requested a Rescue type message and emit a false rescue if not
-                if self.received_messages_content and self.received_messages_content[-1] in {'Rescue',
-                                                                                             'Rescue together',
-                                                                                             'Rescue alone'} and not self._recent_vic:
+                if self.received_messages.last_content() in {'Rescue', 'Rescue together',
+                                                             'Rescue alone'} and not self._recent_vic:
                     self._confirmed_human_info['rescue'].append(
                         {'event': InfoEvent.FALSE_RESCUE, 'victim': None, 'location': self._door['room_name']})
                     self._phase = Phase.FIND_NEXT_GOAL
                     return None, {}
 
                 # Make a plan to rescue a found critically injured victim if the human decides so
-                if self.received_messages_content and self.received_messages_content[
-                    -1] == 'Rescue' and self._recent_vic and 'critical' in self._recent_vic:
+                if self.received_messages.last_content() == 'Rescue' and self._recent_vic and 'critical' in self._recent_vic:
                     self._rescue = 'together'
                     self._answered = True
                     self._waiting = False
                     # Tell the human to come over and help carry the critically injured victim
-                    if not state[{'is_human_agent': True}]:
+                    if not self._state_index.humans():
                         self._send_message('Please come to ' + str(self._door['room_name']) + ' to carry ' + str(
                             self._recent_vic) + ' together.', 'RescueBot')
                     # Tell the human to carry the critically injured victim together
-                    if state[{'is_human_agent': True}]:
+                    if self._state_index.humans():
                         self._send_message('Lets carry ' + str(
                             self._recent_vic) + ' together! Please wait until I moved on top of ' + str(
                             self._recent_vic) + '.', 'RescueBot')
@@ -837,17 +858,16 @@ class BaselineAgent(ArtificialBrain):
                     self._recent_vic = None
                     self._phase = Phase.PLAN_PATH_TO_VICTIM
                 # Make a plan to rescue a found mildly injured victim together if the human decides so
-                if self.received_messages_content and self.received_messages_content[
-                    -1] == 'Rescue together' and self._recent_vic and 'mild' in self._recent_vic:
+                if self.received_messages.last_content() == 'Rescue together' and self._recent_vic and 'mild' in self._recent_vic:
                     self._rescue = 'together'
                     self._answered = True
                     self._waiting = False
                     # Tell the human to come over and help carry the mildly injured victim
-                    if not state[{'is_human_agent': True}]:
+                    if not self._state_index.humans():
                         self._send_message('Please come to ' + str(self._door['room_name']) + ' to carry ' + str(
                             self._recent_vic) + ' together.', 'RescueBot')
                     # Tell the human to carry the mildly injured victim together
-                    if state[{'is_human_agent': True}]:
+                    if self._state_index.humans():
                         self._send_message('Lets carry ' + str(
                             self._recent_vic) + ' together! Please wait until I moved on top of ' + str(
                             self._recent_vic) + '.', 'RescueBot')
@@ -855,8 +875,7 @@ class BaselineAgent(ArtificialBrain):
                     self._recent_vic = None
                     self._phase = Phase.PLAN_PATH_TO_VICTIM
                 # Make a plan to rescue the mildly injured victim alone if the human decides so, and communicate this to the human
-                if self.received_messages_content and self.received_messages_content[
-                    -1] == 'Rescue alone' and self._recent_vic and 'mild' in self._recent_vic:
+                if self.received_messages.last_content() == 'Rescue alone' and self._recent_vic and 'mild' in self._recent_vic:
                     self._send_message('Picking up ' + self._recent_vic + ' in ' + self._door['room_name'] + '.',
                                        'RescueBot')
                     self._rescue = 'alone'
@@ -868,7 +887,7 @@ class BaselineAgent(ArtificialBrain):
                     self._phase = Phase.PLAN_PATH_TO_VICTIM
 
                 # Continue searching other areas if the human decides so
-                if self.received_messages_content and self.received_messages_content[-1] == 'Continue':
+                if self.received_messages.last_content() == 'Continue':
                     self._answered = True
                     self._waiting = False
                     self._todo.append(self._recent_vic)
@@ -898,8 +917,8 @@ class BaselineAgent(ArtificialBrain):
                         return None, {}
 
                 # Remain idle until the human communicates to the agent what to do with the found victim
-                if self.received_messages_content and self._waiting and self.received_messages_content[
-                    -1] != 'Rescue' and self.received_messages_content[-1] != 'Continue':
+                if self.received_messages and self._waiting and self.received_messages.last_content() != 'Rescue' \
+                        and self.received_messages.last_content() != 'Continue':
                     return None, {}
 
                 # Find the next area to search when the agent is not waiting for an answer from the human or occupied with rescuing a victim
@@ -932,27 +951,17 @@ class BaselineAgent(ArtificialBrain):
 
             if Phase.TAKE_VICTIM == self._phase:
                 # Store all area tiles in a list
-                room_tiles = [info['location'] for info in state.values()
-                              if 'class_inheritance' in info
-                              and 'AreaTile' in info['class_inheritance']
-                              and 'room_name' in info
-                              and info['room_name'] == self._known_victim_logs[self._goal_vic]['room']]
-                self._roomtiles = room_tiles
+                self._roomtiles = self._map.tiles(self._known_victim_logs[self._goal_vic]['room'])
                 objects = []
                 # When the victim has to be carried by human and agent together, check whether human has arrived at the victim's location
-                for info in state.values():
+                for info in self._state_index.of_class('CollectableBlock'):
                     # When the victim has to be carried by human and agent together, check whether human has arrived at the victim's location
-                    if 'class_inheritance' in info and 'CollectableBlock' in info['class_inheritance'] and 'critical' in \
-                            info['obj_id'] and info['location'] in self._roomtiles or \
-                            'class_inheritance' in info and 'CollectableBlock' in info[
-                        'class_inheritance'] and 'mild' in info['obj_id'] and info[
-                        'location'] in self._roomtiles and self._rescue == 'together' or \
+                    if 'critical' in info['obj_id'] and info['location'] in self._roomtiles or \
+                            'mild' in info['obj_id'] and info['location'] in self._roomtiles and self._rescue == 'together' or \
                             self._goal_vic in self._known_victims and self._goal_vic in self._todo and len(
-                        self._explored_rooms) == 0 and 'class_inheritance' in info and 'CollectableBlock' in info[
-                        'class_inheritance'] and 'critical' in info['obj_id'] and info['location'] in self._roomtiles or \
+                        self._explored_rooms) == 0 and 'critical' in info['obj_id'] and info['location'] in self._roomtiles or \
                             self._goal_vic in self._known_victims and self._goal_vic in self._todo and len(
-                        self._explored_rooms) == 0 and 'class_inheritance' in info and 'CollectableBlock' in info[
-                        'class_inheritance'] and 'mild' in info['obj_id'] and info['location'] in self._roomtiles:
+                        self._explored_rooms) == 0 and 'mild' in info['obj_id'] and info['location'] in self._roomtiles:
                         objects.append(info)
                         # Remain idle when the human has not arrived at the location or until the waiting time expires
                         if not self._carrying_together and self._waiting and is_waiting_over(self._started_waiting_tick, self._tick, self._waiting_time):
@@ -1051,125 +1060,179 @@ class BaselineAgent(ArtificialBrain):
 
     def _get_drop_zones(self, state):
         """
-        @return list of drop zones (their full dict), in order (the first one is the
+        @return the ranks of the drop zone (location and victim), in order (the first one is the
         place that requires the first drop)
         """
-        places = state[{'is_goal_block': True}]
-        places.sort(key=lambda info: info['location'][1])
-        zones = []
-        for place in places:
-            if place['drop_zone_nr'] == 0:
-                zones.append(place)
-        return zones
-
-    def _process_messages(self, state, teamMembers, condition):
+        if self._drop_off is None:
+            self._drop_off = DropOffTable.from_state(state)
+        return self._drop_off.ranks(0)
+
+    def _receive_messages(self, teamMembers):
+        """
+        Decode the messages received from the team members since the previous tick, every message is decoded only once
+        """
+        # The received messages were cleared, so start reading them from the beginning
+        if self.received_messages.generation != self._message_generation:
+            self._message_generation = self.received_messages.generation
+            self._message_cursor = 0
+            self._live_events = []
+            self._live_victim_rooms = {}
+            self._live_found = {}
+            self._live_collected = {}
+            self._pending_removes = []
+        events = []
+        for i, mssg in self.received_messages.since(self._message_cursor):
+            if mssg.from_id not in teamMembers:
+                continue
+            if (mssg.content, i) not in self._received_messages:
+                self._received_messages[(mssg.content, i)] = self._tick
+                event = self._message_codec.decode(mssg.content, self._tick)
+                # Keep all received messages for the trust beliefs
+                self._received_message_log.append(event)
+                self._message_ticks.append(self._tick)
+            else:
+                event = self._message_codec.decode(mssg.content, self._received_messages[(mssg.content, i)])
+            events.append(event)
+        self._message_cursor = len(self.received_messages)
+        return events
+
+    def _process_messages(self, state, events, condition):
         """
         process incoming messages received from the team members
         """
-        receivedMessages = {}
-        # Create a dictionary with a list of received messages from each team member
-        for member in teamMembers:
-            receivedMessages[member] = []
-        for i, mssg in enumerate(self.received_messages):
-            for member in teamMembers:
-                if mssg.from_id == member:
-                    receivedMessages[member].append((mssg.content, i))
-        # Check the content of the received messages
-        for mssgs in receivedMessages.values():
-            for msg, i in mssgs:
-                # If a received message involves team members searching areas, add these areas to the memory of areas that have been explored
-                if msg.startswith("Search:"):
-                    area = 'area ' + msg.split()[-1]
-                    if area not in self._explored_rooms:
-                        self._explored_rooms.append(area)
-                    if {'type': 'Human', 'tick': self._received_messages[(msg, i)]} not in self._searched_rooms[area]:
-                        self._searched_rooms[area].append({'type': 'Human', 'tick': self._received_messages[(msg, i)]})
-                # If a received message involves team members finding victims, add these victims and their locations to memory
-                if msg.startswith("Found:"):
-                    # Identify which victim and area it concerns
-                    if len(msg.split()) == 6:
-                        foundVic = ' '.join(msg.split()[1:4])
-                    else:
-                        foundVic = ' '.join(msg.split()[1:5])
-                    loc = 'area ' + msg.split()[-1]
-                    # Add the area to the memory of searched areas
-                    if loc not in self._explored_rooms:
-                        self._explored_rooms.append(loc)
-
-                    if self._received_messages[(msg, i)] not in self._found_victims[foundVic]:
-                        self._found_victims[foundVic].append(self._received_messages[(msg, i)])
-                        self._found_victims_logs[foundVic].append(
-                            {'room': loc, 'tick': self._received_messages[(msg, i)]})
-
-                    # Add the victim and its location to memory
-                    if foundVic not in self._known_victims:
-                        self._known_victims.append(foundVic)
-                        self._known_victim_logs[foundVic] = {'room': loc}
-                    if foundVic in self._known_victims and self._known_victim_logs[foundVic]['room'] != loc:
-                        self._known_victim_logs[foundVic] = {'room': loc}
-                    # Decide to help the human carry a found victim when the human's condition is 'weak'
-                    if self._get_condition() == 'weak':
-                        self._rescue = 'together'
-                    # Add the found victim to the to do list when the human's condition is not 'weak'
-                    if 'mild' in foundVic and self._get_condition() != 'weak':
-                        self._todo.append(foundVic)
-                # If a received message involves team members rescuing victims, add these victims and their locations to memory
-                if msg.startswith('Collect:'):
-                    # Identify which victim and area it concerns
-                    if len(msg.split()) == 6:
-                        collectVic = ' '.join(msg.split()[1:4])
-                    else:
-                        collectVic = ' '.join(msg.split()[1:5])
-                    loc = 'area ' + msg.split()[-1]
-                    # Add the area to the memory of searched areas
-                    if loc not in self._explored_rooms:
-                        self._explored_rooms.append(loc)
-                    # Add the victim and location to the memory of found victims
-                    if collectVic not in self._known_victims:
-                        self._known_victims.append(collectVic)
-                        self._known_victim_logs[collectVic] = {'room': loc}
-                    if collectVic in self._known_victims and self._known_victim_logs[collectVic]['room'] != loc:
-                        self._known_victim_logs[collectVic] = {'room': loc}
-                    # Add the victim to the memory of rescued victims when the human's condition is not weak
-                    if self._get_condition() != 'weak' and collectVic not in self._collected_victims:
-                        self._collected_victims.append(collectVic)
-                    # Decide to help the human carry the victim together when the human's condition is weak or if the human's condition is normal and they are close
-                    if self._get_condition() == 'weak' or self._get_condition() == 'normal' and self._human_loc == 'close':
-                        self._rescue = 'together'
-                # If a received message involves team members asking for help with removing obstacles, add their location to memory and come over
-                if msg.startswith('Remove:'):
-                    # Come over immediately when the agent is not carrying a victim
-                    if not self._carrying:
-                        # Identify at which location the human needs help
-                        area = 'area ' + msg.split()[-1]
-                        self._door = state.get_room_doors(area)[0]
-                        self._doormat = state.get_room(area)[-1]['doormat']
-                        if area in self._explored_rooms:
-                            self._explored_rooms.remove(area)
-                        # Clear received messages (bug fix)
-                        self.received_messages = []
-                        self.received_messages_content = []
-                        self._moving = True
-                        self._remove = True
-                        if self._waiting and self._recent_vic:
-                            self._todo.append(self._recent_vic)
-                        self._waiting = False
-                        # Let the human know that the agent is coming over to help
-                        self._send_message(
-                            'Moving to ' + str(self._door['room_name']) + ' to help you remove an obstacle.',
-                            'RescueBot')
-                        # Plan the path to the relevant area
-                        self._phase = Phase.PLAN_PATH_TO_ROOM
-                    # Come over to help after dropping a victim that is currently being carried by the agent
-                    else:
-                        area = 'area ' + msg.split()[-1]
-                        self._send_message('Will come to ' + area + ' after dropping ' + self._goal_vic + '.',
-                                           'RescueBot')
-            # Store the current location of the human in memory
-            if mssgs and mssgs[-1][0].split()[-1] in ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12',
-                                                      '13',
-                                                      '14']:
-                self._human_loc = int(mssgs[-1][0].split()[-1])
+        # Messages of previous ticks keep affecting the memory until the received messages are cleared
+        for victim, rooms in self._live_victim_rooms.items():
+            for loc in rooms:
+                self._remember_victim(victim, loc)
+        if self._live_found and self._get_condition() == 'weak':
+            self._rescue = 'together'
+        for victim in self._live_found:
+            if 'mild' in victim and self._get_condition() != 'weak' and victim not in self._todo:
+                self._todo.append(victim)
+        for victim in self._live_collected:
+            if self._get_condition() != 'weak' and victim not in self._collected_victims:
+                self._collected_victims.append(victim)
+        if self._live_collected and (
+                self._get_condition() == 'weak' or self._get_condition() == 'normal' and self._human_loc == 'close'):
+            self._rescue = 'together'
+        # Requests to remove an obstacle wait until the agent dropped the victim it is carrying
+        replayed = []
+        if self._pending_removes and not self._carrying:
+            # Coming over clears the received messages, so process all messages from the first request onwards again
+            replayed = self._live_events[self._pending_removes[0]:]
+        else:
+            for i in self._pending_removes:
+                self._send_message('Will come to ' + self._live_events[i].area + ' after dropping ' + self._goal_vic + '.',
+                                   'RescueBot')
+        for event in replayed:
+            self._process_message(state, event)
+        # Check the content of the new messages
+        for event in events:
+            # Remember the message as long as the received messages are not cleared
+            if self.received_messages.generation == self._message_generation:
+                self._live_events.append(event)
+                if event.kind in ['Found', 'Collect']:
+                    # Keep the areas reported for a victim ordered by their last report
+                    rooms = self._live_victim_rooms.setdefault(event.victim, {})
+                    rooms.pop(event.area, None)
+                    rooms[event.area] = True
+                if event.kind == 'Found':
+                    self._live_found[event.victim] = True
+                if event.kind == 'Collect':
+                    self._live_collected[event.victim] = True
+                if event.kind == 'Remove' and event.area and self._carrying:
+                    self._pending_removes.append(len(self._live_events) - 1)
+            self._process_message(state, event)
+        # Store the current location of the human in memory
+        if events and events[-1].area_nr in [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14]:
+            self._human_loc = events[-1].area_nr
+
+    def _process_message(self, state, event):
+        """
+        process a single message event received from a team member
+        """
+        # If a received message involves team members searching areas, add these areas to the memory of areas that have been explored
+        if event.kind == 'Search':
+            area = event.area
+            if area not in self._explored_rooms:
+                self._explored_rooms.append(area)
+            if {'type': 'Human', 'tick': event.tick} not in self._searched_rooms[area]:
+                self._searched_rooms[area].append({'type': 'Human', 'tick': event.tick})
+        # If a received message involves team members finding victims, add these victims and their locations to memory
+        if event.kind == 'Found':
+            # Identify which victim and area it concerns
+            foundVic = event.victim
+            loc = event.area
+            # Add the area to the memory of searched areas
+            if loc not in self._explored_rooms:
+                self._explored_rooms.append(loc)
+
+            if event.tick not in self._found_victims[foundVic]:
+                self._found_victims[foundVic].append(event.tick)
+                self._found_victims_logs[foundVic].append({'room': loc, 'tick': event.tick})
+
+            # Add the victim and its location to memory
+            self._remember_victim(foundVic, loc)
+            # Decide to help the human carry a found victim when the human's condition is 'weak'
+            if self._get_condition() == 'weak':
+                self._rescue = 'together'
+            # Add the found victim to the to do list when the human's condition is not 'weak'
+            if 'mild' in foundVic and self._get_condition() != 'weak':
+                self._todo.append(foundVic)
+        # If a received message involves team members rescuing victims, add these victims and their locations to memory
+        if event.kind == 'Collect':
+            # Identify which victim and area it concerns
+            collectVic = event.victim
+            loc = event.area
+            # Add the area to the memory of searched areas
+            if loc not in self._explored_rooms:
+                self._explored_rooms.append(loc)
+            # Add the victim and location to the memory of found victims
+            self._remember_victim(collectVic, loc)
+            # Add the victim to the memory of rescued victims when the human's condition is not weak
+            if self._get_condition() != 'weak' and collectVic not in self._collected_victims:
+                self._collected_victims.append(collectVic)
+            # Decide to help the human carry the victim together when the human's condition is weak or if the human's condition is normal and they are close
+            if self._get_condition() == 'weak' or self._get_condition() == 'normal' and self._human_loc == 'close':
+                self._rescue = 'together'
+        # If a received message involves team members asking for help with removing obstacles, add their location to memory and come over
+        if event.kind == 'Remove' and event.area:
+            # Come over immediately when the agent is not carrying a victim
+            if not self._carrying:
+                # Identify at which location the human needs help
+                area = event.area
+                self._door = self._map.door(area)
+                self._doormat = self._map.doormat(area)
+                if area in self._explored_rooms:
+                    self._explored_rooms.remove(area)
+                # Clear received messages (bug fix)
+                self.received_messages.clear()
+                self._moving = True
+                self._remove = True
+                if self._waiting and self._recent_vic:
+                    self._todo.append(self._recent_vic)
+                self._waiting = False
+                # Let the human know that the agent is coming over to help
+                self._send_message(
+                    'Moving to ' + str(self._door['room_name']) + ' to help you remove an obstacle.',
+                    'RescueBot')
+                # Plan the path to the relevant area
+                self._phase = Phase.PLAN_PATH_TO_ROOM
+            # Come over to help after dropping a victim that is currently being carried by the agent
+            else:
+                area = event.area
+                self._send_message('Will come to ' + area + ' after dropping ' + self._goal_vic + '.',
+                                   'RescueBot')
+
+    def _remember_victim(self, victim, loc):
+        """
+        Add a victim reported by a team member and its area to memory
+        """
+        if victim not in self._known_victims:
+            self._known_victims.append(victim)
+            self._known_victim_logs[victim] = {'room': loc}
+        if victim in self._known_victims and self._known_victim_logs[victim]['room'] != loc:
+            self._known_victim_logs[victim] = {'room': loc}
 
     def _get_condition(self):
         """
@@ -1189,23 +1252,9 @@ class BaselineAgent(ArtificialBrain):
         """
         # Create a dictionary with trust values for all team members
         trustBeliefs = defaultdict(dict)
-        # Set a default starting trust value
-        trustfile_header = []
-        trustfile_contents = []
         # Check if agent already collaborated with this human before, if yes: load the corresponding trust values, if no: initialize using default trust values
-        with open(folder + '/beliefs/allTrustBeliefs.csv') as csvfile:
-            reader = csv.reader(csvfile, delimiter=';', quotechar="'")
-            for row in reader:
-                if not trustfile_header:
-                    trustfile_header = row
-                    continue
-                # Retrieve trust values
-                if row and row[0] == self._human_name:
-                    name = row[0]
-                    task = row[1]
-                    competence = float(row[2])
-                    willingness = float(row[3])
-                    trustBeliefs[name][task] = {'competence': competence, 'willingness': willingness}
+        self._belief_store.refresh()
+        trustBeliefs[self._human_name].update(self._belief_store.get_all(self._human_name))
         # Initialize with default values if not initialized yet
         for task in self._tasks:
             if not trustBeliefs[self._human_name] or not trustBeliefs[self._human_name].get(task):
@@ -1214,7 +1263,7 @@ class BaselineAgent(ArtificialBrain):
                 trustBeliefs[self._human_name][task] = {'competence': competence, 'willingness': willingness}
         return trustBeliefs
 
-    def _trustBelief(self, members, trustBeliefs, folder, receivedMessages):
+    def _trustBelief(self, members, trustBeliefs, folder, messageTicks):
         """
         Creates a dictionary with trust belief scores for each team member.
         Does not change the beliefs for ALWAYS_TRUST, NEVER_TRUST and RANDOM_TRUST.
@@ -1223,173 +1272,205 @@ class BaselineAgent(ArtificialBrain):
         if self._human_name in self._reserved_names:
             return
 
+        # Start again from the loaded trust beliefs when they changed, for example after re-searching all areas
+        if self._trust_base != trustBeliefs[self._human_name]:
+            self._trust_base = {task: dict(belief) for task, belief in trustBeliefs[self._human_name].items()}
+            self._message_trust_belief = {task: dict(belief) for task, belief in trustBeliefs[self._human_name].items()}
+            self._trust_cursor = 0
+            self._previous_trust_message = None
+            self._trust_history = []
+            self._unsearched_collects = {}
+
+        # Collect messages are judged differently once their area has been searched, so apply the messages again from the first of those
+        resolved = [i for location, indices in self._unsearched_collects.items() if self._searched_rooms.get(location)
+                    for i in indices]
+        if resolved:
+            self._trust_cursor = min(resolved)
+            self._message_trust_belief, self._previous_trust_message = self._trust_history[self._trust_cursor]
+            del self._trust_history[self._trust_cursor:]
+            self._unsearched_collects = {location: [i for i in indices if i < self._trust_cursor]
+                                         for location, indices in self._unsearched_collects.items()
+                                         if min(indices) < self._trust_cursor}
+
+        # Update the trust value based on the received messages, only applying the messages received since the last tick
+        messageTrustBeliefs = defaultdict(dict)
+        messageTrustBeliefs[self._human_name] = self._message_trust_belief
+        for i in range(self._trust_cursor, len(self._received_message_log)):
+            # Keep the beliefs from before each message, so the messages can be applied again from any point
+            self._trust_history.append(({task: dict(belief) for task, belief in self._message_trust_belief.items()},
+                                        self._previous_trust_message))
+            self._trust_from_message(i, self._received_message_log[i], messageTrustBeliefs)
+        self._trust_cursor = len(self._received_message_log)
+
         # Save current trust belief values so we can later use and retrieve them to add to a csv file with all the logged trust belief values
-        # Update the trust value based on for example the received messages
-        previous_message, previous_message_tick = None, 0
-
-        for i, ((message, pos), message_tick) in enumerate(receivedMessages.items()):
-            if 'Collect' in message:
-                task = 'rescue'
-                message_tokens = message.split(" in ")
-                victim_location = "area " + message_tokens[1]
-                victim_name = message_tokens[0].replace("Collect: ", "")
-                if not self._found_victims[victim_name] or (
-                        self._found_victims[victim_name] and self._found_victims[victim_name][0] >= message_tick):
-                    log_info(self._message_count == i, "Victim collected but not found")
-                    competence_adj, willingness_adj = compute_collected_adjustments(victim_name, -0.1)
-                    self._change_belief(competence_adj, willingness_adj, task, trustBeliefs)
-                elif self._found_victims[victim_name][0] < message_tick:
-                    found_location = None
-                    for log in self._found_victims_logs[victim_name]:
-                        if log['tick'] < message_tick:
-                            found_location = log['room']
-
-                    if found_location != victim_location:
-                        log_info(self._message_count == i,
-                                 "Victim collected but found in another location. Rescue ability and willingness decrease")
-                        competence_adj, willingness_adj = compute_collected_adjustments(victim_name, -0.05)
-                        self._change_belief(competence_adj, willingness_adj, task, trustBeliefs)
-                    else:
-                        log_info(self._message_count == i,
-                                 "Victim collected and found in right location. Rescue ability and willingness increase")
-                        competence_adj, willingness_adj = compute_collected_adjustments(victim_name, 0.1)
-                        self._change_belief(competence_adj, willingness_adj, task, trustBeliefs)
-
-                if victim_location not in self._searched_rooms or not self._searched_rooms[victim_location]:
-                    log_info(self._message_count == i,
-                             "Victim location not found in searched rooms. Skipping trust adjustment to prevent errors.")
-                else:
-                    if self._searched_rooms[victim_location][0]['tick'] >= message_tick:
-                        log_info(self._message_count == i,
-                                 "Victim collected but location was not searched. Search and rescue ability and willingness decrease")
-                        self._change_belief(-0.12, -0.12, 'search', trustBeliefs)
-                        self._change_belief(-0.12, -0.12, 'rescue', trustBeliefs)
+        trustBeliefs[self._human_name] = {task: dict(belief) for task, belief in self._message_trust_belief.items()}
 
+        # Penalize the human for not providing information to the robot in a long time.
+        total_decay = self._decay_trust(messageTicks)
+        self.apply_trust_decay(total_decay, -0.25, trustBeliefs)
+
+        # Save to CSV, the writer flushes the beliefs to disk in the background
+        rows = [['name', 'task', 'competence', 'willingness']]
+        for task in self._tasks:
+            rows.append([self._human_name, task, trustBeliefs[self._human_name][task]['competence'],
+                         trustBeliefs[self._human_name][task]['willingness']])
+        self._belief_writer.mark_dirty(rows)
+
+        self._message_count = self._trust_cursor
 
-            elif 'Search' in message:
-                task = 'search'
-                message_tokens = message.split(" ")
-                search_location = "area " + message_tokens[1]
+        self.update_trust_from_confirmed_info(trustBeliefs)
+
+        return trustBeliefs
 
-                if search_location not in self._searched_rooms or (
-                        search_location in self._searched_rooms and self._searched_rooms[search_location][0][
-                    'tick'] >= message_tick):
+    def _trust_from_message(self, i, message_event, trustBeliefs):
+        """
+        Applies the trust rules of a single received message event to the trust beliefs.
+        Every message is applied exactly once, in the order in which the messages were received.
+        """
+        message = message_event.content
+        message_tick = message_event.tick
+        if message_event.kind == 'Collect':
+            task = 'rescue'
+            victim_location = message_event.area
+            victim_name = message_event.victim
+            if not self._found_victims[victim_name] or (
+                    self._found_victims[victim_name] and self._found_victims[victim_name][0] >= message_tick):
+                log_info(self._message_count == i, "Victim collected but not found")
+                competence_adj, willingness_adj = compute_collected_adjustments(victim_name, -0.1)
+                self._change_belief(competence_adj, willingness_adj, task, trustBeliefs)
+            elif self._found_victims[victim_name][0] < message_tick:
+                found_location = None
+                for log in self._found_victims_logs[victim_name]:
+                    if log['tick'] < message_tick:
+                        found_location = log['room']
+
+                if found_location != victim_location:
                     log_info(self._message_count == i,
-                             "Location searched for the first time. Search ability and willingness increase")
-                    self._change_belief(0.05, 0.08, task, trustBeliefs)
+                             "Victim collected but found in another location. Rescue ability and willingness decrease")
+                    competence_adj, willingness_adj = compute_collected_adjustments(victim_name, -0.05)
+                    self._change_belief(competence_adj, willingness_adj, task, trustBeliefs)
                 else:
-                    search_type = None
-                    for event in self._searched_rooms[search_location]:
-                        if event['tick'] == message_tick:
-                            search_type = event['type']
-                            break
-
                     log_info(self._message_count == i,
-                             "Location was searched before. Search ability and willingness decrease")
-                    competence_adj, willingness_adj = (-0.1, -0.1) if search_type == 'Human' else (
-                        -0.15, -0.15)
+                             "Victim collected and found in right location. Rescue ability and willingness increase")
+                    competence_adj, willingness_adj = compute_collected_adjustments(victim_name, 0.1)
                     self._change_belief(competence_adj, willingness_adj, task, trustBeliefs)
 
-            elif 'Found' in message:
-                task = 'rescue'
-                message_tokens = message.split(" in ")
-                location = "area " + message_tokens[-1]
-                victim_name = message_tokens[0].replace("Found: ", "")
-                if (victim_name not in self._found_victims) or (
-                        victim_name in self._found_victims and message_tick <= self._found_victims[victim_name][0]):
-                    log_info(self._message_count == i,
-                             f"Found {victim_name} in {location}. Rescue willingness increases")
-                    self._change_belief(0.0, 0.05, task, trustBeliefs)
-                else:
-                    same_victim_reported_twice_at_different_location = False
-                    for found_log in self._found_victims_logs[victim_name]:
-                        if found_log['tick'] >= message_tick:
-                            break
-                        if found_log['room'] != location:
-                            same_victim_reported_twice_at_different_location = True
-                            break
-                    if same_victim_reported_twice_at_different_location:
-                        log_info(self._message_count == i,
-                                 f"{victim_name} reported twice at different locations. Rescue ability and willingness decrease")
-                        self._change_belief(-0.12, -0.12, task, trustBeliefs)
-                    else:
-                        log_info(self._message_count == i,
-                                 f"{victim_name} reported twice at the same location. Rescue ability and willingness decrease, but with a small amount")
-                        self._change_belief(-0.05, -0.05, task, trustBeliefs)
-
-                if not self._searched_rooms[location] or (self._searched_rooms[location][0]['tick'] >= message_tick):
+            if victim_location not in self._searched_rooms or not self._searched_rooms[victim_location]:
+                log_info(self._message_count == i,
+                         "Victim location not found in searched rooms. Skipping trust adjustment to prevent errors.")
+                # Remember the message, so it is applied again when the location is searched
+                self._unsearched_collects.setdefault(victim_location, []).append(i)
+            else:
+                if self._searched_rooms[victim_location][0]['tick'] >= message_tick:
                     log_info(self._message_count == i,
-                             f"Found a victim in unsearched room {location}. Rescue and search ability and willingness decrease")
+                             "Victim collected but location was not searched. Search and rescue ability and willingness decrease")
                     self._change_belief(-0.12, -0.12, 'search', trustBeliefs)
                     self._change_belief(-0.12, -0.12, 'rescue', trustBeliefs)
 
-            elif 'Remove' in message:
-                task = 'search'
-                if message == "Remove alone":
-                    log_info(self._message_count == i,
-                             f"Remove alone. Nothing happens, as the robot will do it itself")
-                elif message == "Remove together":
-                    log_info(self._message_count == i,
-                             f"Player wants to help removing the obstacle. Search ability and willingness")
-                    self._change_belief(0.05, 0.15, task, trustBeliefs)
-                elif message == "Remove":
+
+        elif message_event.kind == 'Search':
+            task = 'search'
+            search_location = message_event.area
+
+            if search_location not in self._searched_rooms or (
+                    search_location in self._searched_rooms and self._searched_rooms[search_location][0][
+                'tick'] >= message_tick):
+                log_info(self._message_count == i,
+                         "Location searched for the first time. Search ability and willingness increase")
+                self._change_belief(0.05, 0.08, task, trustBeliefs)
+            else:
+                search_type = None
+                for event in self._searched_rooms[search_location]:
+                    if event['tick'] == message_tick:
+                        search_type = event['type']
+                        break
+
+                log_info(self._message_count == i,
+                         "Location was searched before. Search ability and willingness decrease")
+                competence_adj, willingness_adj = (-0.1, -0.1) if search_type == 'Human' else (
+                    -0.15, -0.15)
+                self._change_belief(competence_adj, willingness_adj, task, trustBeliefs)
+
+        elif message_event.kind == 'Found':
+            task = 'rescue'
+            location = message_event.area
+            victim_name = message_event.victim
+            if (victim_name not in self._found_victims) or (
+                    victim_name in self._found_victims and message_tick <= self._found_victims[victim_name][0]):
+                log_info(self._message_count == i,
+                         f"Found {victim_name} in {location}. Rescue willingness increases")
+                self._change_belief(0.0, 0.05, task, trustBeliefs)
+            else:
+                same_victim_reported_twice_at_different_location = False
+                for found_log in self._found_victims_logs[victim_name]:
+                    if found_log['tick'] >= message_tick:
+                        break
+                    if found_log['room'] != location:
+                        same_victim_reported_twice_at_different_location = True
+                        break
+                if same_victim_reported_twice_at_different_location:
                     log_info(self._message_count == i,
-                             f"Player wants to remove the tree. Search willingness slightly increases")
-                    self._change_belief(0.0, 0.05, task, trustBeliefs)
+                             f"{victim_name} reported twice at different locations. Rescue ability and willingness decrease")
+                    self._change_belief(-0.12, -0.12, task, trustBeliefs)
                 else:
-                    location = "area" + message.replace("Remove: at", "")
-                    log_info(self._message_count == i,
-                             f"Search willingness increases for wanting help to remove")
-                    self._change_belief(0.0, 0.1, task, trustBeliefs)
-                    if not self._searched_rooms[location] or (
-                            self._searched_rooms[location][0]['tick'] >= message_tick):
-                        log_info(self._message_count == i,
-                                 f"Search ability and willingness decrease for asking for remove help in unsearched room {location}")
-                        self._change_belief(-0.12, -0.12, 'search', trustBeliefs)
-
-            if 'Rescue' in message:
-                task = 'rescue'
-                if message == "Rescue alone":
                     log_info(self._message_count == i,
-                             f"Rescue alone. Nothing happens, as the robot will do it itself")
-                elif message == "Rescue together" or message == "Rescue":
-                    log_info(self._message_count == i,
-                             f"Player wants to help rescuing the victim. Rescue ability and willingness")
-                    self._change_belief(0.12, 0.12, task, trustBeliefs)
-
-            elif 'Continue' in message:
-                for task in self._tasks:
-                    self._change_belief(0.0, -0.1, task, trustBeliefs)
-
-            if previous_message:
-                previous_message_info = self._task_information.get(message.split(" ")[0])
-                if previous_message_info and message_tick - previous_message_tick < previous_message_info[
-                    'expected_time_to_complete']:
+                             f"{victim_name} reported twice at the same location. Rescue ability and willingness decrease, but with a small amount")
+                    self._change_belief(-0.05, -0.05, task, trustBeliefs)
+
+            if not self._searched_rooms[location] or (self._searched_rooms[location][0]['tick'] >= message_tick):
+                log_info(self._message_count == i,
+                         f"Found a victim in unsearched room {location}. Rescue and search ability and willingness decrease")
+                self._change_belief(-0.12, -0.12, 'search', trustBeliefs)
+                self._change_belief(-0.12, -0.12, 'rescue', trustBeliefs)
+
+        elif message_event.kind == 'Remove':
+            task = 'search'
+            if message == "Remove alone":
+                log_info(self._message_count == i,
+                         f"Remove alone. Nothing happens, as the robot will do it itself")
+            elif message == "Remove together":
+                log_info(self._message_count == i,
+                         f"Player wants to help removing the obstacle. Search ability and willingness")
+                self._change_belief(0.05, 0.15, task, trustBeliefs)
+            elif message == "Remove":
+                log_info(self._message_count == i,
+                         f"Player wants to remove the tree. Search willingness slightly increases")
+                self._change_belief(0.0, 0.05, task, trustBeliefs)
+            else:
+                location = message_event.area
+                log_info(self._message_count == i,
+                         f"Search willingness increases for wanting help to remove")
+                self._change_belief(0.0, 0.1, task, trustBeliefs)
+                if not self._searched_rooms[location] or (
+                        self._searched_rooms[location][0]['tick'] >= message_tick):
                     log_info(self._message_count == i,
-                             f"The previous task was likely not finished. Ability and willingness for {previous_message_info['task']} decrease")
-                    self._change_belief(-0.1, -0.2, previous_message_info['task'], trustBeliefs)
-
-            previous_message = message
-            previous_message_tick = message_tick
-
-        # Penalize the human for not providing information to the robot in a long time.
-        total_decay = self._decay_trust(receivedMessages)
-        self.apply_trust_decay(total_decay, -0.25, trustBeliefs)
+                             f"Search ability and willingness decrease for asking for remove help in unsearched room {location}")
+                    self._change_belief(-0.12, -0.12, 'search', trustBeliefs)
 
-        # Save to CSV
-        with open(folder + '/beliefs/currentTrustBelief.csv', mode='w') as csv_file:
-            csv_writer = csv.writer(csv_file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
-            csv_writer.writerow(['name', 'task', 'competence', 'willingness'])
+        if message_event.kind == 'Rescue':
+            task = 'rescue'
+            if message == "Rescue alone":
+                log_info(self._message_count == i,
+                         f"Rescue alone. Nothing happens, as the robot will do it itself")
+            elif message == "Rescue together" or message == "Rescue":
+                log_info(self._message_count == i,
+                         f"Player wants to help rescuing the victim. Rescue ability and willingness")
+                self._change_belief(0.12, 0.12, task, trustBeliefs)
+
+        elif message_event.kind == 'Continue':
             for task in self._tasks:
-                csv_writer.writerow(
-                    [self._human_name, task, trustBeliefs[self._human_name][task]['competence'],
-                     trustBeliefs[self._human_name][task]['willingness']])
+                self._change_belief(0.0, -0.1, task, trustBeliefs)
 
-        self._message_count = len(receivedMessages)
+        if self._previous_trust_message:
+            # Only the messages about an area announce a task
+            previous_message_info = self._task_information.get(message_event.kind) if message_event.area else None
+            if previous_message_info and message_tick - self._previous_trust_message.tick < previous_message_info[
+                'expected_time_to_complete']:
+                log_info(self._message_count == i,
+                         f"The previous task was likely not finished. Ability and willingness for {previous_message_info['task']} decrease")
+                self._change_belief(-0.1, -0.2, previous_message_info['task'], trustBeliefs)
 
-        self.update_trust_from_confirmed_info(trustBeliefs)
-
-        return trustBeliefs
+        self._previous_trust_message = message_event
 
     def update_trust_from_confirmed_info(self, trustBeliefs):
         # This function is used to update the trust scores based on the confirmed human information that the RescueBot has
@@ -1476,48 +1557,26 @@ class BaselineAgent(ArtificialBrain):
 
     def _send_message(self, mssg, sender):
         """
-        send messages from agent to other team members
+        send messages from agent to other team members, a message that was sent during the last `message_ttl` ticks is
+        suppressed, except for the hidden score message which is sent every time
         """
         msg = Message(content=mssg, from_id=sender)
-        if msg.content not in self.received_messages_content and 'Our score is' not in msg.content:
+        if not self.received_messages.has_content(msg.content) and 'Our score is' not in msg.content \
+                and self._sent_messages.admit(msg.content, self.state['World']['nr_ticks']):
             self.send_message(msg)
-            self._send_messages.append(msg.content)
         # Sending the hidden score message (DO NOT REMOVE)
         if 'Our score is' in msg.content:
             self.send_message(msg)
 
     def _getClosestRoom(self, state, objs, currentDoor):
         """
-        calculate which area is closest to the agent's location
+        calculate which area to search next, the first area of the fastest route along all areas from the agent's location
         """
         agent_location = state[self.agent_id]['location']
-        locs = {}
-        for obj in objs:
-            locs[obj] = state.get_room_doors(obj)[0]['location']
-        dists = {}
-        for room, loc in locs.items():
-            if currentDoor != None:
-                dists[room] = utils.get_distance(currentDoor, loc)
-            if currentDoor == None:
-                dists[room] = utils.get_distance(agent_location, loc)
-
-        return min(dists, key=dists.get)
-
-    def _efficientSearch(self, tiles):
-        """
-        efficiently transverse areas instead of moving over every single area tile
-        """
-        x = []
-        y = []
-        for i in tiles:
-            if i[0] not in x:
-                x.append(i[0])
-            if i[1] not in y:
-                y.append(i[1])
-        locs = []
-        for i in range(len(x)):
-            if i % 2 == 0:
-                locs.append((x[i], min(y)))
-            else:
-                locs.append((x[i], max(y)))
-        return locs
+        # The route is planned with the walking distances between the doormats, which are computed once per world
+        if currentDoor != None:
+            order = self._routes.visit_order(currentDoor, objs)
+        else:
+            order = self._routes.visit_order(agent_location, objs)
+        # Areas without a doormat are left out of the route, search the first area when none of them has one
+        return order[0] if order else objs[0]
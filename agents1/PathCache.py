@@ -0,0 +1,160 @@
+import math
+import heapq
+from collections import OrderedDict
+
+import numpy as np
+from matrx.agents.agent_utils.navigator import Navigator, AStarPlanner
+from matrx.agents.agent_utils.state_tracker import get_traversability_map
+from agents1.ActionDurations import action_durations, ROBOT, WATER
+
+# Weight of the length of a route in the tick costs, small enough to only choose between routes that take equally long
+TIE_BREAK = 1e-3
+
+
+class PathCache:
+    '''
+    Least recently used cache of the paths planned by A*, keyed by start, goal and traversability version.
+    The version changes when the traversability map of the agent changes, e.g. when an obstacle is removed or a door
+    is opened or closed. The paths of older versions can not be reused, so they are dropped at that moment.
+    '''
+    def __init__(self, maxsize=1024):
+        self._maxsize = maxsize
+        self._paths = OrderedDict()
+        self._occupation_map = None
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def traversability_map(self, state):
+        '''
+        @return the traversability map of the state, after updating the version of the cache to it
+        '''
+        occupation_map, obj_grid = get_traversability_map(state=state)
+        if self._occupation_map is None or not np.array_equal(occupation_map, self._occupation_map):
+            self._occupation_map = occupation_map
+            self.version += 1
+            self._paths.clear()
+        return occupation_map, obj_grid
+
+    def get(self, start, goal):
+        '''
+        @return the cached path from the start to the goal, None when it was not planned yet in this version
+        '''
+        key = (tuple(start), tuple(goal), self.version)
+        path = self._paths.get(key)
+        if path is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._paths.move_to_end(key)
+        return path
+
+    def put(self, start, goal, path):
+        '''
+        Remember the path from the start to the goal for the current version, evicting the least recently used paths.
+        Every remaining part of the path is a shortest path from its first location as well, so it is remembered too.
+        '''
+        goal = tuple(goal)
+        self._paths[(tuple(start), goal, self.version)] = path
+        for i in range(len(path) - 1):
+            self._paths[(tuple(path[i]), goal, self.version)] = path[i + 1:]
+        while len(self._paths) > self._maxsize:
+            self._paths.popitem(last=False)
+
+
+class CachedAStarPlanner(AStarPlanner):
+    '''
+    The A* planner of MATRX, which first looks up the path in the PathCache given in the settings.
+    When the settings hold a WaterMap, the planner minimizes the number of ticks of the route instead of its length:
+    every move takes as long as the brain makes the action that starts in the cell of the move, which is longer in
+    water. Of the routes that take equally long, the shortest is taken.
+    '''
+    def __init__(self, action_set, settings):
+        super().__init__(action_set, settings)
+        self._cache = settings['path_cache']
+        self._water_map = settings.get('water_map')
+        self._slowdown = settings.get('slowdown')
+
+    def plan(self, start, goal, occupation_map):
+        path = self._cache.get(start, goal)
+        if path is None:
+            if self._water_map is None:
+                path = super().plan(start, goal, occupation_map)
+            else:
+                path = self._plan_ticks(tuple(start), tuple(goal), occupation_map)
+            self._cache.put(start, goal, path)
+        return path
+
+    def _plan_ticks(self, start, goal, occupation_map):
+        width, height = occupation_map.shape
+        moves = [(dx, dy, math.hypot(dx, dy)) for dx, dy in self.move_actions.values() if (dx, dy) != (0, 0)]
+        min_step = min(self._slowdown, action_durations.duration(None, None, ROBOT, WATER, self._slowdown))
+
+        # Every move takes at least the quickest step, and the route is at least as long as the straight line
+        def heuristic(location):
+            dx, dy = abs(location[0] - goal[0]), abs(location[1] - goal[1])
+            return min_step * max(dx, dy) + TIE_BREAK * math.hypot(dx, dy)
+
+        costs = {start: 0}
+        came_from = {}
+        closed = set()
+        heap = [(heuristic(start), start)]
+        while heap:
+            current = heapq.heappop(heap)[1]
+            if current == goal:
+                path = []
+                while current in came_from:
+                    path.append(current)
+                    current = came_from[current]
+                return path[::-1]
+            if current in closed:
+                continue
+            closed.add(current)
+            step = self._water_map.duration(current, self._slowdown)
+            for dx, dy, length in moves:
+                neighbour = (current[0] + dx, current[1] + dy)
+                if not (0 <= neighbour[0] < width and 0 <= neighbour[1] < height) \
+                        or occupation_map[neighbour[0]][neighbour[1]] != 0:
+                    continue
+                cost = costs[current] + step + TIE_BREAK * length
+                if cost < costs.get(neighbour, float('inf')):
+                    costs[neighbour] = cost
+                    came_from[neighbour] = current
+                    heapq.heappush(heap, (cost + heuristic(neighbour), neighbour))
+        # If no path is available we stay put
+        return [start]
+
+
+class CachedNavigator(Navigator):
+    '''
+    Navigator that plans with the CachedAStarPlanner. The cache is kept when the navigator is reset, so the routes
+    to the same waypoints are reused between trips.
+    With a WaterMap and the slowdown of the agent, the navigator plans the routes that take the fewest ticks.
+    '''
+    CACHED_A_STAR_ALGORITHM = "cached_a_star"
+
+    def __init__(self, agent_id, action_set, path_cache=None, is_circular=False, water_map=None, slowdown=None):
+        self.path_cache = path_cache if path_cache is not None else PathCache()
+        super().__init__(agent_id=agent_id, action_set=action_set, algorithm=self.CACHED_A_STAR_ALGORITHM,
+                         custom_algorithm_class=CachedAStarPlanner,
+                         traversability_map_func=self.path_cache.traversability_map,
+                         algorithm_settings={"metric": "euclidean", "path_cache": self.path_cache,
+                                             "water_map": water_map, "slowdown": slowdown},
+                         is_circular=is_circular)
+        self._agent_id = agent_id
+        self._action_set = action_set
+        self._water_map = water_map
+        self._slowdown = slowdown
+
+    def reset_full(self):
+        # Navigator.reset_full reinitializes with the default planner, so reinitialize with the same cache instead
+        self.__init__(self._agent_id, self._action_set, path_cache=self.path_cache, is_circular=self.is_circular,
+                      water_map=self._water_map, slowdown=self._slowdown)
+
+    def use_water_map(self, water_map, slowdown):
+        '''
+        Plan the routes that take the fewest ticks from now on. The paths planned by length are forgotten.
+        '''
+        self.path_cache = PathCache()
+        self.__init__(self._agent_id, self._action_set, path_cache=self.path_cache, is_circular=self.is_circular,
+                      water_map=water_map, slowdown=slowdown)
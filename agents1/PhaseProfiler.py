@@ -0,0 +1,125 @@
+import os
+import csv
+import time
+import atexit
+import weakref
+from collections import defaultdict
+
+
+class PhaseProfiler:
+    '''
+    Wall time and number of calls of every phase of the agent and of the helpers it calls during a tick.
+    The time of a phase runs from the moment the phase loop enters it until the loop enters the next phase or the tick
+    ends. Besides the totals, the longest call of every phase and helper and the tick it happened in are kept, to find
+    the ticks in which the agent stalls.
+    A profiler without a path is disabled: entering a phase returns immediately and no helper is wrapped.
+    '''
+    _profilers = weakref.WeakSet()
+
+    def __init__(self, path=None):
+        self.enabled = path is not None
+        self._path = path
+        self._calls = defaultdict(int)
+        self._totals = defaultdict(float)
+        self._max = defaultdict(float)
+        self._max_tick = {}
+        self._tick = None
+        self._phase = None
+        self._phase_start = None
+        if self.enabled:
+            PhaseProfiler._profilers.add(self)
+
+    def enter(self, phase):
+        '''
+        Charge the time since the previous phase was entered to that phase, and start timing the given phase.
+        '''
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._phase is not None:
+            self._record(('phase', self._phase), now - self._phase_start)
+        self._phase = phase.name
+        self._phase_start = now
+
+    def instrument(self, owner, method_names, section='helper'):
+        '''
+        Replace the methods of the owner by timed versions, only on this object and only when profiling is enabled.
+        '''
+        if not self.enabled:
+            return
+        for method_name in method_names:
+            # The methods of an object that was already instrumented are not wrapped twice
+            if method_name not in vars(owner):
+                setattr(owner, method_name, self._timed(getattr(owner, method_name), (section, method_name)))
+
+    def instrument_ticks(self, agent, method_name='decide_on_actions'):
+        '''
+        Time every call of the decision method of the agent as a tick, and close the last phase entered in the tick.
+        '''
+        if not self.enabled or method_name in vars(agent):
+            return
+        decide = getattr(agent, method_name)
+
+        def timed(state):
+            self._tick = state['World']['nr_ticks']
+            start = time.perf_counter()
+            try:
+                return decide(state)
+            finally:
+                now = time.perf_counter()
+                if self._phase is not None:
+                    self._record(('phase', self._phase), now - self._phase_start)
+                    self._phase = None
+                self._record(('tick', method_name), now - start)
+        setattr(agent, method_name, timed)
+
+    def summary(self):
+        '''
+        @return a row for every phase and helper: section, name, calls, total, mean and max milliseconds and max tick
+        '''
+        rows = []
+        for key in sorted(self._totals, key=lambda key: self._totals[key], reverse=True):
+            calls = self._calls[key]
+            rows.append([key[0], key[1], calls, round(self._totals[key] * 1000, 3),
+                         round(self._totals[key] * 1000 / calls, 3), round(self._max[key] * 1000, 3),
+                         self._max_tick[key]])
+        return rows
+
+    def write(self):
+        '''
+        Write the summary to the csv file of the profiler.
+        '''
+        if not self.enabled or not self._calls:
+            return
+        os.makedirs(os.path.dirname(self._path) or '.', exist_ok=True)
+        with open(self._path, mode='w') as csv_file:
+            csv_writer = csv.writer(csv_file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+            csv_writer.writerow(['section', 'name', 'calls', 'total_ms', 'mean_ms', 'max_ms', 'max_tick'])
+            csv_writer.writerows(self.summary())
+
+    @classmethod
+    def write_all(cls):
+        '''
+        Write the summaries of all enabled profilers, called when the world stops.
+        '''
+        for profiler in list(cls._profilers):
+            profiler.write()
+
+    def _timed(self, method, key):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._record(key, time.perf_counter() - start)
+        return timed
+
+    def _record(self, key, duration):
+        self._calls[key] += 1
+        self._totals[key] += duration
+        if duration >= self._max[key]:
+            self._max[key] = duration
+            self._max_tick[key] = self._tick
+
+
+atexit.register(PhaseProfiler.write_all)
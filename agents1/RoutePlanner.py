@@ -0,0 +1,88 @@
+import heapq
+
+
+class RoutePlanner:
+    '''
+    Plans the order in which to visit areas with the real walking costs between their doormats.
+    The costs come from shortest paths over the static map: walls block the way and every step out of water takes as
+    long as the WaterMap of the world says, the same duration the brain gives the move. Obstacles are ignored, they can
+    be removed. The distances between all doormats are computed once, when the planner is built on the first tick.
+    '''
+    def __init__(self, state, state_index, map_cache, moves, slowdown, water_map):
+        self._width, self._height = state['World']['grid_shape']
+        self._moves = [move for move in moves if move != (0, 0)]
+        self._blocked = set()
+        self._distances = {}
+        self._doormats = {room_name: tuple(map_cache.doormat(room_name)) for room_name in map_cache.rooms()
+                          if map_cache.doormat(room_name) is not None}
+        for info in state_index.of_class('EnvObject'):
+            if not info['is_traversable'] and 'ObstacleObject' not in info['class_inheritance']:
+                self._blocked.add(tuple(info['location']))
+        self._water_map = water_map
+        self._slowdown = slowdown
+        # All-pairs distances between the doormats
+        self._matrix = {room_name: self._room_distances(doormat) for room_name, doormat in self._doormats.items()}
+
+    def visit_order(self, location, rooms):
+        '''
+        @return the areas in the order to visit them from the location, nearest neighbour improved by 2-opt
+        '''
+        rooms = [room_name for room_name in rooms if room_name in self._doormats]
+        start = self._room_distances(location)
+        # Nearest neighbour tour
+        order = []
+        remaining = list(rooms)
+        costs = start
+        while remaining:
+            closest = min(remaining, key=lambda room_name: costs.get(room_name, float('inf')))
+            order.append(closest)
+            remaining.remove(closest)
+            costs = self._matrix[closest]
+        # Improve the tour with 2-opt moves, the start is fixed and the tour does not return
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(order) - 1):
+                for j in range(i + 1, len(order)):
+                    # Walking through water is not symmetric, so compare the costs of the whole tours
+                    candidate = order[:i] + order[i:j + 1][::-1] + order[j + 1:]
+                    if self._tour_cost(start, candidate) < self._tour_cost(start, order):
+                        order = candidate
+                        improved = True
+        return order
+
+    def _tour_cost(self, start, order):
+        cost = start.get(order[0], float('inf'))
+        for room_name, next_room in zip(order, order[1:]):
+            cost += self._matrix[room_name].get(next_room, float('inf'))
+        return cost
+
+    def _room_distances(self, location):
+        '''
+        @return a dictionary with the number of ticks to walk from the location to the doormat of every area
+        '''
+        location = tuple(location)
+        if location not in self._distances:
+            ticks = self._dijkstra(location)
+            self._distances[location] = {room_name: ticks[doormat] for room_name, doormat in self._doormats.items()
+                                         if doormat in ticks}
+        return self._distances[location]
+
+    def _dijkstra(self, source):
+        # The cost of a step is the duration of the move action, which depends on the cell the agent moves out of
+        ticks = {source: 0}
+        heap = [(0, source)]
+        while heap:
+            tick, (x, y) = heapq.heappop(heap)
+            if tick > ticks[(x, y)]:
+                continue
+            step = self._water_map.duration((x, y), self._slowdown)
+            for dx, dy in self._moves:
+                neighbour = (x + dx, y + dy)
+                if not (0 <= neighbour[0] < self._width and 0 <= neighbour[1] < self._height) \
+                        or neighbour in self._blocked:
+                    continue
+                if tick + step < ticks.get(neighbour, float('inf')):
+                    ticks[neighbour] = tick + step
+                    heapq.heappush(heap, (tick + step, neighbour))
+        return ticks
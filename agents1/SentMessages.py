@@ -0,0 +1,38 @@
+from collections import deque
+
+
+class SentMessages:
+    '''
+    The contents an agent sent during the last `ttl` ticks. A content that is sent again before its time to live is
+    over is suppressed, so a prompt that the agent repeats every tick is only sent once every `ttl` ticks.
+    Every content is kept in a dictionary with the tick at which it expires and in a queue ordered by that tick, so
+    testing a content and dropping the expired contents take constant time per content.
+    '''
+    def __init__(self, ttl):
+        self._ttl = ttl
+        self._expiry = {}
+        self._queue = deque()
+
+    def admit(self, content, tick):
+        '''
+        @return whether the content may be sent at the tick, in which case it is suppressed for the next `ttl` ticks
+        '''
+        while self._queue and self._queue[0][0] <= tick:
+            expiry, expired = self._queue.popleft()
+            if self._expiry.get(expired) == expiry:
+                del self._expiry[expired]
+        if content in self._expiry:
+            return False
+        self._expiry[content] = tick + self._ttl
+        self._queue.append((tick + self._ttl, content))
+        return True
+
+    def clear(self):
+        '''
+        Forget all sent contents, so every content may be sent again.
+        '''
+        self._expiry.clear()
+        self._queue.clear()
+
+    def __len__(self):
+        return len(self._expiry)
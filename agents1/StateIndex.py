@@ -0,0 +1,59 @@
+from collections import defaultdict
+
+
+class StateIndex:
+    '''
+    Index over the objects in the state of a single tick, with buckets by class, by room name and by grid cell.
+    The index is built once per tick, so the phases of the agent do not have to scan all objects in the state.
+    All buckets keep the order of the objects in the state.
+    '''
+    def __init__(self, state):
+        self._by_class = defaultdict(list)
+        self._by_room = defaultdict(list)
+        self._by_cell = defaultdict(list)
+        self._agents = []
+        self._humans = []
+        for info in state.values():
+            for class_name in info.get('class_inheritance', []):
+                self._by_class[class_name].append(info)
+            if 'room_name' in info:
+                self._by_room[info['room_name']].append(info)
+            if 'location' in info:
+                self._by_cell[tuple(info['location'])].append(info)
+            if 'is_human_agent' in info:
+                self._agents.append(info)
+                if info['is_human_agent']:
+                    self._humans.append(info)
+
+    def of_class(self, class_name):
+        '''
+        @return all objects that are an instance of the class with this name
+        '''
+        return self._by_class.get(class_name, [])
+
+    def in_room(self, room_name, class_name=None):
+        '''
+        @return all objects of this room, or only those that are an instance of the class with the given name
+        '''
+        objects = self._by_room.get(room_name, [])
+        if class_name is None:
+            return objects
+        return [info for info in objects if class_name in info.get('class_inheritance', [])]
+
+    def at(self, location):
+        '''
+        @return all objects at this grid cell
+        '''
+        return self._by_cell.get(tuple(location), [])
+
+    def agents(self):
+        '''
+        @return all agents, human and artificial
+        '''
+        return self._agents
+
+    def humans(self):
+        '''
+        @return all human agents
+        '''
+        return self._humans
@@ -0,0 +1,129 @@
+import os
+import csv
+import atexit
+import tempfile
+import threading
+import weakref
+from collections import defaultdict
+
+# The mode open() gives a new file under the umask of this process, read once as os.umask can only be read by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_NEW_FILE_MODE = 0o666 & ~_UMASK
+
+
+class TrustBeliefStore:
+    '''
+    In-memory table of the trust beliefs saved in 'allTrustBeliefs.csv', indexed by (human name, task).
+    The file is parsed once and only read again when it changed on disk.
+    '''
+    def __init__(self, path):
+        self._path = path
+        self._signature = None
+        self._beliefs = {}
+
+    def refresh(self):
+        '''
+        Reload the belief file if its modification time or size changed since the last load.
+        '''
+        stat = os.stat(self._path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature == self._signature:
+            return
+        beliefs = defaultdict(dict)
+        trustfile_header = []
+        with open(self._path) as csvfile:
+            reader = csv.reader(csvfile, delimiter=';', quotechar="'")
+            for row in reader:
+                if not trustfile_header:
+                    trustfile_header = row
+                    continue
+                # Later rows overwrite earlier rows, so the most recent session of a human is kept
+                if row:
+                    beliefs[row[0]][row[1]] = {'competence': float(row[2]), 'willingness': float(row[3])}
+        self._beliefs = beliefs
+        self._signature = signature
+
+    def get_all(self, name):
+        '''
+        @return a dictionary with a copy of the stored belief of this human for every task
+        '''
+        return {task: dict(belief) for task, belief in self._beliefs.get(name, {}).items()}
+
+
+class TrustBeliefWriter:
+    '''
+    Write-behind persistence of the current trust beliefs to 'currentTrustBelief.csv'.
+    The agent marks new beliefs dirty, a background thread writes them every `interval` seconds, and all writers
+    are closed when the world ends, which writes their last beliefs. The file is replaced atomically, so readers never
+    see a half-written file.
+    '''
+    _writers = weakref.WeakSet()
+
+    def __init__(self, path, interval=1.0):
+        self._path = path
+        self._interval = interval
+        self._rows = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='TrustBeliefWriter', daemon=True)
+        self._thread.start()
+        TrustBeliefWriter._writers.add(self)
+
+    def mark_dirty(self, rows):
+        '''
+        Replace the rows that will be written at the next flush, the first row being the header.
+        '''
+        with self._lock:
+            self._rows = rows
+
+    def flush(self):
+        '''
+        Write the dirty rows, if any, to a temporary file and rename it over the belief file.
+        The belief file keeps its mode, a new belief file gets the mode of a file created with open().
+        '''
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, None
+            if rows is None:
+                return
+            try:
+                mode = os.stat(self._path).st_mode & 0o7777
+            except FileNotFoundError:
+                mode = _NEW_FILE_MODE
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self._path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, mode='w') as csv_file:
+                    csv_writer = csv.writer(csv_file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+                    csv_writer.writerows(rows)
+                # mkstemp creates the file readable by its owner only
+                os.chmod(tmp_path, mode)
+                os.replace(tmp_path, self._path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+
+    def close(self):
+        '''
+        Stop the background thread and write the last dirty rows.
+        '''
+        self._stopped.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            self.flush()
+
+    @classmethod
+    def close_all(cls):
+        '''
+        Stop the background threads of all writers and write their last dirty rows, called when the world ends.
+        '''
+        for writer in list(cls._writers):
+            writer.close()
+
+
+atexit.register(TrustBeliefWriter.close_all)
@@ -1,6 +1,7 @@
 import sys, random, enum, ast, time
 from matrx import grid_world
 from brains1.ArtificialBrain import ArtificialBrain
+from agents1.MessageCodec import MessageCodec
 from actions1.CustomActions import *
 from matrx import utils
 from matrx.grid_world import GridWorld
@@ -78,6 +79,10 @@ class TutorialAgent(ArtificialBrain):
         self._tosearch = []
         self._tutorial = True
         self._recentVic = None
+        self._messageCodec = MessageCodec()
+        self._messageGeneration = None
+        self._messageCursor = 0
+        self._messageEvents = []
 
     def initialize(self):
         # Initialization of the state tracker and navigation algorithm
@@ -146,20 +151,18 @@ class TutorialAgent(ArtificialBrain):
                 and a cat (critically injured cat/mildly injured cat/healthy cat). The environment will also contain different obstacle types with varying removal times. \
                 At the top of the world you can find the keyboard controls, for moving you can use the arrow keys. \
                 Press the "Continue" button to start the tutorial explaining everything.', 'RescueBot')
-                if self.received_messages_content and self.received_messages_content[-1]=='Continue':
+                if self.received_messages.last_content()=='Continue':
                     self._phase=Phase.INTRO1
-                    self.received_messages_content=[]
-                    self.received_messages=[]
+                    self.received_messages.clear()
                 else:
                     return None,{}
 
             if Phase.INTRO1==self._phase:
                 self._sendMessage('Lets try out the controls first. You can move with the arrow keys. If you move down twice, you will notice that you can now no longer see me. \
                 So you can only see as far as 2 grid cells. Therefore, it is important to search the areas well. If you moved down twice, press the "Continue" button.','RescueBot')
-                if self.received_messages_content and self.received_messages_content[-1]=='Continue':
+                if self.received_messages.last_content()=='Continue':
                     self._phase=Phase.INTRO2
-                    self.received_messages_content=[]
-                    self.received_messages=[]
+                    self.received_messages.clear()
                 else:
                     return None,{}
 
@@ -167,10 +170,9 @@ class TutorialAgent(ArtificialBrain):
                 self._sendMessage('Lets move to area 3 now. When you are going to search an area, it is recommended to inform me about this.  \
                 You can do this using the button "03". This way, we can collaborate more efficiently. \
                 If you pressed the button "03" and moved to the area entrance, press the "Continue" button.', 'RescueBot')
-                if self.received_messages_content and self.received_messages_content[-1]=='Continue':
+                if self.received_messages.last_content()=='Continue':
                     self._phase=Phase.INTRO3
-                    self.received_messages_content=[]
-                    self.received_messages=[]
+                    self.received_messages.clear()
                 else:
                     return None,{}
 
@@ -180,10 +182,9 @@ class TutorialAgent(ArtificialBrain):
                 However, in all conditions the critically injured victims have to be carried together. \
                 So, let us carry critically injured elderly woman together! To do so, inform me that you found this victim by using the buttons below "I have found:" and selecting "critically injured elderly woman in 03". \
                 If you found critically injured elderly woman and informed me about it, press the "Continue" button. I will then come over to help.','RescueBot')
-                if self.received_messages_content and self.received_messages_content[-1]=='Continue':
+                if self.received_messages.last_content()=='Continue':
                     self._phase=Phase.FIND_NEXT_GOAL
-                    self.received_messages_content=[]
-                    self.received_messages=[]
+                    self.received_messages.clear()
                 else:
                     return None,{}
 
@@ -193,10 +194,9 @@ class TutorialAgent(ArtificialBrain):
                 Transport ' + self._goalVic + ' to the drop zone and move yourself on top of the image of '+ self._goalVic + '. \
                 Next, press "S" on your keyboard to drop '+ self._goalVic + '. \
                 If you completed these steps, press the "Continue" button.','RescueBot')
-                if self.received_messages_content and self.received_messages_content[-1]=='Continue':
+                if self.received_messages.last_content()=='Continue':
                     self._phase=Phase.INTRO5
-                    self.received_messages_content=[]
-                    self.received_messages=[]
+                    self.received_messages.clear()
                 else:
                     return None,{}
 
@@ -205,20 +205,18 @@ class TutorialAgent(ArtificialBrain):
                 If you are in front of area 5, you see that it is blocked by rock. This is one of the three obstacle types, and can only be removed together. \
                 So, let us remove rock together! To do so, inform me that you found this obstacle by using the button "Help remove" and selecting "at 05". \
                 I will then come over to help. If you informed me and I arrived at area 5 to help, press the "Continue" button.','RescueBot')
-                if self.received_messages_content and self.received_messages_content[-1]=='Continue':
+                if self.received_messages.last_content()=='Continue':
                     self._phase=Phase.INTRO6
-                    self.received_messages_content=[]
-                    self.received_messages=[]
+                    self.received_messages.clear()
                 else:
                     return None,{}
 
             if Phase.INTRO6==self._phase:
                 self._sendMessage('Let us remove rock together now! To do so, remain in front of rock and press "D" on your keyboard. \
                 Now, you will see a small busy icon untill rock is successfully removed. If the entrance is cleared, press the "Continue" button.','RescueBot')
-                if self.received_messages_content and self.received_messages_content[-1]=='Continue':
+                if self.received_messages.last_content()=='Continue':
                     self._phase=Phase.INTRO7
-                    self.received_messages_content=[]
-                    self.received_messages=[]
+                    self.received_messages.clear()
                 else:
                     return None,{}
 
@@ -227,10 +225,9 @@ class TutorialAgent(ArtificialBrain):
                 If you are in front of area 4, you see that it is blocked by tree. This is another obstacle type, and tree can only be removed by me. \
                 So, let me remove tree for you! To do so, inform me that you need help with removing by using the button "Help remove" and selecting "at 04". \
                 I will then come over to remove tree for you.','RescueBot')
-                if self.received_messages_content and self.received_messages_content[-1]=='Continue':
+                if self.received_messages.last_content()=='Continue':
                     self._phase=Phase.INTRO8
-                    self.received_messages_content=[]
-                    self.received_messages=[]
+                    self.received_messages.clear()
                 else:
                     return None,{}
 
@@ -244,10 +241,9 @@ class TutorialAgent(ArtificialBrain):
                 Now, press "Q" on your keyboard and transport mildly injured elderly man to the drop zone. \
                 Drop mildly injured elderly man by moving on top of the image and pressing "W" on your keyboard. \
                 If you completed these steps, press the "Continue" button.','RescueBot')
-                if self.received_messages_content and self.received_messages_content[-1]=='Continue':
+                if self.received_messages.last_content()=='Continue':
                     self._phase=Phase.INTRO9
-                    self.received_messages_content=[]
-                    self.received_messages=[]
+                    self.received_messages.clear()
                 else:
                     return None,{}
 
@@ -259,19 +255,17 @@ class TutorialAgent(ArtificialBrain):
                 You can remove stones by pressing "E" on your keyboard. Now, you will see a small busy icon untill stones is successfully removed. \
                 When you are busy removing, you can send messages but they will only appear once the action is finished. \
                 So, no need to keep clicking buttons! If the entrance is cleared, press the "Continue" button.','RescueBot')
-                if self.received_messages_content and self.received_messages_content[-1]=='Continue':
+                if self.received_messages.last_content()=='Continue':
                     self._phase=Phase.INTRO10
-                    self.received_messages_content=[]
-                    self.received_messages=[]
+                    self.received_messages.clear()
                 else:
                     return None,{}
 
             if Phase.INTRO10==self._phase:
                 self._sendMessage('This concludes the tutorial! You can now start the real task.','RescueBot')
-                if self.received_messages_content and self.received_messages_content[-1]=='Found: critically injured girl in 5':
+                if self.received_messages.last_content()=='Found: critically injured girl in 5':
                     self._phase=Phase.FIND_NEXT_GOAL
-                    self.received_messages_content=[]
-                    self.received_messages=[]
+                    self.received_messages.clear()
                 else:
                     return None, {}
             
@@ -329,8 +323,7 @@ class TutorialAgent(ArtificialBrain):
                     self._todo = []
                     self._searchedRooms = []
                     self._sendMessages = []
-                    self.received_messages = []
-                    self.received_messages_content = []
+                    self.received_messages.clear()
                     self._searchedRooms.append(self._door['room_name'])
                     self._sendMessage('Going to re-search all areas.','RescueBot')
                     self._phase = Phase.FIND_NEXT_GOAL
@@ -413,18 +406,16 @@ class TutorialAgent(ArtificialBrain):
                     if 'class_inheritance' in info and 'ObstacleObject' in info['class_inheritance'] and 'rock' in info['obj_id']:
                         objects.append(info)
                         # Proceed when human is ready to continue
-                        if self._tutorial and self.received_messages_content and self.received_messages_content[-1]=='Continue':
+                        if self._tutorial and self.received_messages.last_content()=='Continue':
                             self._phase=Phase.INTRO6
-                            self.received_messages_content=[]
-                            self.received_messages=[]
+                            self.received_messages.clear()
                         # Otherwise remain idle
                         else:
                             return None,{}
                        
                     if 'class_inheritance' in info and 'ObstacleObject' in info['class_inheritance'] and 'tree' in info['obj_id']:
                         objects.append(info)
-                        self.received_messages_content=[]
-                        self.received_messages=[]
+                        self.received_messages.clear()
                         self._remove = False
                         self._phase=Phase.INTRO8
                         # Remove the obstacle when it is a tree
@@ -519,8 +510,7 @@ class TutorialAgent(ArtificialBrain):
                     self._foundVictims.remove(self._goalVic)
                     self._roomVics = []
                     # Reset received messages (bug fix)
-                    self.received_messages = []
-                    self.received_messages_content = []
+                    self.received_messages.clear()
                 # Add the area to the list of searched areas and make a plan what to do next
                 self._searchedRooms.append(self._door['room_name'])
                 self._recentVic = None
@@ -615,30 +605,35 @@ class TutorialAgent(ArtificialBrain):
         '''
         process incoming messages received from the team members
         '''
+        # Decode only the messages received since the previous tick, start again from the beginning when they were cleared
+        if self.received_messages.generation != self._messageGeneration:
+            self._messageGeneration = self.received_messages.generation
+            self._messageEvents = []
+            self._messageCursor = 0
+        for _, mssg in self.received_messages.since(self._messageCursor):
+            self._messageEvents.append((mssg.from_id, self._messageCodec.decode(mssg.content)))
+        self._messageCursor = len(self.received_messages)
         receivedMessages = {}
         # Create a dictionary with a list of received messages from each team member
         for member in teamMembers:
             receivedMessages[member] = []
-        for mssg in self.received_messages:
+        for from_id, event in self._messageEvents:
             for member in teamMembers:
-                if mssg.from_id == member:
-                    receivedMessages[member].append(mssg.content) 
+                if from_id == member:
+                    receivedMessages[member].append(event)
         # Check the content of the received messages
         for mssgs in receivedMessages.values():
-            for msg in mssgs:
+            for event in mssgs:
                 # If a received message involves team members searching areas, add these areas to the memory of areas that have been explored
-                if msg.startswith("Search:"):
-                    area = 'area '+ msg.split()[-1]
+                if event.kind == 'Search':
+                    area = event.area
                     if area not in self._searchedRooms:
                         self._searchedRooms.append(area)
                 # If a received message involves team members finding victims, add these victims and their locations to memory
-                if msg.startswith("Found:"):
+                if event.kind == 'Found':
                     # Identify which victim and area it concerns
-                    if len(msg.split()) == 6:
-                        foundVic = ' '.join(msg.split()[1:4])
-                    else:
-                        foundVic = ' '.join(msg.split()[1:5]) 
-                    loc = 'area '+ msg.split()[-1]
+                    foundVic = event.victim
+                    loc = event.area
                     # Add the area to the memory of searched areas
                     if loc not in self._searchedRooms:
                         self._searchedRooms.append(loc)
@@ -652,13 +647,10 @@ class TutorialAgent(ArtificialBrain):
                     if 'mild' in foundVic:
                         self._todo.append(foundVic)
                 # If a received message involves team members rescuing victims, add these victims and their locations to memory
-                if msg.startswith('Collect:'):
+                if event.kind == 'Collect':
                     # Identify which victim and area it concerns
-                    if len(msg.split()) == 6:
-                        collectVic = ' '.join(msg.split()[1:4])
-                    else:
-                        collectVic = ' '.join(msg.split()[1:5]) 
-                    loc = 'area ' + msg.split()[-1]
+                    collectVic = event.victim
+                    loc = event.area
                     # Add the area to the memory of searched areas 
                     if loc not in self._searchedRooms:
                         self._searchedRooms.append(loc)
@@ -672,31 +664,30 @@ class TutorialAgent(ArtificialBrain):
                     if collectVic not in self._collectedVictims:
                         self._collectedVictims.append(collectVic)
                 # If a received message involves team members asking for help with removing obstacles, add their location to memory and come over
-                if msg.startswith('Remove:'):
+                if event.kind == 'Remove' and event.area:
                     # Identify at which location the human needs help
-                    area = 'area ' + msg.split()[-1]
+                    area = event.area
                     self._door = state.get_room_doors(area)[0]
                     self._doormat = state.get_room(area)[-1]['doormat']
                     if area in self._searchedRooms:
                         self._searchedRooms.remove(area)
                     # Clear received messages (bug fix)
-                    self.received_messages = []
-                    self.received_messages_content = []
+                    self.received_messages.clear()
                     self._remove = True
                     # Let the human know that the agent is coming over to help
                     self._sendMessage('Moving to ' + str(self._door['room_name']) + ' to help you remove an obstacle.', 'RescueBot')  
                     # Plan the path to the relevant area
                     self._phase = Phase.PLAN_PATH_TO_ROOM
             # Store the current location of the human in memory
-            if mssgs and mssgs[-1].split()[-1] in ['1','2','3','4','5','6','7','8','9','10','11','12','13','14']:
-                self._humanLoc = int(mssgs[-1].split()[-1])
+            if mssgs and mssgs[-1].area_nr in [1,2,3,4,5,6,7,8,9,10,11,12,13,14]:
+                self._humanLoc = mssgs[-1].area_nr
 
     def _sendMessage(self, mssg, sender):
         '''
         send messages from agent to other team members
         '''
         msg = Message(content=mssg, from_id=sender)
-        if msg.content not in self.received_messages_content and 'score' not in msg.content:
+        if not self.received_messages.has_content(msg.content) and 'score' not in msg.content:
             self.send_message(msg)
             self._sendMessages.append(msg.content)
         # Sending the hidden score message (DO NOT REMOVE)
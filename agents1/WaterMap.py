@@ -0,0 +1,53 @@
+import numpy as np
+from agents1.ActionDurations import action_durations, ROBOT, LAND, WATER
+
+# The doormats of the areas of the official world, an agent on a doormat is never slowed down by water
+DOORMATS = frozenset([(3,5),(9,5),(15,5),(21,5),(3,6),(9,6),(15,6),(3,17),(9,17),(15,17),(3,18),(9,18),(15,18),(21,18)])
+
+
+class WaterMap:
+    '''
+    Immutable raster of the cells of a world in which the actions of an agent are slowed down by water, computed once
+    from the water objects of the world. Water on a doormat does not slow an agent down.
+    The brains look up the terrain of their agent in it, and the route planners the cost of every step.
+    '''
+    def __init__(self, shape, water_locations, doormats=DOORMATS):
+        '''
+        @param shape the width and height of the world
+        @param water_locations iterable of the locations of all water objects of the world
+        @param doormats the locations in which water does not slow an agent down
+        '''
+        self._slow = np.zeros(tuple(shape), dtype=bool)
+        for location in water_locations:
+            if tuple(location) not in doormats:
+                self._slow[location[0], location[1]] = True
+        self._slow.setflags(write=False)
+
+    @staticmethod
+    def from_state(state, doormats=DOORMATS):
+        '''
+        @return the map of the water objects in the state of an agent
+        '''
+        water = state[{'name': 'water'}] or []
+        # The state returns a single object instead of a list when there is only one
+        if isinstance(water, dict):
+            water = [water]
+        return WaterMap(state['World']['grid_shape'], [info['location'] for info in water], doormats)
+
+    def in_water(self, location):
+        '''
+        @return whether an agent at the location is slowed down by water
+        '''
+        return self._slow[location[0], location[1]]
+
+    def terrain(self, location):
+        '''
+        @return the terrain of the location in the ActionDurations, WATER or LAND
+        '''
+        return WATER if self._slow[location[0], location[1]] else LAND
+
+    def duration(self, location, default):
+        '''
+        @return the number of ticks of a move of RescueBot out of the location, the default when it is not in water
+        '''
+        return action_durations.duration(None, None, ROBOT, self.terrain(location), default)
@@ -0,0 +1,107 @@
+import os
+import shutil
+import timeit
+import pathlib
+import argparse
+import logging
+import tempfile
+import numpy as np
+from matrx.objects.agent_body import AgentBody
+from matrx.utils import get_distance
+from worlds1.WorldBuilder import create_builder
+from actions1.CustomActions import RemoveObjectTogether, RemoveObjectResult
+from agents1.TrustBeliefs import TrustBeliefWriter
+
+
+class RangeScanRemoveObjectTogether(RemoveObjectTogether):
+    '''
+    RemoveObjectTogether as it was before it looked up the object by its id: every call collects all objects in range of
+    the agent from the grid. Only kept as the reference of the benchmark.
+    '''
+    def is_possible(self, grid_world, agent_id, **kwargs):
+        agent_avatar = grid_world.get_env_object(agent_id, obj_type=AgentBody)
+        assert agent_avatar is not None
+        remove_range = np.inf
+        objects_in_range = grid_world.get_objects_in_range(agent_avatar.location, object_type="*", sense_range=remove_range)
+        objects_in_range.pop(agent_avatar.obj_id)
+        if len(objects_in_range) == 0:
+            return RemoveObjectResult(RemoveObjectResult.NO_OBJECTS_IN_RANGE.replace('remove_range'.upper(),
+                                                                                     str(remove_range)), False)
+        if 'object_id' not in kwargs:
+            return RemoveObjectResult(RemoveObjectResult.REMOVAL_FAILED.replace('object_id'.upper(), str(None)), False)
+        object_id = kwargs['object_id']
+        if object_id not in objects_in_range:
+            return RemoveObjectResult(RemoveObjectResult.REMOVAL_FAILED.replace('object_id'.upper(),
+                                                                                str(object_id)), False)
+        return RemoveObjectResult(RemoveObjectResult.ACTION_SUCCEEDED, True)
+
+    def mutate(self, grid_world, agent_id, world_state, **kwargs):
+        object_id = kwargs['object_id']
+        remove_range = kwargs.get('remove_range', 1)
+        other_agent = world_state[{"name": "RescueBot"}]
+        other_human = world_state[{"name": kwargs['human_name']}]
+        agent_loc = grid_world.registered_agents[agent_id].location
+        objects_in_range = grid_world.get_objects_in_range(agent_loc, object_type="*", sense_range=remove_range)
+        objects_in_range.pop(agent_id)
+        for obj in objects_in_range:
+            if obj == object_id and get_distance(other_agent['location'], world_state[obj]['location']) <= remove_range \
+                    and get_distance(other_human['location'], world_state[obj]['location']) <= remove_range \
+                    and ('rock' in obj or 'stone' in obj):
+                if grid_world.remove_from_grid(object_id):
+                    return RemoveObjectResult(RemoveObjectResult.OBJECT_REMOVED.replace('object_id'.upper(),
+                                                                                        str(object_id)), True)
+                return RemoveObjectResult(RemoveObjectResult.REMOVAL_FAILED.replace('object_id'.upper(),
+                                                                                    str(object_id)), False)
+        return RemoveObjectResult(RemoveObjectResult.OBJECT_ID_NOT_WITHIN_RANGE
+                                  .replace('remove_range'.upper(), str(remove_range))
+                                  .replace('object_id'.upper(), str(object_id)), False)
+
+
+def benchmark_remove(folder, number=2000, repeat=5):
+    '''
+    Time RemoveObjectTogether on the official world, with the human and RescueBot next to a rock, against the range
+    scan it replaced. The world is not changed: the removal of the rock by the grid is skipped.
+    @param folder the folder with the beliefs in which the world is built
+    @return a dictionary with the microseconds per call of is_possible and mutate of both implementations
+    '''
+    builder = create_builder(task_type='official', condition='normal', name='human', folder=folder, headless=True,
+                             max_nr_ticks=1)
+    builder.startup(media_folder=pathlib.Path(folder).resolve())
+    world = builder.get_world()
+    world.run(builder.api_info)
+    world.remove_from_grid = lambda object_id, remove_from_carrier=True: True
+    rock = next(obj_id for obj_id in world.environment_objects if 'rock' in obj_id)
+    rock_x, rock_y = world.environment_objects[rock].location
+    world.registered_agents['human'].location = (rock_x, rock_y - 1)
+    world.registered_agents['rescuebot'].location = (rock_x - 1, rock_y)
+    world_state = world._GridWorld__get_complete_state()
+    kwargs = {'object_id': rock, 'human_name': 'human', 'remove_range': 1}
+
+    timings = {}
+    for name, action in [('range scan', RangeScanRemoveObjectTogether()), ('id lookup', RemoveObjectTogether())]:
+        result = action.mutate(world, 'human', world_state, **kwargs)
+        assert action.is_possible(world, 'human', **kwargs).succeeded and result.succeeded, result.result
+        is_possible = min(timeit.repeat(lambda: action.is_possible(world, 'human', **kwargs), number=number,
+                                        repeat=repeat)) / number
+        mutate = min(timeit.repeat(lambda: action.mutate(world, 'human', world_state, **kwargs), number=number,
+                                   repeat=repeat)) / number
+        timings[name] = {'is_possible': is_possible * 1e6, 'mutate': mutate * 1e6}
+    # Write the trust beliefs of RescueBot and stop its writer while the folder still exists
+    TrustBeliefWriter.close_all()
+    builder.stop()
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time RemoveObjectTogether on the official world against the range scan it replaced.")
+    parser.add_argument('--number', type=int, default=2000, help="number of calls per measurement")
+    parser.add_argument('--repeat', type=int, default=5, help="number of measurements, the fastest one is reported")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    # Build the world in a temporary folder with a copy of the beliefs, so the beliefs and logs of the repository are unchanged
+    with tempfile.TemporaryDirectory() as folder:
+        shutil.copytree(pathlib.Path(__file__).resolve().parent / 'beliefs', os.path.join(folder, 'beliefs'))
+        timings = benchmark_remove(folder, number=args.number, repeat=args.repeat)
+    print("implementation;is_possible_us;mutate_us")
+    for name, timing in timings.items():
+        print(f"{name};{timing['is_possible']:.1f};{timing['mutate']:.1f}")
@@ -1,4 +1,5 @@
 import copy
+import time
 import warnings
 import numpy as np
 from abc import  ABC, abstractmethod
@@ -9,6 +10,10 @@ from matrx.agents.agent_brain import AgentBrain
 from matrx.actions import GrabObject, RemoveObject, OpenDoorAction, CloseDoorAction
 from matrx.agents.agent_utils.state import State
 from matrx.messages import Message
+from loggers.TickMetrics import tick_metrics
+from agents1.WaterMap import WaterMap
+from agents1.ActionDurations import action_durations, ROBOT
+from agents1.MessageBuffer import MessageBuffer
 
 
 class ArtificialAgentBrain(AgentBrain):
@@ -62,8 +67,8 @@ class ArtificialAgentBrain(AgentBrain):
         previous_action_result: ActionResult
             The :class:`matrx.actions.action.ActionResult` of the previously
             performed or attempted action.
-        received_messages: [Message, ...]
-            The list of received messages.
+        received_messages: MessageBuffer
+            The messages received since they were last cleared.
         rnd_gen: Random
             The random generator for this agent.
         rnd_seed: int
@@ -78,8 +83,7 @@ class ArtificialAgentBrain(AgentBrain):
         # A list of messages that may be filled by this agent, which is retrieved by the GridWorld and send towards the
         # appropriate agents.
         self.messages_to_send = []
-        self.received_messages = []
-        self.received_messages_content = []
+        self.received_messages = MessageBuffer()
 
         # Filled by the WorldFactory during self.factory_initialise()
         self.agent_id = None
@@ -115,10 +119,17 @@ class ArtificialAgentBrain(AgentBrain):
         self.previous_action = None
         self.previous_action_result = None
         self.messages_to_send = []
-        self.received_messages = []
-        self.received_messages_content = []
+        self.received_messages.clear()
         self._init_state()
 
+    @property
+    def received_messages_content(self):
+        """ The contents of the received messages that are kept, from the oldest to the last received one.
+
+        Read-only, clear the received messages with `self.received_messages.clear()`.
+        """
+        return self.received_messages.contents()
+
     def filter_observations(self, state):
         """ Filters the world state before deciding on an action.
         In this method you filter the received world state to only those
@@ -494,6 +505,7 @@ class ArtificialAgentBrain(AgentBrain):
         action_kwargs : dict
             Keyword arguments for the action
         """
+        start = time.perf_counter()
         # Process any properties of this agent which were updated in the environment as a result of actions
         self.agent_properties = agent_properties
 
@@ -509,6 +521,7 @@ class ArtificialAgentBrain(AgentBrain):
         # Store the action so in the next call the agent still knows what it did
         self.previous_action = action
 
+        tick_metrics.record('agents', time.perf_counter() - start)
         # Return the filtered state, the (updated) properties, the intended actions and any keyword arguments for that
         # action if needed.
         return self.state, self.agent_properties, action, action_kwargs
@@ -595,7 +608,6 @@ class ArtificialAgentBrain(AgentBrain):
 
             # Add the message object to the received messages
             self.received_messages.append(mssg)
-            self.received_messages_content.append(mssg.content)
 
 
     def _init_state(self):
@@ -615,46 +627,34 @@ class ArtificialBrain(ArtificialAgentBrain, ABC):
     This class is the obligatory base class for the agents.
     Agents must implement decide_on_action
     """
-    def __init__(self, slowdown, condition, name, folder):
+    def __init__(self, slowdown, condition, name, folder, water_map=None):
         '''
         @param slowdown an integer. Basically this sets action_duration
         field to the given slowdown. 1 implies normal speed
         of 1 action per tick. 3 givs 1 allowed action every 3 ticks. etc.
         This is to ensure that agents run at the required speed.
+        @param water_map the WaterMap of the world, found from the water in the state on the first tick when it is not given
         '''
         self.__slowdown = slowdown
         self.__condition = condition
         self.__name = name
         self.__folder = folder
+        self._water_map = water_map
         super().__init__()
     
     def decide_on_action(self, state:State):
         '''
-        Agents must override decide_on_actions instead. Define obstacle removal durations.
+        Agents must override decide_on_actions instead. Sets the durations of the actions from the ActionDurations.
         '''
+        if self._water_map is None:
+            self._water_map = WaterMap.from_state(state)
         act,params = self.decide_on_actions(state)
         params['grab_range']=1
         params['max_objects']=1
-        # find state locations with water
-        water_locs = []
-        if state[{"name": "water"}]:
-            for water in state[{"name": "water"}]:
-                if water['location'] not in water_locs:
-                    water_locs.append(water['location'])
-        # remove doormat from water_locs
-        if state[{"name": "RescueBot"}]['location'] in water_locs and state[{"name": "RescueBot"}]['location'] not in [(3,5),(9,5),(15,5),(21,5),(3,6),(9,6),(15,6),(3,17),(9,17),(15,17),(3,18),(9,18),(15,18),(21,18)]:
-            params['action_duration'] = 13
-        else:
-            params['action_duration'] = self.__slowdown
-        # define duration to remove stone object by agent only
-        if act == 'RemoveObject' and 'stone' in params['object_id']:
-            params['action_duration'] = 200
-        # define duration to remove tree object by agent only
-        if act == 'RemoveObject' and 'tree' in params['object_id']:
-            params['action_duration'] = 100
-        # define duration to pick up a mildly injured victim by agent
-        if act == 'CarryObject' and 'mild' in params['object_id']:
-            params['action_duration'] = 150
+        # actions are slower in water, except on a doormat, and removing obstacles and carrying victims takes longer
+        params['action_duration'] = action_durations.duration(act, params.get('object_id'), ROBOT,
+                                                              self._water_map.terrain(state[self.agent_id]['location']),
+                                                              self.__slowdown)
 
         return act,params
     
@@ -1,3 +1,4 @@
+import time
 import warnings
 import copy
 import numpy as np
@@ -9,11 +10,15 @@ from matrx.agents import HumanAgentBrain
 from matrx.messages import Message
 from matrx.actions.move_actions import MoveNorth, MoveNorthEast, MoveEast, MoveSouthEast, MoveSouth, MoveSouthWest, MoveWest, MoveNorthWest
 from actions1.CustomActions import RemoveObjectTogether, Idle, CarryObject, CarryObjectTogether, DropObjectTogether, Drop, RemoveObject
+from loggers.TickMetrics import tick_metrics
+from agents1.WaterMap import WaterMap
+from agents1.ActionDurations import action_durations, HUMAN
 
 class HumanBrain(HumanAgentBrain):
     """ Creates an Human Agent which is an agent that can be controlled by a human.
     """
-    def __init__(self, memorize_for_ticks=None, fov_occlusion=False, max_carry_objects=3, grab_range=1, drop_range=1, door_range=1, remove_range=1, strength='normal', name='human'):
+    def __init__(self, memorize_for_ticks=None, fov_occlusion=False, max_carry_objects=3, grab_range=1, drop_range=1, door_range=1, remove_range=1, strength='normal', name='human',
+                 water_map=None):
         super().__init__(memorize_for_ticks=memorize_for_ticks)
         self.__fov_occlusion = fov_occlusion
         if fov_occlusion:
@@ -27,6 +32,8 @@ class HumanBrain(HumanAgentBrain):
         self.__remove_range = remove_range
         self.__strength = strength
         self.__name = name
+        # The WaterMap of the world, found from the water in the state on the first move when it is not given
+        self.__water_map = water_map
 
     def _factory_initialise(self, agent_name, agent_id, action_set,
                             sense_capability, agent_properties,
@@ -148,6 +155,7 @@ class HumanBrain(HumanAgentBrain):
             Keyword arguments for the action
 
         """
+        start = time.perf_counter()
         # Process any properties of this agent which were updated in the
         # environment as a result of actions
         self.agent_properties = agent_properties
@@ -169,6 +177,7 @@ class HumanBrain(HumanAgentBrain):
         # did.
         self.previous_action = action
 
+        tick_metrics.record('agents', time.perf_counter() - start)
         # Return the filtered state, the (updated) properties, the intended
         # actions and any keyword arguments for that action if needed.
         return self.state, self.agent_properties, action, action_kwargs
@@ -295,10 +304,9 @@ class HumanBrain(HumanAgentBrain):
                                                   range_=self.__remove_range,
                                                   property_to_check="is_movable")
             action_kwargs['object_id'] = obj_id
-            if obj_id and 'stone' in obj_id:
-                action_kwargs['action_duration'] = 25
-            if obj_id and 'rock' in obj_id:
-                action_kwargs['action_duration'] = 50
+            duration = action_durations.duration(action, obj_id, HUMAN)
+            if duration is not None:
+                action_kwargs['action_duration'] = duration
         
         # If the user chose to remove an object
         elif action == RemoveObject.__name__:
@@ -311,9 +319,9 @@ class HumanBrain(HumanAgentBrain):
                 self.__select_random_obj_in_range(state,
                                                   range_=self.__remove_range,
                                                   property_to_check="is_movable")
-            if obj_id and 'stone' in obj_id and self.__strength!='weak':                           
+            if obj_id and 'stone' in obj_id and self.__strength!='weak':
                 action_kwargs['object_id'] = obj_id
-                action_kwargs['action_duration'] = 200
+                action_kwargs['action_duration'] = action_durations.duration(action, obj_id, HUMAN)
 
         # if the user chose to do an open or close door action, find a door to
         # open/close within range
@@ -342,12 +350,9 @@ class HumanBrain(HumanAgentBrain):
                     self.rnd_gen.choice(doors_in_range)
 
         elif action in [MoveNorth.__name__, MoveNorthEast.__name__, MoveEast.__name__, MoveSouthEast.__name__, MoveSouth.__name__, MoveSouthWest.__name__, MoveWest.__name__, MoveNorthWest.__name__]:
-            water_locs = []
-            if state[{"name": "water"}]:
-                for water in state[{"name": "water"}]:
-                    if water['location'] not in water_locs:
-                        water_locs.append(water['location'])
-            if state[{"name": self.__name}]['location'] in water_locs and state[{"name": self.__name}]['location'] not in [(3,5),(9,5),(15,5),(21,5),(3,6),(9,6),(15,6),(3,17),(9,17),(15,17),(3,18),(9,18),(15,18),(21,18)]:
+            if self.__water_map is None:
+                self.__water_map = WaterMap.from_state(state)
+            if self.__water_map.in_water(state[self.agent_id]['location']):
                 action == Idle.__name__
                 action_kwargs['duration_in_ticks'] = 5
 
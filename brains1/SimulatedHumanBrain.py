@@ -0,0 +1,306 @@
+import re
+from matrx.messages import Message
+from matrx.utils import get_distance
+from matrx.actions.move_actions import MoveNorth, MoveNorthEast, MoveEast, MoveSouthEast, MoveSouth, MoveSouthWest, MoveWest, MoveNorthWest
+from matrx.agents.agent_utils.state_tracker import StateTracker
+from actions1.CustomActions import RemoveObjectTogether, CarryObject, CarryObjectTogether, DropObjectTogether, Drop, RemoveObject
+from agents1.MessageCodec import VICTIMS
+from agents1.MapCache import MapCache
+from agents1.PathCache import CachedNavigator
+from agents1.StateIndex import StateIndex
+from agents1.ActionDurations import action_durations, HUMAN
+from brains1.HumanBrain import HumanBrain
+
+MOVE_ACTIONS = [MoveNorth.__name__, MoveNorthEast.__name__, MoveEast.__name__, MoveSouthEast.__name__, MoveSouth.__name__, MoveSouthWest.__name__, MoveWest.__name__, MoveNorthWest.__name__]
+
+
+class SimulatedHumanBrain(HumanBrain):
+    """ A human agent that is controlled by a scripted policy instead of the keyboard, to run the task without a browser.
+    The policy searches areas, reports what it finds with 'Search:', 'Found:' and 'Collect:' messages, rescues mildly
+    injured victims alone when its strength allows it, and answers the questions of RescueBot. Every action is pressed as
+    a key of the key action map, so it has exactly the same effect as when a person plays the task.
+    The behaviour is drawn from the random generator of the agent, so runs with the same world seed are reproducible.
+
+    competence : float
+        The probability that a report is correct and that an announced area is actually searched.
+    willingness : float
+        The probability that the human agrees to help RescueBot, and then comes to help.
+    patience : int
+        The number of decisions the human waits for RescueBot before it gives up.
+    move_duration : int
+        The number of ticks of every move, a person needs some time between key presses.
+    """
+    def __init__(self, memorize_for_ticks=None, fov_occlusion=False, max_carry_objects=3, grab_range=1, drop_range=1, door_range=1, remove_range=1, strength='normal', name='human',
+                 water_map=None, competence=1.0, willingness=1.0, patience=200, move_duration=2):
+        super().__init__(memorize_for_ticks=memorize_for_ticks, fov_occlusion=fov_occlusion, max_carry_objects=max_carry_objects, grab_range=grab_range, drop_range=drop_range,
+                         door_range=door_range, remove_range=remove_range, strength=strength, name=name, water_map=water_map)
+        self._max_carry_objects = max_carry_objects
+        self._grab_range = grab_range
+        self._drop_range = drop_range
+        self._remove_range = remove_range
+        self._strength = strength
+        self._human_name = name
+        self._competence = competence
+        self._willingness = willingness
+        self._patience = patience
+        self._move_duration = move_duration
+        self._inbox = []
+
+    def initialize(self):
+        super().initialize()
+        self._inbox = []
+        self._map = None
+        self._keys = None
+        self._state_tracker = None
+        self._navigator = None
+        self._nav_target = None
+        # The running tasks, the last one is performed first
+        self._tasks = []
+        self._searched_rooms = set()
+        self._robot_rooms = set()
+        self._reported = set()
+        self._helping = set()
+        self._victim_locations = {}
+
+    def filter_user_input(self, user_input):
+        # Keep the contents of the received messages for the policy, HumanBrain removes them
+        self._inbox.extend(content for content in self.received_messages if isinstance(content, str))
+        return super().filter_user_input(user_input)
+
+    def decide_on_action(self, state, user_input):
+        """ Decides on the next action of the policy, the user input is ignored.
+        """
+        self._state_index = StateIndex(state)
+        if self._map is None:
+            self._init_map(state)
+        self._state_tracker.update(state)
+        for content in self._inbox:
+            self._handle_message(content)
+        self._inbox = []
+        self._observe(state)
+        # Perform the most recent task until it finishes, a finished task is removed from the stack
+        while True:
+            if not self._tasks:
+                self._tasks.append(self._search_next_area(state))
+            try:
+                return next(self._tasks[-1])
+            except StopIteration:
+                self._tasks.pop()
+
+    def _init_map(self, state):
+        self._map = MapCache(self._state_index)
+        self._rooms = {tuple(location): room_name for room_name in self._map.rooms()
+                       for location in self._map.tiles(room_name)}
+        self._drop_locations = {info['img_name'][8:-4]: tuple(info['location'])
+                                for info in self._state_index.of_class('GhostBlock')}
+        self._keys = {action: key for key, action in self.key_action_map.items()}
+        self._state_tracker = StateTracker(agent_id=self.agent_id)
+        self._navigator = CachedNavigator(agent_id=self.agent_id,
+                                          action_set=[action for action in self._keys if action in MOVE_ACTIONS])
+
+    def _handle_message(self, content):
+        area = re.search(r'area (\d+)', content)
+        room_name = 'area ' + area.group(1) if area else None
+        if content.startswith('Moving to ') and content.endswith(' together with you.'):
+            self._help_carry(content, room_name)
+        elif content.startswith('Moving to ') and room_name:
+            self._robot_rooms.add(room_name)
+        elif 'Please decide whether to "Remove" or "Continue"' in content:
+            self._send('Remove' if self._willing() else 'Continue')
+        elif 'Please decide whether to "Remove together", "Remove alone", or "Continue"' in content:
+            self._send('Remove together' if self._willing() else 'Remove alone')
+        elif 'Please decide whether to "Rescue together", "Rescue alone", or "Continue"' in content:
+            self._send('Rescue together' if self._willing() else 'Rescue alone')
+        elif 'Please decide whether to "Rescue" or "Continue"' in content:
+            self._send('Rescue' if self._willing() else 'Continue')
+        elif (content.startswith('Please come to ') or content.startswith('Lets remove ')) and 'remove' in content \
+                and room_name and ('remove', room_name) not in self._helping:
+            self._tasks.append(self._remove_together(room_name))
+        elif (content.startswith('Please come to ') or content.startswith('Lets carry ')) and 'carry' in content:
+            self._help_carry(content, room_name)
+
+    def _help_carry(self, content, room_name):
+        victim = next((victim for victim in VICTIMS if victim in content), None)
+        if victim and ('carry', victim) not in self._helping:
+            self._push_carry(self._carry_together(victim, room_name))
+
+    def _observe(self, state):
+        # Report every victim that is seen in an area for the first time
+        for info in self._state_index.of_class('CollectableBlock'):
+            victim = info['img_name'][8:-4]
+            room_name = self._rooms.get(tuple(info['location']))
+            if victim not in VICTIMS or room_name is None:
+                continue
+            self._victim_locations[victim] = tuple(info['location'])
+            if victim in self._reported:
+                continue
+            self._reported.add(victim)
+            self._send('Found: ' + victim + ' in ' + self._reported_area(room_name))
+            if 'mild' in victim and self._strength != 'weak':
+                self._push_carry(self._collect(victim, room_name))
+            # RescueBot comes to carry the other victims together, a willing human waits for it at the victim
+            elif self._willing():
+                self._push_carry(self._carry_together(victim, room_name))
+
+    def _push_carry(self, task):
+        # A task that picks up a victim needs free hands, so while a victim is carried it starts after the task that
+        # carries that victim to the drop zone
+        if self._carrying() and self._tasks:
+            self._tasks.insert(len(self._tasks) - 1, task)
+        else:
+            self._tasks.append(task)
+
+    def _search_next_area(self, state):
+        rooms = [room_name for room_name in self._map.rooms()
+                 if room_name not in self._searched_rooms and room_name not in self._robot_rooms]
+        if not rooms:
+            # Search all areas again, victims may have been missed
+            self._searched_rooms = set()
+            self._robot_rooms = set()
+            yield None, {}
+            return
+        location = state[self.agent_id]['location']
+        room_name = min(rooms, key=lambda room: abs(self._map.doormat(room)[0] - location[0])
+                                                + abs(self._map.doormat(room)[1] - location[1]))
+        self._searched_rooms.add(room_name)
+        self._send('Search: ' + self._reported_area(room_name))
+        if not (yield from self._walk_to(self._map.doormat(room_name))):
+            return
+        if not (yield from self._clear_entrance(room_name)):
+            return
+        # An incompetent human announces the search of an area, but does not search it
+        if self.rnd_gen.random_sample() >= self._competence:
+            return
+        for waypoint in self._map.search_route(room_name):
+            yield from self._walk_to(waypoint)
+
+    def _clear_entrance(self, room_name):
+        obstacle = self._obstacle(room_name)
+        if obstacle is None:
+            return True
+        # Only stones can be removed alone, and not by a weak human
+        if 'stone' in obstacle['obj_id'] and self._strength != 'weak':
+            duration = action_durations.duration(RemoveObject.__name__, obstacle['obj_id'], HUMAN)
+            yield self._press(RemoveObject.__name__, {'remove_range': self._remove_range, 'human_name': self._human_name,
+                                                      'object_id': obstacle['obj_id'], 'action_duration': duration})
+            return self._obstacle(room_name) is None
+        # Ask RescueBot to come and remove the obstacle, and remove it together when RescueBot is there
+        self._send('Remove: at ' + room_name.split()[-1])
+        self._helping.add(('remove', room_name))
+        result = yield from self._wait_for_removal(room_name)
+        self._helping.discard(('remove', room_name))
+        return result
+
+    def _remove_together(self, room_name):
+        self._helping.add(('remove', room_name))
+        if (yield from self._walk_to(self._map.doormat(room_name))):
+            yield from self._wait_for_removal(room_name)
+        self._helping.discard(('remove', room_name))
+
+    def _wait_for_removal(self, room_name):
+        for _ in range(self._patience):
+            obstacle = self._obstacle(room_name)
+            if obstacle is None:
+                return True
+            if 'tree' not in obstacle['obj_id'] and self._robot_near(obstacle['location'], self._remove_range):
+                yield self._press(RemoveObjectTogether.__name__, {'remove_range': self._remove_range, 'human_name': self._human_name, 'object_id': obstacle['obj_id'],
+                                                                  'action_duration': action_durations.duration(RemoveObjectTogether.__name__, obstacle['obj_id'], HUMAN)})
+            else:
+                yield None, {}
+        return False
+
+    def _collect(self, victim, room_name):
+        self._send('Collect: ' + victim + ' in ' + self._reported_area(room_name))
+        if not (yield from self._walk_to(self._victim_locations[victim])):
+            return
+        victim_info = self._victim_at(victim, self._victim_locations[victim])
+        if victim_info is None:
+            return
+        yield self._press(CarryObject.__name__, {'grab_range': self._grab_range, 'max_objects': self._max_carry_objects, 'object_id': victim_info['obj_id'],
+                                                 'strength': self._strength, 'human_name': self._human_name, 'action_type': 'alone'})
+        if self._carrying() and (yield from self._walk_to(self._drop_locations[victim])):
+            yield self._press(Drop.__name__, {'strength': self._strength, 'drop_range': self._drop_range, 'human_name': self._human_name})
+
+    def _carry_together(self, victim, room_name):
+        self._helping.add(('carry', victim))
+        self._reported.add(victim)
+        if victim not in self._victim_locations and room_name:
+            # Look for the victim in its area
+            yield from self._walk_to(self._map.doormat(room_name))
+            for waypoint in self._map.search_route(room_name):
+                if victim in self._victim_locations:
+                    break
+                yield from self._walk_to(waypoint)
+        if victim in self._victim_locations and (yield from self._walk_to(self._victim_locations[victim])):
+            # Wait for RescueBot to join, then lift the victim together and bring it to the drop zone
+            for _ in range(self._patience):
+                victim_info = self._victim_at(victim, self._victim_locations[victim])
+                if victim_info is None:
+                    break
+                if self._robot_near(victim_info['location'], self._grab_range):
+                    yield self._press(CarryObjectTogether.__name__, {'grab_range': self._grab_range, 'max_objects': self._max_carry_objects, 'human_name': self._human_name,
+                                                                     'strength': self._strength, 'object_id': victim_info['obj_id']})
+                    if self._carrying():
+                        if (yield from self._walk_to(self._drop_locations[victim])):
+                            yield self._press(DropObjectTogether.__name__, {'strength': self._strength, 'drop_range': self._drop_range, 'human_name': self._human_name})
+                        break
+                else:
+                    yield None, {}
+        self._helping.discard(('carry', victim))
+
+    def _walk_to(self, target):
+        '''
+        Moves to the target location, returns whether the target was reached
+        '''
+        target = tuple(target)
+        while tuple(self.state[self.agent_id]['location']) != target:
+            if self._nav_target != target:
+                self._navigator.reset_full()
+                self._navigator.add_waypoints([target])
+                self._nav_target = target
+            self._state_tracker.update(self.state)
+            action = self._navigator.get_move_action(self._state_tracker)
+            if action is None:
+                self._nav_target = None
+                return tuple(self.state[self.agent_id]['location']) == target
+            yield self._press(action, {})
+        self._nav_target = None
+        return True
+
+    def _press(self, action, action_kwargs):
+        # Moves are built by HumanBrain from the key of the move, the other actions get the arguments HumanBrain would
+        # give them, but for the chosen object instead of a random object in range
+        assert action in self._keys
+        if action in MOVE_ACTIONS:
+            action, action_kwargs = super().decide_on_action(self.state, [self._keys[action]])
+            action_kwargs['action_duration'] = self._move_duration
+        return action, action_kwargs
+
+    def _send(self, content):
+        self.send_message(Message(content=content, from_id=self.agent_id))
+
+    def _willing(self):
+        return self.rnd_gen.random_sample() < self._willingness
+
+    def _reported_area(self, room_name):
+        # An incompetent human sometimes reports a wrong area
+        if self.rnd_gen.random_sample() < self._competence:
+            return room_name.split()[-1]
+        return self.rnd_gen.choice(self._map.rooms()).split()[-1]
+
+    def _obstacle(self, room_name):
+        door = self._map.door(room_name)
+        return next((info for info in self._state_index.at(door['location'])
+                     if 'ObstacleObject' in info['class_inheritance']), None)
+
+    def _victim_at(self, victim, location):
+        return next((info for info in self._state_index.at(location)
+                     if 'CollectableBlock' in info['class_inheritance'] and info['img_name'][8:-4] == victim), None)
+
+    def _robot_near(self, location, range_):
+        return any(not info['is_human_agent'] and get_distance(info['location'], location) <= range_
+                   for info in self._state_index.agents())
+
+    def _carrying(self):
+        return len(self.state[self.agent_id]['is_carrying']) > 0
+
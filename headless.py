@@ -0,0 +1,57 @@
+import os
+import argparse
+import functools
+import pathlib
+from worlds1.WorldBuilder import create_builder
+from brains1.SimulatedHumanBrain import SimulatedHumanBrain
+from loggers.OutputLogger import output_logger
+from agents1.TrustBeliefs import TrustBeliefWriter
+from agents1.PhaseProfiler import PhaseProfiler
+
+# A headless run stops after this number of ticks, a run in which the human helps ends well before it (around 6000)
+MAX_NR_TICKS = 10000
+
+
+def run_headless(condition, name, folder, human_brain=SimulatedHumanBrain, max_nr_ticks=MAX_NR_TICKS, seed=1, profile=False):
+    '''
+    Run the official task once without the MATRX api and visualizer, as fast as possible.
+    The human agent is controlled by the given human brain class, it should accept the same arguments as HumanBrain.
+    Without the visualizer nobody can control the human agent with the keyboard, so by default it follows the scripted
+    policy of SimulatedHumanBrain.
+    With profile, the time RescueBot spends in every phase and helper is saved in the log folder of the run.
+    @return a dictionary with the completeness, score and number of ticks of the run
+    '''
+    builder = create_builder(task_type='official', condition=condition, name=name, folder=folder, headless=True,
+                             human_brain=human_brain, max_nr_ticks=max_nr_ticks, seed=seed, profile=profile)
+    builder.startup(media_folder=pathlib.Path(folder).resolve())
+    world = builder.get_world()
+    world.run(builder.api_info)
+    # Write the last trust beliefs of the agents to disk before they are logged, and stop their writers
+    TrustBeliefWriter.close_all()
+    PhaseProfiler.write_all()
+    # Generate the same output log file as the interactive official task
+    output_logger(folder)
+    result = {'completeness': world.simulation_goal.progress(world), 'score': world.simulation_goal.score(world),
+              'no_ticks': world.current_nr_ticks}
+    builder.stop()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the official task without a browser, the visualizer or the MATRX api.")
+    parser.add_argument('--condition', choices=['normal', 'strong', 'weak'], default='normal')
+    parser.add_argument('--name', default='headless', help="name or id of the human agent")
+    parser.add_argument('--runs', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=1, help="random seed of the first run, the next runs use the following seeds")
+    parser.add_argument('--max-ticks', type=int, default=MAX_NR_TICKS, help="stop a run after this number of ticks")
+    parser.add_argument('--profile', action='store_true', help="save the time RescueBot spends in every phase in 'phase_profile.csv'")
+    parser.add_argument('--competence', type=float, default=1.0, help="competence of the simulated human, between 0 and 1")
+    parser.add_argument('--willingness', type=float, default=1.0, help="willingness of the simulated human, between 0 and 1")
+    args = parser.parse_args()
+    human_brain = functools.partial(SimulatedHumanBrain, competence=args.competence, willingness=args.willingness)
+    fld = os.getcwd()
+    print("seed;completeness;score;no_ticks")
+    for seed in range(args.seed, args.seed + args.runs):
+        result = run_headless(args.condition, args.name, fld, human_brain=human_brain, max_nr_ticks=args.max_ticks, seed=seed,
+                              profile=args.profile)
+        print(f"{seed};{result['completeness']};{result['score']};{result['no_ticks']}")
@@ -1,5 +1,6 @@
 from matrx.logger.logger import GridWorldLogger
 from matrx.grid_world import GridWorld
+from loggers.TickMetrics import tick_metrics
 
 class ActionLogger(GridWorldLogger):
     '''
@@ -8,6 +9,11 @@ class ActionLogger(GridWorldLogger):
     def __init__(self, save_path="", file_name_prefix="", file_extension=".csv", delimiter=";"):
         super().__init__(save_path=save_path, file_name=file_name_prefix, file_extension=file_extension, delimiter=delimiter, log_strategy=1)
 
+    @tick_metrics.timed('loggers')
+    def _grid_world_log(self, grid_world, agent_data, last_tick=False, goal_status=None):
+        # Time the logging and writing of the row as a stage of the tick
+        super()._grid_world_log(grid_world, agent_data, last_tick=last_tick, goal_status=goal_status)
+
     def log(self, grid_world, agent_data):
         # Create a dictionary with the log data
         log_data = {}
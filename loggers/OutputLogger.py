@@ -5,8 +5,8 @@ import glob
 import pathlib
 
 def output_logger(fld):
-    recent_dir = max(glob.glob(os.path.join(fld, '*/')), key=os.path.getmtime)
-    recent_dir = max(glob.glob(os.path.join(recent_dir, '*/')), key=os.path.getmtime)
+    # Take the most recent experiment folder in the logs folder, other folders such as 'beliefs' can be more recent
+    recent_dir = max(glob.glob(os.path.join(fld, 'logs', '*/')), key=os.path.getmtime)
     action_files = glob.glob(os.path.join(recent_dir, 'world_1/action*'))
     if action_files:
         action_file = action_files[0]
@@ -0,0 +1,130 @@
+import time
+import functools
+import threading
+from collections import deque
+import numpy as np
+from matrx.logger.logger import GridWorldLogger
+
+# The stages of a tick of the world loop, in the order in which the world performs them
+STAGES = ['goal', 'loggers', 'agents', 'actions']
+
+
+class TickMetrics:
+    '''
+    Wall time of every stage of every tick of the world loop: the goal check, the loggers, the decisions of the agent
+    brains and the is_possible and mutate calls of the custom actions. The busy time of a tick is the time from the
+    start of the tick until the start of the next tick, without the time the world sleeps to keep its tick duration.
+    A tick overruns when its busy time is longer than the tick duration of the world.
+    The last `window` ticks are kept to compute rolling percentiles, a tick is closed when the goal of the world is
+    checked at the start of the next tick.
+    '''
+    def __init__(self, window=1000, max_overruns=20):
+        self._window = window
+        self._max_overruns = max_overruns
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, tick_duration=0):
+        '''
+        Forget all measured ticks, called when a new world starts.
+        '''
+        with self._lock:
+            self._tick_duration = tick_duration
+            self._stages = {stage: deque(maxlen=self._window) for stage in STAGES + ['tick']}
+            self._current = dict.fromkeys(STAGES, 0.)
+            self._tick = None
+            self._tick_start = None
+            self._ticks = 0
+            self._overruns = 0
+            self._recent_overruns = deque(maxlen=self._max_overruns)
+            self._last_row = None
+
+    def start_tick(self, grid_world):
+        '''
+        Close the previous tick and start timing the current tick of the world.
+        '''
+        now = time.perf_counter()
+        nr_ticks = grid_world.current_nr_ticks
+        if nr_ticks == self._tick:
+            return
+        if nr_ticks == 0 or self._tick is None:
+            self.reset(grid_world.tick_duration)
+        else:
+            # The sleep at the end of the previous tick is not part of its busy time
+            self._close_tick(now - self._tick_start - max(grid_world.sleep_duration, 0.))
+        self._tick = nr_ticks
+        self._tick_start = now
+
+    def record(self, stage, duration):
+        '''
+        Add the duration in seconds to the time of the stage in the current tick.
+        '''
+        self._current[stage] += duration
+
+    def timed(self, stage):
+        '''
+        Decorator that adds the time of every call of the decorated function to the stage.
+        '''
+        def decorator(func):
+            @functools.wraps(func)
+            def timed_func(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._current[stage] += time.perf_counter() - start
+            return timed_func
+        return decorator
+
+    def last_row(self):
+        '''
+        @return the milliseconds of every stage of the last closed tick, its busy time and whether it overran
+        '''
+        return self._last_row
+
+    def snapshot(self):
+        '''
+        @return a dictionary with the p50, p95, p99 and max milliseconds of every stage over the last ticks, and the
+        number of ticks and overruns
+        '''
+        with self._lock:
+            stages = {stage: list(durations) for stage, durations in self._stages.items()}
+            summary = {'ticks': self._ticks, 'window': len(stages['tick']), 'tick_duration_ms': self._tick_duration * 1000,
+                       'overruns': self._overruns, 'recent_overruns': list(self._recent_overruns), 'stages': {}}
+        for stage, durations in stages.items():
+            if not durations:
+                continue
+            p50, p95, p99 = np.percentile(durations, [50, 95, 99]) * 1000
+            summary['stages'][stage] = {'p50_ms': round(p50, 3), 'p95_ms': round(p95, 3), 'p99_ms': round(p99, 3),
+                                        'max_ms': round(max(durations) * 1000, 3)}
+        return summary
+
+    def _close_tick(self, busy):
+        overrun = 0 < self._tick_duration < busy
+        with self._lock:
+            for stage in STAGES:
+                self._stages[stage].append(self._current[stage])
+            self._stages['tick'].append(busy)
+            self._ticks += 1
+            if overrun:
+                self._overruns += 1
+                self._recent_overruns.append({'tick': self._tick, 'busy_ms': round(busy * 1000, 3)})
+        self._last_row = {'tick': self._tick, **{stage + '_ms': round(self._current[stage] * 1000, 3) for stage in STAGES},
+                          'busy_ms': round(busy * 1000, 3), 'overrun': overrun}
+        self._current = dict.fromkeys(STAGES, 0.)
+
+
+# The metrics of the world that runs in this process, read by the visualization server
+tick_metrics = TickMetrics()
+
+
+class TickMetricsLogger(GridWorldLogger):
+    '''
+    Logger for saving the time of every stage of each tick of the world loop, one row per closed tick.
+    '''
+    def __init__(self, save_path="", file_name_prefix="", file_extension=".csv", delimiter=";"):
+        super().__init__(save_path=save_path, file_name=file_name_prefix, file_extension=file_extension, delimiter=delimiter, log_strategy=1)
+
+    def log(self, grid_world, agent_data):
+        # The current tick is still running, so log the previous tick
+        return tick_metrics.last_row()
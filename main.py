@@ -7,6 +7,7 @@ from SaR_gui import visualization_server
 from worlds1.WorldBuilder import create_builder
 from pathlib import Path
 from loggers.OutputLogger import output_logger
+from agents1.TrustBeliefs import TrustBeliefWriter
 
 if __name__ == "__main__":
     fld = os.getcwd()
@@ -33,6 +34,8 @@ if __name__ == "__main__":
     print("Started world...")
     builder.api_info['matrx_paused'] = False
     world.run(builder.api_info)
+    # Write the last trust beliefs of the agents to disk before they are logged, and stop their writers
+    TrustBeliefWriter.close_all()
     print("DONE!")
     print("Shutting down custom visualizer")
     r = requests.get("http://localhost:" + str(visualization_server.port) + "/shutdown_visualizer")
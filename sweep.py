@@ -0,0 +1,63 @@
+import os
+import csv
+import glob
+import shutil
+import argparse
+import functools
+import itertools
+import multiprocessing
+from datetime import datetime
+from brains1.SimulatedHumanBrain import SimulatedHumanBrain
+from headless import run_headless, MAX_NR_TICKS
+
+
+def sweep(conditions, names, seeds, folder, processes=None, human_brain=SimulatedHumanBrain, max_nr_ticks=MAX_NR_TICKS):
+    '''
+    Run the official task headless for every combination of condition, human name and seed, one world per process.
+    Every run gets its own folder with a copy of the beliefs of the given folder, so runs do not share belief files.
+    As in run_headless, the human agent follows the scripted policy of SimulatedHumanBrain by default.
+    @return the rows of all output.csv files with the condition, name and seed of their run, also saved as results.csv
+    '''
+    sweep_folder = os.path.join(folder, 'sweeps', datetime.now().strftime("sweep_at_time_%Hh-%Mm-%Ss_date_%dd-%mm-%Yy"))
+    jobs = []
+    for condition, name, seed in itertools.product(conditions, names, seeds):
+        run_folder = os.path.join(sweep_folder, f"{condition}_{name}_{seed}")
+        shutil.copytree(os.path.join(folder, 'beliefs'), os.path.join(run_folder, 'beliefs'))
+        jobs.append((condition, name, seed, run_folder, human_brain, max_nr_ticks))
+    # A fresh process for every world, so no state of a world leaks into the next one
+    with multiprocessing.Pool(processes=processes, maxtasksperchild=1) as pool:
+        results = pool.map(_run_job, jobs, chunksize=1)
+    header = ['condition', 'name', 'seed', 'completeness', 'score', 'no_ticks', 'agent_actions', 'human_actions']
+    with open(os.path.join(sweep_folder, 'results.csv'), mode='w') as csv_file:
+        csv_writer = csv.writer(csv_file, delimiter=';', quotechar='"', quoting=csv.QUOTE_MINIMAL)
+        csv_writer.writerow(header)
+        for result in results:
+            csv_writer.writerow([result[column] for column in header])
+    return results
+
+
+def _run_job(job):
+    condition, name, seed, run_folder, human_brain, max_nr_ticks = job
+    run_headless(condition, name, run_folder, human_brain=human_brain, max_nr_ticks=max_nr_ticks, seed=seed)
+    output_file = glob.glob(os.path.join(run_folder, 'logs', '*', 'world_1', 'output.csv'))[0]
+    with open(output_file) as csv_file:
+        rows = list(csv.DictReader(csv_file, delimiter=';', quotechar='"'))
+    return {'condition': condition, 'name': name, 'seed': seed, **rows[-1]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the official task headless for many conditions, human names and seeds in parallel.")
+    parser.add_argument('--conditions', nargs='+', choices=['normal', 'strong', 'weak'], default=['normal', 'strong', 'weak'])
+    parser.add_argument('--names', nargs='+', default=['ALWAYS_TRUST', 'NEVER_TRUST', 'RANDOM_TRUST'], help="names or ids of the human agent")
+    parser.add_argument('--seeds', type=int, default=1, help="number of random seeds per condition and name, starting at 1")
+    parser.add_argument('--processes', type=int, default=None, help="number of worker processes, all cores by default")
+    parser.add_argument('--max-ticks', type=int, default=MAX_NR_TICKS, help="stop a run after this number of ticks")
+    parser.add_argument('--competence', type=float, default=1.0, help="competence of the simulated human, between 0 and 1")
+    parser.add_argument('--willingness', type=float, default=1.0, help="willingness of the simulated human, between 0 and 1")
+    args = parser.parse_args()
+    human_brain = functools.partial(SimulatedHumanBrain, competence=args.competence, willingness=args.willingness)
+    results = sweep(args.conditions, args.names, range(1, args.seeds + 1), os.getcwd(), processes=args.processes, human_brain=human_brain,
+                    max_nr_ticks=args.max_ticks)
+    print("condition;name;seed;completeness;score;no_ticks")
+    for result in results:
+        print(f"{result['condition']};{result['name']};{result['seed']};{result['completeness']};{result['score']};{result['no_ticks']}")
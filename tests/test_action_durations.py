@@ -0,0 +1,69 @@
+import unittest
+
+from matrx.actions import RemoveObject
+from actions1.CustomActions import CarryObject, RemoveObjectTogether
+from agents1.ActionDurations import ActionDurations, ROBOT, HUMAN, LAND, WATER
+from agents1.WaterMap import WaterMap
+
+SLOWDOWN = 8
+
+
+class ActionDurationsTest(unittest.TestCase):
+    '''
+    The table gives the durations the brains used to set with their own checks, and plan_ticks adds them up along a
+    plan, with the water of the world.
+    '''
+    def setUp(self):
+        self._durations = ActionDurations()
+        # Water at (1, 0) and on the doormat (3, 5), in which an agent is not slowed down
+        self._water_map = WaterMap((25, 24), [(1, 0), (3, 5)])
+
+    def test_duration(self):
+        cases = [(RemoveObject.__name__, 'stone_at_3_5', ROBOT, LAND, 200),
+                 (RemoveObject.__name__, 'tree_at_9_5', ROBOT, WATER, 100),
+                 (RemoveObject.__name__, 'rock_at_15_5', ROBOT, LAND, None),
+                 (CarryObject.__name__, 'mildly injured boy in area 1', ROBOT, LAND, 150),
+                 (CarryObject.__name__, 'critically injured girl in area 2', ROBOT, WATER, 13),
+                 (None, None, ROBOT, WATER, 13),
+                 (None, None, ROBOT, LAND, None),
+                 (RemoveObject.__name__, 'stone_at_3_5', HUMAN, None, 200),
+                 (RemoveObject.__name__, 'tree_at_9_5', HUMAN, None, None),
+                 (RemoveObjectTogether.__name__, 'stone_at_3_5', HUMAN, None, 25),
+                 (RemoveObjectTogether.__name__, 'rock_at_15_5', HUMAN, None, 50),
+                 (None, None, HUMAN, WATER, None)]
+        for action, object_id, actor, terrain, ticks in cases:
+            with self.subTest(action=action, object_id=object_id, actor=actor, terrain=terrain):
+                self.assertEqual(self._durations.duration(action, object_id, actor, terrain), ticks)
+                # The resolved key gives the same duration again
+                self.assertEqual(self._durations.duration(action, object_id, actor, terrain, SLOWDOWN),
+                                 SLOWDOWN if ticks is None else ticks)
+
+    def test_plan_ticks(self):
+        plan = [('MoveEast', None, (0, 0)),
+                ('MoveEast', None, (1, 0)),
+                (RemoveObject.__name__, 'tree_at_2_0', (2, 0)),
+                (CarryObject.__name__, 'mildly injured boy in area 1', (3, 5)),
+                ('MoveSouth', None, (3, 5))]
+        self.assertEqual(self._durations.plan_ticks(plan, ROBOT, self._water_map, SLOWDOWN),
+                         SLOWDOWN + 13 + 100 + 150 + SLOWDOWN)
+        # Without a water map every location is land
+        self.assertEqual(self._durations.plan_ticks(plan, ROBOT, default=SLOWDOWN),
+                         SLOWDOWN + SLOWDOWN + 100 + 150 + SLOWDOWN)
+        self.assertEqual(self._durations.plan_ticks([(RemoveObjectTogether.__name__, 'rock_at_1_0', (1, 0)),
+                                                     ('MoveEast', None, (1, 0))], HUMAN, self._water_map),
+                         50 + 1)
+        self.assertEqual(self._durations.plan_ticks([]), 0)
+
+    def test_rows(self):
+        durations = ActionDurations([(None, None, ROBOT, None, 3), (RemoveObject.__name__, 'rock', ROBOT, None, 4),
+                                     (RemoveObject.__name__, None, ROBOT, WATER, 5)])
+        # The row for the kind of object beats the row for the terrain, which beats the row for all actions
+        self.assertEqual(durations.duration(RemoveObject.__name__, 'rock_at_1_0', ROBOT, WATER), 4)
+        self.assertEqual(durations.duration(RemoveObject.__name__, 'tree_at_1_0', ROBOT, WATER), 5)
+        self.assertEqual(durations.duration(RemoveObject.__name__, 'tree_at_1_0', ROBOT, LAND), 3)
+        self.assertEqual(durations.duration('MoveEast', None, ROBOT, WATER), 3)
+        self.assertIsNone(durations.duration('MoveEast', None, HUMAN, WATER))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import copy
+import pickle
+import random
+import unittest
+
+from actions1.CustomActions import CarriedObjects
+
+
+class Victim:
+    '''
+    The only part of a carried object that CarriedObjects reads is its id.
+    '''
+    def __init__(self, obj_id):
+        self.obj_id = obj_id
+
+    def __eq__(self, other):
+        return isinstance(other, Victim) and self.obj_id == other.obj_id
+
+    def __hash__(self):
+        return hash(self.obj_id)
+
+    def __repr__(self):
+        return 'Victim(%r)' % self.obj_id
+
+
+class CarriedObjectsTest(unittest.TestCase):
+    '''
+    CarriedObjects must behave as the list it replaces, and find every carried object by its id.
+    '''
+    def assertSameObjects(self, carried, objects):
+        self.assertIsInstance(carried, CarriedObjects)
+        self.assertEqual(list(carried), objects)
+        for obj in objects:
+            self.assertEqual(carried.get(obj.obj_id), obj)
+        self.assertIsNone(carried.get('not carried'))
+
+    def test_list_operations(self):
+        victims = [Victim('victim %d' % i) for i in range(6)]
+        for seed in range(20):
+            rng = random.Random(seed)
+            carried, objects = CarriedObjects(victims[:2]), victims[:2]
+            for step in range(50):
+                with self.subTest(seed=seed, step=step):
+                    operation = rng.choice(['append', 'insert', 'extend', 'iadd', 'remove', 'pop', 'setitem',
+                                            'delitem', 'clear'])
+                    missing = [victim for victim in victims if victim not in objects]
+                    if operation in ['append', 'insert', 'extend', 'iadd'] and not missing:
+                        continue
+                    if operation in ['remove', 'pop', 'setitem', 'delitem'] and not objects:
+                        continue
+                    if operation == 'append':
+                        carried.append(missing[0])
+                        objects.append(missing[0])
+                    elif operation == 'insert':
+                        index = rng.randrange(len(objects) + 1)
+                        carried.insert(index, missing[0])
+                        objects.insert(index, missing[0])
+                    elif operation == 'extend':
+                        carried.extend(missing[:2])
+                        objects.extend(missing[:2])
+                    elif operation == 'iadd':
+                        carried += missing[:2]
+                        objects += missing[:2]
+                    elif operation == 'remove':
+                        victim = rng.choice(objects)
+                        carried.remove(victim)
+                        objects.remove(victim)
+                    elif operation == 'pop':
+                        index = rng.randrange(len(objects))
+                        self.assertEqual(carried.pop(index), objects.pop(index))
+                    elif operation == 'setitem':
+                        index = rng.randrange(len(objects))
+                        replacement = missing[0] if missing else objects[index]
+                        carried[index] = replacement
+                        objects[index] = replacement
+                    elif operation == 'delitem':
+                        index = rng.randrange(len(objects))
+                        del carried[index]
+                        del objects[index]
+                    else:
+                        carried.clear()
+                        objects.clear()
+                    self.assertSameObjects(carried, objects)
+
+    def test_copy_and_pickle(self):
+        objects = [Victim('mildly injured boy'), Victim('critically injured girl')]
+        carried = CarriedObjects(objects)
+        copies = [copy.copy(carried), copy.deepcopy(carried)]
+        copies += [pickle.loads(pickle.dumps(carried, protocol)) for protocol in range(pickle.HIGHEST_PROTOCOL + 1)]
+        for i, carried_copy in enumerate(copies):
+            with self.subTest(copy=i):
+                self.assertSameObjects(carried_copy, objects)
+                # The copy keeps its own objects by id
+                carried_copy.append(Victim('healthy man'))
+                self.assertIsNone(carried.get('healthy man'))
+                self.assertSameObjects(carried, objects)
+
+
+if __name__ == '__main__':
+    unittest.main()
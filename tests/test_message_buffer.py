@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from matrx.messages.message import Message
+
+from agents1.MessageBuffer import MessageBuffer
+from brains1.ArtificialBrain import ArtificialAgentBrain
+
+MAXLEN = 8
+
+
+class MessageBufferTest(unittest.TestCase):
+    '''
+    MessageBuffer must answer as the list of received messages it replaces, for the messages it still keeps.
+    '''
+    def test_list_equivalence(self):
+        for seed in range(10):
+            rng = random.Random(seed)
+            buffer, messages = MessageBuffer(maxlen=MAXLEN), []
+            for step in range(300):
+                if rng.random() < 0.05:
+                    buffer.clear()
+                    messages = []
+                else:
+                    message = Message(content='Search: area %d' % rng.randrange(15), from_id='tester')
+                    buffer.append(message)
+                    messages.append(message)
+                kept = messages[-MAXLEN:]
+                with self.subTest(seed=seed, step=step):
+                    self.assertEqual(len(buffer), len(messages))
+                    self.assertEqual(list(buffer), kept)
+                    self.assertEqual(buffer.contents(), [message.content for message in kept])
+                    self.assertEqual(buffer.last_content(), messages[-1].content if messages else None)
+                    # Indexes count the messages since the last clear, also those that are no longer kept
+                    for index in range(-len(kept), 0):
+                        self.assertIs(buffer[index], kept[index])
+                        self.assertIs(buffer[len(messages) + index], kept[index])
+                    self.assertEqual(buffer[-3:], kept[-3:])
+                    self.assertEqual(buffer[:], kept)
+                    with self.assertRaises(IndexError):
+                        buffer[len(messages)]
+                    if len(messages) > len(kept):
+                        with self.assertRaises(IndexError):
+                            buffer[0]
+                    cursor = rng.randrange(len(messages) + 1)
+                    self.assertEqual([message for _, message in buffer.since(cursor)],
+                                     messages[max(cursor, len(messages) - MAXLEN):])
+
+    def test_received_messages_content(self):
+        brain = ArtificialAgentBrain()
+        for content in ['Search: area 1', 'Found: mildly injured boy in 2', 'Search: area 1']:
+            brain.received_messages.append(Message(content=content, from_id='tester'))
+        self.assertEqual(brain.received_messages_content,
+                         ['Search: area 1', 'Found: mildly injured boy in 2', 'Search: area 1'])
+        self.assertEqual(brain.received_messages[-1].content, 'Search: area 1')
+        with self.assertRaises(AttributeError):
+            brain.received_messages_content = []
+        brain.received_messages.clear()
+        self.assertEqual(brain.received_messages_content, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
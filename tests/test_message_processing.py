@@ -0,0 +1,205 @@
+import os
+import json
+import random
+import shutil
+import tempfile
+import unittest
+
+from matrx.messages.message import Message
+
+from agents1.OfficialAgent import BaselineAgent, Phase
+from test_trust_engine import random_stream
+
+# Streams of the calls of _trustBelief recorded in runs of the official task, see test_trust_engine.py
+STREAMS = os.path.join(os.path.dirname(__file__), 'data', 'trust_streams.json')
+NAME = 'tester'
+# Trust beliefs of the human that make _get_condition return every condition
+CONDITIONS = {condition: {task: {'competence': competence, 'willingness': 0.5} for task in ['search', 'rescue']}
+              for condition, competence in [('strong', 0.5), ('normal', 0.0), ('weak', -0.5)]}
+# The memory of the agent that the received messages change
+MEMORY = ['_found_victims', '_found_victims_logs', '_collected_victims', '_searched_rooms', '_explored_rooms',
+          '_known_victims', '_known_victim_logs', '_rescue', '_human_loc', '_moving', '_remove', '_phase']
+
+
+class StubMap:
+    '''
+    The doors and doormats of the areas, the only part of the map the processing of messages reads.
+    '''
+    def door(self, area):
+        return {'room_name': area, 'location': (0, 0)}
+
+    def doormat(self, area):
+        return (0, 0)
+
+
+class FullRebuildAgent(BaselineAgent):
+    '''
+    BaselineAgent that processes messages as it did before it read them from a cursor: every tick all received
+    messages are processed again, until they are cleared.
+    '''
+    def _receive_messages(self, teamMembers):
+        for i, mssg in self.received_messages.since(0):
+            for member in teamMembers:
+                if mssg.from_id == member and (mssg.content, i) not in self._received_messages:
+                    self._received_messages[(mssg.content, i)] = self._tick
+        return []
+
+    def _process_messages(self, state, events, condition):
+        receivedMessages = {}
+        # Create a dictionary with a list of received messages from each team member
+        for member in self._team_members:
+            receivedMessages[member] = []
+        for i, mssg in self.received_messages.since(0):
+            for member in self._team_members:
+                if mssg.from_id == member:
+                    receivedMessages[member].append((mssg.content, i))
+        # Check the content of the received messages
+        for mssgs in receivedMessages.values():
+            for msg, i in mssgs:
+                if msg.startswith("Search:"):
+                    area = 'area ' + msg.split()[-1]
+                    if area not in self._explored_rooms:
+                        self._explored_rooms.append(area)
+                    if {'type': 'Human', 'tick': self._received_messages[(msg, i)]} not in self._searched_rooms[area]:
+                        self._searched_rooms[area].append({'type': 'Human', 'tick': self._received_messages[(msg, i)]})
+                if msg.startswith("Found:"):
+                    if len(msg.split()) == 6:
+                        foundVic = ' '.join(msg.split()[1:4])
+                    else:
+                        foundVic = ' '.join(msg.split()[1:5])
+                    loc = 'area ' + msg.split()[-1]
+                    if loc not in self._explored_rooms:
+                        self._explored_rooms.append(loc)
+                    if self._received_messages[(msg, i)] not in self._found_victims[foundVic]:
+                        self._found_victims[foundVic].append(self._received_messages[(msg, i)])
+                        self._found_victims_logs[foundVic].append(
+                            {'room': loc, 'tick': self._received_messages[(msg, i)]})
+                    if foundVic not in self._known_victims:
+                        self._known_victims.append(foundVic)
+                        self._known_victim_logs[foundVic] = {'room': loc}
+                    if foundVic in self._known_victims and self._known_victim_logs[foundVic]['room'] != loc:
+                        self._known_victim_logs[foundVic] = {'room': loc}
+                    if self._get_condition() == 'weak':
+                        self._rescue = 'together'
+                    if 'mild' in foundVic and self._get_condition() != 'weak':
+                        self._todo.append(foundVic)
+                if msg.startswith('Collect:'):
+                    if len(msg.split()) == 6:
+                        collectVic = ' '.join(msg.split()[1:4])
+                    else:
+                        collectVic = ' '.join(msg.split()[1:5])
+                    loc = 'area ' + msg.split()[-1]
+                    if loc not in self._explored_rooms:
+                        self._explored_rooms.append(loc)
+                    if collectVic not in self._known_victims:
+                        self._known_victims.append(collectVic)
+                        self._known_victim_logs[collectVic] = {'room': loc}
+                    if collectVic in self._known_victims and self._known_victim_logs[collectVic]['room'] != loc:
+                        self._known_victim_logs[collectVic] = {'room': loc}
+                    if self._get_condition() != 'weak' and collectVic not in self._collected_victims:
+                        self._collected_victims.append(collectVic)
+                    if self._get_condition() == 'weak' or self._get_condition() == 'normal' and self._human_loc == 'close':
+                        self._rescue = 'together'
+                if msg.startswith('Remove:'):
+                    if not self._carrying:
+                        area = 'area ' + msg.split()[-1]
+                        self._door = self._map.door(area)
+                        self._doormat = self._map.doormat(area)
+                        if area in self._explored_rooms:
+                            self._explored_rooms.remove(area)
+                        self.received_messages.clear()
+                        self._moving = True
+                        self._remove = True
+                        if self._waiting and self._recent_vic:
+                            self._todo.append(self._recent_vic)
+                        self._waiting = False
+                        self._send_message(
+                            'Moving to ' + str(self._door['room_name']) + ' to help you remove an obstacle.',
+                            'RescueBot')
+                        self._phase = Phase.PLAN_PATH_TO_ROOM
+                    else:
+                        area = 'area ' + msg.split()[-1]
+                        self._send_message('Will come to ' + area + ' after dropping ' + self._goal_vic + '.',
+                                           'RescueBot')
+            # Store the current location of the human in memory
+            if mssgs and mssgs[-1][0].split()[-1] in [str(nr) for nr in range(1, 15)]:
+                self._human_loc = int(mssgs[-1][0].split()[-1])
+
+
+class MessageProcessingTest(unittest.TestCase):
+    '''
+    Processing only the new messages from a cursor must change the memory of BaselineAgent in the same way as
+    processing all received messages again at every tick.
+    '''
+    def setUp(self):
+        self._folder = tempfile.mkdtemp()
+        with open(STREAMS) as streams_file:
+            self._streams = json.load(streams_file)
+
+    def tearDown(self):
+        shutil.rmtree(self._folder)
+
+    def test_recorded_streams(self):
+        for name, calls in self._streams.items():
+            for condition in CONDITIONS:
+                with self.subTest(stream=name, condition=condition):
+                    self._check_stream(calls, lambda k: condition, carrying=lambda k: False, clear=lambda k: False)
+
+    def test_carrying_and_clears(self):
+        streams = list(self._streams.items()) + [('seed %d' % seed, random_stream(random.Random(seed)))
+                                                 for seed in range(10)]
+        conditions = list(CONDITIONS)
+        for name, calls in streams:
+            for period in [3, 7, 10]:
+                with self.subTest(stream=name, period=period):
+                    # The condition changes, the agent picks up and drops victims and the received messages are
+                    # cleared at different times, so requests to remove obstacles wait and are cleared in between
+                    self._check_stream(calls, lambda k: conditions[k // (3 * period) % 3],
+                                       carrying=lambda k: k // period % 2 == 1,
+                                       clear=lambda k: k % (2 * period + 3) == 2 * period + 2)
+
+    def _check_stream(self, calls, condition, carrying, clear):
+        '''
+        Let both agents receive the messages of every call and compare their memory after every call.
+        @param condition function of the number of the call that gives the condition of the human
+        @param carrying function of the number of the call that tells whether the agent carries a victim
+        @param clear function of the number of the call that tells whether the received messages are cleared first
+        '''
+        agents = [BaselineAgent(slowdown=8, condition='normal', name=NAME, folder=self._folder),
+                  FullRebuildAgent(slowdown=8, condition='normal', name=NAME, folder=self._folder)]
+        for agent in agents:
+            agent._team_members = [NAME]
+            agent._map = StubMap()
+            agent._goal_vic = 'mildly injured boy'
+        for k, call in enumerate(calls):
+            for agent in agents:
+                agent._tick = call['tick']
+                agent._state = {'World': {'nr_ticks': k}}
+                agent._trust_belief[NAME] = CONDITIONS[condition(k)]
+                agent._carrying = carrying(k)
+                if clear(k):
+                    agent.received_messages.clear()
+                for content, tick in call.get('messages', []):
+                    agent.received_messages.append(Message(content=content, from_id=NAME))
+                # The same steps as BaselineAgent.decide_on_actions
+                events = agent._receive_messages(agent._team_members)
+                agent._process_messages(None, events, agent._condition)
+                # The areas the agent searched itself
+                for area, search_type, tick in call.get('searched', []):
+                    if search_type == 'Robot':
+                        agent._searched_rooms[area].append({'type': search_type, 'tick': tick})
+
+            for attribute in MEMORY:
+                self.assertEqual(getattr(agents[0], attribute), getattr(agents[1], attribute),
+                                 msg='%s at tick %s' % (attribute, call['tick']))
+            # The full rebuild added a found victim to the to do list again at every tick, the agent only tests whether
+            # a victim is in the list
+            self.assertEqual(list(dict.fromkeys(agents[0]._todo)), list(dict.fromkeys(agents[1]._todo)),
+                             msg='_todo at tick %s' % call['tick'])
+            self.assertEqual([message.content for message in agents[0].messages_to_send],
+                             [message.content for message in agents[1].messages_to_send],
+                             msg='sent messages at tick %s' % call['tick'])
+
+
+if __name__ == '__main__':
+    unittest.main()
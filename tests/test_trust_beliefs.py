@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from agents1.TrustBeliefs import TrustBeliefWriter
+
+ROWS = [['name', 'task', 'competence', 'willingness'], ['tester', 'search', 0.5, 0.5]]
+
+
+class TrustBeliefWriterTest(unittest.TestCase):
+    '''
+    The writer replaces the belief file atomically, without changing its mode, and stops its thread when closed.
+    '''
+    def setUp(self):
+        self._folder = tempfile.mkdtemp()
+        self._path = os.path.join(self._folder, 'currentTrustBelief.csv')
+
+    def tearDown(self):
+        shutil.rmtree(self._folder)
+
+    def test_flush_keeps_mode(self):
+        for mode in [0o644, 0o640]:
+            with self.subTest(mode=oct(mode)):
+                with open(self._path, mode='w') as csv_file:
+                    csv_file.write('name;task;competence;willingness\n')
+                os.chmod(self._path, mode)
+                writer = TrustBeliefWriter(self._path, interval=60)
+                writer.mark_dirty(ROWS)
+                writer.close()
+                self.assertEqual(os.stat(self._path).st_mode & 0o7777, mode)
+                with open(self._path) as csv_file:
+                    self.assertEqual(csv_file.read().splitlines(), [';'.join(map(str, row)) for row in ROWS])
+
+    def test_flush_new_file_mode(self):
+        umask = os.umask(0)
+        os.umask(umask)
+        writer = TrustBeliefWriter(self._path, interval=60)
+        writer.mark_dirty(ROWS)
+        writer.close()
+        self.assertEqual(os.stat(self._path).st_mode & 0o7777, 0o666 & ~umask)
+        self.assertEqual(os.listdir(self._folder), ['currentTrustBelief.csv'])
+
+    def test_close_all(self):
+        writers = [TrustBeliefWriter(os.path.join(self._folder, f'beliefs_{i}.csv'), interval=60) for i in range(3)]
+        for writer in writers:
+            writer.mark_dirty(ROWS)
+        TrustBeliefWriter.close_all()
+        for i, writer in enumerate(writers):
+            self.assertFalse(writer._thread.is_alive())
+            self.assertTrue(os.path.exists(os.path.join(self._folder, f'beliefs_{i}.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,213 @@
+import os
+import json
+import random
+import shutil
+import tempfile
+import unittest
+from collections import defaultdict
+
+from matrx.messages.message import Message
+
+from agents1.AgentUtils import compute_collected_adjustments
+from agents1.OfficialAgent import BaselineAgent
+from agents1.TrustBeliefs import TrustBeliefWriter
+
+# Streams of the calls of _trustBelief recorded in runs of the official task, with the messages, searched
+# areas and found victims that were new at every call and the loaded beliefs whenever they changed
+STREAMS = os.path.join(os.path.dirname(__file__), 'data', 'trust_streams.json')
+NAME = 'tester'
+VICTIMS = ['mildly injured boy', 'critically injured girl', 'mildly injured elderly man', 'critically injured dog']
+# The task information of the replay, keyed by the first word of a message
+TASK_INFORMATION = {
+    "Search:": {"expected_time_to_complete": 1, "task": "search"},
+    "Find:": {"expected_time_to_complete": 1, "task": "rescue"},
+    "Remove:": {"expected_time_to_complete": 10, "task": "search"},
+    "Collect:": {"expected_time_to_complete": 10, "task": "rescue"},
+}
+
+
+def replay(agent, base, received_messages):
+    '''
+    The trust rules as _trustBelief applied them before it became incremental: all received messages are applied again
+    on top of the loaded beliefs at every call.
+    @param received_messages list of the content and tick of all received messages
+    @return the beliefs of the human after applying the messages
+    '''
+    trust_beliefs = defaultdict(dict)
+    trust_beliefs[NAME] = {task: dict(belief) for task, belief in base.items()}
+    change = lambda competence, willingness, task: agent._change_belief(competence, willingness, task, trust_beliefs)
+    previous_message, previous_message_tick = None, 0
+    for message, message_tick in received_messages:
+        if 'Collect' in message:
+            message_tokens = message.split(" in ")
+            victim_location = "area " + message_tokens[1]
+            victim_name = message_tokens[0].replace("Collect: ", "")
+            if not agent._found_victims[victim_name] or agent._found_victims[victim_name][0] >= message_tick:
+                change(*compute_collected_adjustments(victim_name, -0.1), 'rescue')
+            elif agent._found_victims[victim_name][0] < message_tick:
+                found_location = None
+                for log in agent._found_victims_logs[victim_name]:
+                    if log['tick'] < message_tick:
+                        found_location = log['room']
+                if found_location != victim_location:
+                    change(*compute_collected_adjustments(victim_name, -0.05), 'rescue')
+                else:
+                    change(*compute_collected_adjustments(victim_name, 0.1), 'rescue')
+            if victim_location in agent._searched_rooms and agent._searched_rooms[victim_location] \
+                    and agent._searched_rooms[victim_location][0]['tick'] >= message_tick:
+                change(-0.12, -0.12, 'search')
+                change(-0.12, -0.12, 'rescue')
+
+        elif 'Search' in message:
+            search_location = "area " + message.split(" ")[1]
+            if search_location not in agent._searched_rooms \
+                    or agent._searched_rooms[search_location][0]['tick'] >= message_tick:
+                change(0.05, 0.08, 'search')
+            else:
+                search_type = None
+                for event in agent._searched_rooms[search_location]:
+                    if event['tick'] == message_tick:
+                        search_type = event['type']
+                        break
+                change(*((-0.1, -0.1) if search_type == 'Human' else (-0.15, -0.15)), 'search')
+
+        elif 'Found' in message:
+            message_tokens = message.split(" in ")
+            location = "area " + message_tokens[-1]
+            victim_name = message_tokens[0].replace("Found: ", "")
+            if victim_name not in agent._found_victims or message_tick <= agent._found_victims[victim_name][0]:
+                change(0.0, 0.05, 'rescue')
+            else:
+                reported_at_different_location = False
+                for found_log in agent._found_victims_logs[victim_name]:
+                    if found_log['tick'] >= message_tick:
+                        break
+                    if found_log['room'] != location:
+                        reported_at_different_location = True
+                        break
+                change(*((-0.12, -0.12) if reported_at_different_location else (-0.05, -0.05)), 'rescue')
+            if not agent._searched_rooms[location] or agent._searched_rooms[location][0]['tick'] >= message_tick:
+                change(-0.12, -0.12, 'search')
+                change(-0.12, -0.12, 'rescue')
+
+        elif 'Remove' in message:
+            if message == "Remove together":
+                change(0.05, 0.15, 'search')
+            elif message == "Remove":
+                change(0.0, 0.05, 'search')
+            elif message != "Remove alone":
+                location = "area" + message.replace("Remove: at", "")
+                change(0.0, 0.1, 'search')
+                if not agent._searched_rooms[location] or agent._searched_rooms[location][0]['tick'] >= message_tick:
+                    change(-0.12, -0.12, 'search')
+
+        if 'Rescue' in message:
+            if message == "Rescue together" or message == "Rescue":
+                change(0.12, 0.12, 'rescue')
+
+        elif 'Continue' in message:
+            for task in agent._tasks:
+                change(0.0, -0.1, task)
+
+        if previous_message:
+            previous_message_info = TASK_INFORMATION.get(message.split(" ")[0])
+            if previous_message_info and message_tick - previous_message_tick < \
+                    previous_message_info['expected_time_to_complete']:
+                change(-0.1, -0.2, previous_message_info['task'])
+
+        previous_message = message
+        previous_message_tick = message_tick
+    return trust_beliefs[NAME]
+
+
+def random_stream(rng, nr_calls=150):
+    '''
+    @return a stream of calls in the format of the recorded streams, with random messages of the human and areas
+    searched and victims found at the same time the agent would register them
+    '''
+    calls = [{'tick': 0, 'base': {'search': [0.5, 0.5], 'rescue': [0.5, 0.5]}}]
+    for tick in range(1, nr_calls):
+        call = {'tick': tick, 'messages': [], 'searched': [], 'found': []}
+        if rng.random() < 0.3:
+            area = rng.randint(1, 14)
+            message = rng.choice(['Search: %d' % area, 'Found: %s in %d' % (rng.choice(VICTIMS), area),
+                                  'Collect: %s in %d' % (rng.choice(VICTIMS), area), 'Remove: at %d' % area,
+                                  'Rescue', 'Rescue together', 'Rescue alone', 'Continue', 'Remove', 'Remove together',
+                                  'Remove alone'])
+            call['messages'].append([message, tick])
+            # The agent registers the areas and victims the human reports before it updates its trust
+            if message.startswith('Search'):
+                call['searched'].append(['area %d' % area, 'Human', tick])
+            if message.startswith(('Found', 'Collect')):
+                call['found'].append([message.split(': ')[1].split(' in ')[0], 'area %d' % area, tick])
+        if rng.random() < 0.05:
+            call['searched'].append(['area %d' % rng.randint(1, 14), 'Robot', tick])
+        # Searching all areas again makes the agent load other beliefs
+        if tick == nr_calls // 2:
+            call['base'] = {'search': [rng.uniform(-1, 1), rng.uniform(-1, 1)],
+                            'rescue': [rng.uniform(-1, 1), rng.uniform(-1, 1)]}
+        calls.append(call)
+    return calls
+
+
+class TrustEngineTest(unittest.TestCase):
+    '''
+    The incremental trust engine of BaselineAgent must give the same beliefs as the replay of all messages it replaced.
+    '''
+    def setUp(self):
+        self._folder = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self._folder, 'beliefs'))
+
+    def tearDown(self):
+        shutil.rmtree(self._folder)
+
+    def test_recorded_streams(self):
+        with open(STREAMS) as streams_file:
+            streams = json.load(streams_file)
+        for name, calls in streams.items():
+            with self.subTest(stream=name):
+                self._check_stream(calls)
+
+    def test_random_streams(self):
+        for seed in range(20):
+            with self.subTest(seed=seed):
+                self._check_stream(random_stream(random.Random(seed)))
+
+    def _check_stream(self, calls):
+        agent = BaselineAgent(slowdown=8, condition='normal', name=NAME, folder=self._folder)
+        agent._belief_writer = TrustBeliefWriter(os.path.join(self._folder, 'beliefs', 'currentTrustBelief.csv'))
+        received_messages = []
+        message_ticks = []
+        base = None
+        try:
+            for call in calls:
+                # The human sends the messages of the call, the agent receives them at the tick of the call
+                agent._tick = call['tick']
+                for content, tick in call.get('messages', []):
+                    agent.received_messages.append(Message(content=content, from_id=NAME))
+                    received_messages.append((content, tick))
+                    message_ticks.append(tick)
+                agent._receive_messages([NAME])
+                # The areas searched and victims found that the agent registered at the tick of the call
+                for area, search_type, tick in call.get('searched', []):
+                    agent._searched_rooms[area].append({'type': search_type, 'tick': tick})
+                for victim, room, tick in call.get('found', []):
+                    agent._found_victims[victim].append(tick)
+                    agent._found_victims_logs[victim].append({'room': room, 'tick': tick})
+                if 'base' in call:
+                    base = {task: {'competence': competence, 'willingness': willingness}
+                            for task, (competence, willingness) in call['base'].items()}
+                trust_beliefs = defaultdict(dict)
+                trust_beliefs[NAME] = {task: dict(belief) for task, belief in base.items()}
+                agent._trustBelief([NAME], trust_beliefs, self._folder, message_ticks)
+
+                expected = replay(agent, base, received_messages)
+                for task in agent._tasks:
+                    for key in ['competence', 'willingness']:
+                        self.assertAlmostEqual(agent._message_trust_belief[task][key], expected[task][key], places=9,
+                                               msg='%s %s at tick %s' % (task, key, call['tick']))
+        finally:
+            agent._belief_writer.close()
+
+if __name__ == '__main__':
+    unittest.main()
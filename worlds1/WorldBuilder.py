@@ -19,6 +19,9 @@ from agents1.TutorialAgent import TutorialAgent
 from actions1.CustomActions import RemoveObjectTogether
 from brains1.HumanBrain import HumanBrain
 from loggers.ActionLogger import ActionLogger
+from loggers.TickMetrics import TickMetricsLogger, tick_metrics
+from agents1.DropOffTable import DropOffTable
+from agents1.WaterMap import WaterMap
 from datetime import datetime
 
 random_seed = 1
@@ -26,6 +29,8 @@ verbose = False
 # Tick duration determines the speed of the world. A tick duration of 0.1 means 10 ticks are executed in a second. 
 # You can speed up or slow down the world by changing this value without changing behavior. Leave this value at 0.1 during evaluations.
 tick_duration = 0.1
+# RescueBot sends an identical message at most once every 5 seconds, given in ticks so it follows the tick duration
+message_ttl = round(5 / tick_duration)
 # Define the keyboarc controls for the human agent
 key_action_map = {
         'ArrowUp': MoveNorth.__name__,
@@ -52,6 +57,26 @@ agent_sense_range = 2  # the range with which agents detect other agents. Do not
 object_sense_range = 1  # the range with which agents detect blocks. Do not change this value.
 other_sense_range = np.inf  # the range with which agents detect other objects (walls, doors, etc.). Do not change this value.
 fov_occlusion = True
+# The GhostBlocks on the drop zone of each task type: their location and the victim that has to be dropped there
+drop_off_blocks = {
+    "tutorial": [((17,7), "critically injured girl"), ((17,8), "critically injured elderly woman"), ((17,9), "mildly injured boy"),
+                 ((17,10), "mildly injured elderly man")],
+    "official": [((23,8), "critically injured girl"), ((23,9), "critically injured elderly woman"), ((23,10), "critically injured man"),
+                 ((23,11), "critically injured dog"), ((23,12), "mildly injured boy"), ((23,13), "mildly injured elderly man"),
+                 ((23,14), "mildly injured woman"), ((23,15), "mildly injured cat")],
+}
+
+# The water of the official world, by the image of its tiles. Actions of the agents are slower in water
+water_tiles = {
+    "/images/pool20.svg": [(6,1),(6,2),(6,3),(6,4),(6,5),(6,12),(6,13),(6,14),(6,15),(6,16),(6,17),(11,12),(11,11),(18,12),(18,21),
+                           (3,12),(3,11),(12,6),(12,7),(12,8),(12,9),(12,10),(12,11),(18,11),(18,10),(18,9),(19,9),(19,8),(18,22),
+                           (18,13),(18,14),(18,15),(18,16),(18,17),(9,17),(9,18),(20,17),(20,18),(12,1),(12,2),(6,22),(18,20),
+                           (19,7),(19,6),(19,5),(10,6),(10,5),(14,17),(14,18),(12,19),(12,20),(12,21),(12,18),(12,22)],
+    "/images/lake2.svg": [(1,11),(2,11),(3,11),(3,12),(4,12),(5,12),(6,12),(7,12),(8,12),(9,12),(10,12),(11,12),(12,11),(13,11),(20,17),
+                          (14,11),(15,11),(16,11),(17,11),(18,11),(6,17),(7,17),(8,17),(9,17),(9,18),(5,17),(4,17),(3,17),(2,17),(1,17),
+                          (18,9),(19,9),(19,5),(20,5),(21,5),(22,5),(23,5),(11,6),(12,6),(10,6),(10,5),(9,5),(8,5),(7,5),(6,5),(19,17),
+                          (11,11),(18,17),(17,17),(16,17),(15,17),(14,17),(14,18),(13,18),(12,18),(10,18),(11,18)],
+}
 
 # Add the drop zones to the world
 def add_drop_off_zones(builder, task_type):
@@ -65,7 +90,7 @@ def add_drop_off_zones(builder, task_type):
             builder.add_area((17,7), width=1, height=4, name=f"Drop off {nr_zone}",visualize_opacity=0.5, visualize_colour=drop_off_color, drop_zone_nr=nr_zone, is_drop_zone=True, is_goal_block=False, is_collectable=False) 
 
 # Add the agents to the world
-def add_agents(builder, condition, task_type, name, folder):
+def add_agents(builder, condition, task_type, name, folder, human_brain=HumanBrain, profile_path=None, drop_off=None, water_map=None):
     # Define the agent's sense capabilites
     sense_capability_agent = SenseCapability({AgentBody: agent_sense_range, CollectableBlock: object_sense_range, None: other_sense_range, ObstacleObject: 1})
     # Define the human's sense capabilities based on the selected condition
@@ -80,7 +105,7 @@ def add_agents(builder, condition, task_type, name, folder):
         nr_agents = agents_per_team - human_agents_per_team
         for agent_nr in range(nr_agents):
             if task_type=="official":
-                brain = BaselineAgent(slowdown=8, condition=condition, name=name, folder=folder) # Slowdown makes the agent a bit slower, do not change value during evaluations
+                brain = BaselineAgent(slowdown=8, condition=condition, name=name, folder=folder, profile_path=profile_path, drop_off=drop_off, water_map=water_map, message_ttl=message_ttl) # Slowdown makes the agent a bit slower, do not change value during evaluations
                 loc = (22,11)
             if task_type=="tutorial":
                 brain = TutorialAgent(slowdown=8, condition=condition, name=name, folder=folder)
@@ -90,9 +115,9 @@ def add_agents(builder, condition, task_type, name, folder):
         # Add human agents based on condition, do not change human brain values
         for human_agent_nr in range(human_agents_per_team):
             if condition=='strong':
-                brain = HumanBrain(max_carry_objects=np.inf, grab_range=1, drop_range=0, remove_range=1, fov_occlusion=fov_occlusion, strength=condition, name=name)
+                brain = human_brain(max_carry_objects=np.inf, grab_range=1, drop_range=0, remove_range=1, fov_occlusion=fov_occlusion, strength=condition, name=name, water_map=water_map)
             else:
-                brain = HumanBrain(max_carry_objects=1, grab_range=1, drop_range=0, remove_range=1, fov_occlusion=fov_occlusion, strength=condition, name=name)
+                brain = human_brain(max_carry_objects=1, grab_range=1, drop_range=0, remove_range=1, fov_occlusion=fov_occlusion, strength=condition, name=name, water_map=water_map)
             if task_type=="official":
                 loc = (22,12)
             else:
@@ -100,16 +125,23 @@ def add_agents(builder, condition, task_type, name, folder):
             builder.add_human_agent(loc, brain, team=team_name, name=name, key_action_map=key_action_map, sense_capability=sense_capability_human, is_traversable=True, img_name="/images/rescue-man-final3.svg", visualize_when_busy=True)
 
 # Create the world
-def create_builder(task_type, condition, name, folder):
+# A headless world runs without the MATRX api and as fast as possible, the human agent is then controlled by the given human brain class instead of the keyboard
+# With profile, RescueBot measures the time of its phases and helpers and saves them in 'phase_profile.csv' next to the action log
+def create_builder(task_type, condition, name, folder, headless=False, human_brain=HumanBrain, max_nr_ticks=np.inf, seed=random_seed, profile=False):
     # Set numpy's random generator
-    np.random.seed(random_seed)
+    np.random.seed(seed)
+    # Compute the ranks of the drop zone once, they are shared by the collection goal and RescueBot
+    drop_off = DropOffTable((0, loc, victim) for loc, victim in drop_off_blocks[task_type])
+    # Compute once in which cells the agents are slowed down by water, shared by both brains and the route planning of RescueBot
+    water_map = WaterMap([25,24], itertools.chain(*water_tiles.values())) if task_type=="official" else None
     # Create the collection goal
-    goal = CollectionGoal(max_nr_ticks=np.inf)
+    goal = CollectionGoal(max_nr_ticks=max_nr_ticks, drop_off=drop_off)
+    world_tick_duration = 0 if headless else tick_duration
     # Create the world builder
     if task_type=="official":
-        builder = WorldBuilder(shape=[25,24], tick_duration=tick_duration, run_matrx_api=True, run_matrx_visualizer=False, verbose=verbose, simulation_goal=goal, visualization_bg_clr='#9a9083')
+        builder = WorldBuilder(shape=[25,24], tick_duration=world_tick_duration, run_matrx_api=not headless, random_seed=seed, run_matrx_visualizer=False, verbose=verbose, simulation_goal=goal, visualization_bg_clr='#9a9083')
     else:
-        builder = WorldBuilder(shape=[19,19], tick_duration=tick_duration, run_matrx_api=True,random_seed=random_seed, run_matrx_visualizer=False, verbose=verbose, simulation_goal=goal, visualization_bg_clr='#9a9083')
+        builder = WorldBuilder(shape=[19,19], tick_duration=world_tick_duration, run_matrx_api=not headless,random_seed=seed, run_matrx_visualizer=False, verbose=verbose, simulation_goal=goal, visualization_bg_clr='#9a9083')
 
     # Add all areas and objects to the tutorial world
     if task_type == "tutorial":
@@ -140,10 +172,8 @@ def create_builder(task_type, condition, name, folder):
         builder.add_object((10,8),'healthy elderly man in area 5', callable_class=CollectableBlock, visualize_shape='img',img_name="/images/healthy elderly man.svg")
         builder.add_object((10,15),'healthy dog in area 7', callable_class=CollectableBlock, visualize_shape='img',img_name="/images/healthy dog.svg")
 
-        builder.add_object((17,7),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/critically injured girl.svg",drop_zone_nr=0)
-        builder.add_object((17,8),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/critically injured elderly woman.svg",drop_zone_nr=0)
-        builder.add_object((17,9),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/mildly injured boy.svg",drop_zone_nr=0)
-        builder.add_object((17,10),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/mildly injured elderly man.svg",drop_zone_nr=0)
+        for loc, victim in drop_off_blocks[task_type]:
+            builder.add_object(loc,name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/"+victim+".svg",drop_zone_nr=0)
 
         builder.add_object(location=[3,1], is_traversable=True, is_movable=False, name="area 01 sign", img_name="/images/sign01.svg", visualize_depth=110, visualize_size=0.5)
         builder.add_object(location=[9,1], is_traversable=True, is_movable=False, name="area 02 sign", img_name="/images/sign02.svg", visualize_depth=110, visualize_size=0.55)
@@ -170,8 +200,11 @@ def create_builder(task_type, condition, name, folder):
     # Create folders where the logs are stored during the official condition
     if task_type=="official":
         current_exp_folder = datetime.now().strftime("exp_"+condition+"_at_time_%Hh-%Mm-%Ss_date_%dd-%mm-%Yy")
-        logger_save_folder = os.path.join("logs", current_exp_folder)
+        logger_save_folder = os.path.join(folder, "logs", current_exp_folder)
         builder.add_logger(ActionLogger, log_strategy=1, save_path=logger_save_folder, file_name_prefix="actions_")
+        # Log the time of every stage of every tick, to find the ticks in which the world falls behind real time
+        builder.add_logger(TickMetricsLogger, log_strategy=1, save_path=logger_save_folder, file_name_prefix="ticks_")
+    profile_path = os.path.join(logger_save_folder, "phase_profile.csv") if profile and task_type=="official" else None
         
     # Add all area and objects to the official world
     if task_type == "official":
@@ -206,14 +239,8 @@ def create_builder(task_type, condition, name, folder):
         builder.add_object((21,7),'heli',EnvObject,is_traversable=False,is_movable=False,visualize_shape='img',img_name="/images/helicopter.svg", visualize_size=3) 
         builder.add_object((21,16),'ambulance',EnvObject,is_traversable=False,is_movable=False,visualize_shape='img',img_name="/images/ambulance.svg", visualize_size=2.3) 
     
-        builder.add_object((23,8),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/critically injured girl.svg",drop_zone_nr=0)
-        builder.add_object((23,9),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/critically injured elderly woman.svg",drop_zone_nr=0)
-        builder.add_object((23,10),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/critically injured man.svg",drop_zone_nr=0)
-        builder.add_object((23,11),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/critically injured dog.svg",drop_zone_nr=0)
-        builder.add_object((23,12),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/mildly injured boy.svg",drop_zone_nr=0)
-        builder.add_object((23,13),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/mildly injured elderly man.svg",drop_zone_nr=0)
-        builder.add_object((23,14),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/mildly injured woman.svg",drop_zone_nr=0)
-        builder.add_object((23,15),name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/mildly injured cat.svg",drop_zone_nr=0)
+        for loc, victim in drop_off_blocks[task_type]:
+            builder.add_object(loc,name="Collect Block", callable_class=GhostBlock,visualize_shape='img',img_name="/images/"+victim+".svg",drop_zone_nr=0)
 
         builder.add_object((10,15),'critically injured elderly woman in area 9', callable_class=CollectableBlock, visualize_shape='img',img_name="/images/critically injured elderly woman.svg")
         builder.add_object((8,20),'healthy elderly woman in area 12', callable_class=CollectableBlock, visualize_shape='img',img_name="/images/healthy elderly woman.svg")
@@ -275,17 +302,9 @@ def create_builder(task_type, condition, name, folder):
                     (7,7),(7,8),(7,9),(7,10),(8,10),(9,10),(10,10),(11,10),(11,9),(11,8),(11,7),(10,7),(8,7)]:
             builder.add_object(loc,'roof', EnvObject,is_traversable=True, is_movable=False, visualize_shape='img',img_name="/images/roof-final5.svg")
 
-        for loc in [(6,1),(6,2),(6,3),(6,4),(6,5),(6,12),(6,13),(6,14),(6,15),(6,16),(6,17),(11,12),(11,11),(18,12),(18,21),
-                    (3,12),(3,11),(12,6),(12,7),(12,8),(12,9),(12,10),(12,11),(18,11),(18,10),(18,9),(19,9),(19,8),(18,22),
-                    (18,13),(18,14),(18,15),(18,16),(18,17),(9,17),(9,18),(20,17),(20,18),(12,1),(12,2),(6,22),(18,20),
-                    (19,7),(19,6),(19,5),(10,6),(10,5),(14,17),(14,18),(12,19),(12,20),(12,21),(12,18),(12,22)]:
-            builder.add_object(loc,'water',EnvObject,is_traversable=True, is_movable=False, visualize_shape='img',img_name="/images/pool20.svg")
-
-        for loc in [(1,11),(2,11),(3,11),(3,12),(4,12),(5,12),(6,12),(7,12),(8,12),(9,12),(10,12),(11,12),(12,11),(13,11),(20,17),
-                    (14,11),(15,11),(16,11),(17,11),(18,11),(6,17),(7,17),(8,17),(9,17),(9,18),(5,17),(4,17),(3,17),(2,17),(1,17),
-                    (18,9),(19,9),(19,5),(20,5),(21,5),(22,5),(23,5),(11,6),(12,6),(10,6),(10,5),(9,5),(8,5),(7,5),(6,5),(19,17),
-                    (11,11),(18,17),(17,17),(16,17),(15,17),(14,17),(14,18),(13,18),(12,18),(10,18),(11,18)]:
-            builder.add_object(loc,'water', EnvObject,is_traversable=True, is_movable=False, visualize_shape='img', img_name="/images/lake2.svg")
+        for img_name, locs in water_tiles.items():
+            for loc in locs:
+                builder.add_object(loc,'water',EnvObject,is_traversable=True, is_movable=False, visualize_shape='img',img_name=img_name)
 
         for loc in [(11,5),(13,5),(14,5),(13,6),(14,6),(12,5),(15,5),(15,6),(16,5),(16,6),(17,5),(17,6),(18,5),
                     (8,6),(7,6),(6,6),(5,6),(4,6),(3,6),(2,6),(1,6),(20,9),(21,9),(21,14),(20,14),(19,14),(9,6),
@@ -300,7 +319,7 @@ def create_builder(task_type, condition, name, folder):
             builder.add_object(loc,'street',EnvObject,is_traversable=True,is_movable=False,visualize_shape='img',img_name="/images/paving-final15.svg", visualize_size=1) 
     
     add_drop_off_zones(builder, task_type)
-    add_agents(builder, condition, task_type, name, folder)
+    add_agents(builder, condition, task_type, name, folder, human_brain, profile_path, drop_off, water_map)
 
     return builder
 
@@ -338,19 +357,41 @@ class GhostBlock(EnvObject):
 class CollectionGoal(WorldGoal):
     '''
     The goal for world which determines when the simulator should stop.
+    The drop zones are checked incrementally: the actions that pick up or drop victims report the cells that changed
+    through cell_changed, and only the ranks of those cells are checked again. When nothing changed, the goal, progress
+    and score of the previous check are returned.
     '''
-    def __init__(self, max_nr_ticks):
+    def __init__(self, max_nr_ticks, drop_off=None):
         super().__init__()
         self.max_nr_ticks = max_nr_ticks
+        # The DropOffTable of the world, found from the GhostBlocks of the world when it is not given
+        self.__drop_off_table = drop_off
         self.__drop_off= {}
-        self.__drop_off_zone = {}
         self.__progress = 0
         self.__score = 0
+        self.__is_satisfied = False
+        # The zone number and rank of every drop zone cell, and the ranks whose cells changed since the last check
+        self.__cell_ranks = {}
+        self.__changed_ranks = set()
     
     def score(self, grid_world):
         return self.__score
 
+    def cell_changed(self, location):
+        '''
+        Mark the rank of a drop zone cell to be checked again, called when a victim is picked up from or dropped on it.
+        '''
+        rank = self.__cell_ranks.get(tuple(location))
+        if rank is not None:
+            self.__changed_ranks.add(rank)
+
     def goal_reached(self, grid_world):
+        # The goal is checked at the start of every tick, so the previous tick is finished
+        tick_metrics.start_tick(grid_world)
+        return self._timed_goal_reached(grid_world)
+
+    @tick_metrics.timed('goal')
+    def _timed_goal_reached(self, grid_world):
         if grid_world.current_nr_ticks >= self.max_nr_ticks:
             return True
         return self.isVictimPlaced(grid_world)
@@ -359,101 +400,64 @@ class CollectionGoal(WorldGoal):
         '''
         @return true if all victims have been rescued
         '''
-        # find all drop off locations, its tile ID's and goal victims
-        if self.__drop_off =={}:
-            self.__find_drop_off_locations(grid_world)
-        # Go through each drop zone, and check if the victims are there on the right spot
-        is_satisfied, progress = self.__check_completion(grid_world)
-        # Progress in percentage
-        self.__progress = progress / sum([len(goal_vics) for goal_vics in self.__drop_off.values()])
-
-        return is_satisfied
+        self.__update(grid_world)
+        return self.__is_satisfied
 
     def progress(self, grid_world):
-        # find all drop off locations, its tile ID's and goal blocks
-        if self.__drop_off =={}:  
-            self.__find_drop_off_locations(grid_world)
-        # Go through each drop zone, and check if the victims are there in the right spot
-        is_satisfied, progress = self.__check_completion(grid_world)
-        # Progress in percentage
-        self.__progress = progress / sum([len(goal_vics) for goal_vics in self.__drop_off.values()])
+        self.__update(grid_world)
         return self.__progress
 
-    def __find_drop_off_locations(self, grid_world):
-        goal_vics = {} 
-        all_objs = grid_world.environment_objects
-        for obj_id, obj in all_objs.items():  # go through all objects
-            if "drop_zone_nr" in obj.properties.keys():  # check if the object is part of a drop zone
-                zone_nr = obj.properties["drop_zone_nr"]  # obtain the zone number
-                if obj.properties["is_goal_block"]:  # check if the object is a ghostly goal victim
-                    if zone_nr in goal_vics.keys():  # create or add to the list
-                        goal_vics[zone_nr].append(obj)
-                    else:
-                        goal_vics[zone_nr] = [obj]
-
-        self.__drop_off_zone = {}
-        self.__drop_off = {}
-        for zone_nr in goal_vics.keys():  # go through all drop of zones and fill the drop_off dict
-            # Instantiate the zone's dict.
-            self.__drop_off_zone[zone_nr] = {}
-            self.__drop_off[zone_nr] = {}
-            # Obtain the zone's goal victims.
-            vics = goal_vics[zone_nr].copy()
-            # The number of victims is the maximum number of victims to collect for this zone.
-            max_rank = len(vics)
-            # Find the 'bottom' location
-            bottom_loc = (-np.inf, -np.inf)
-            for vic in vics:
-                if vic.location[1] > bottom_loc[1]:
-                    bottom_loc = vic.location
-            # Now loop through victim lists and add them to their appropriate ranks
-            for rank in range(max_rank):
-                loc = (bottom_loc[0], bottom_loc[1]-rank)
-                # find the victim at that location
-                for vic in vics:
-                    if vic.location == loc:
-                        # Add to self.drop_off
-                        self.__drop_off_zone[zone_nr][rank] = [loc, vic.properties['img_name'][8:-4], None]
-                        for i in self.__drop_off_zone.keys():
-                            self.__drop_off[i] = {}
-                            vals = list(self.__drop_off_zone[i].values())
-                            vals.reverse()
-                            for j in range(len(self.__drop_off_zone[i].keys())):
-                                self.__drop_off[i][j] = vals[j]
+    def __update(self, grid_world):
+        # find all drop off locations, its tile ID's and goal victims, and check all of them the first time
+        if self.__drop_off =={}:
+            if self.__drop_off_table is None:
+                self.__drop_off_table = DropOffTable.from_grid_world(grid_world)
+            # The ticks at which the victims were dropped on their ranks are kept next to the table
+            self.__drop_off = {zone_nr: {rank: [drop.location, drop.victim, None] for rank, drop in enumerate(ranks)}
+                               for zone_nr, ranks in self.__drop_off_table.zones()}
+            self.__cell_ranks = {tuple(vic_data[0]): (zone_nr, rank) for zone_nr, goal_vics in self.__drop_off.items()
+                                 for rank, vic_data in goal_vics.items()}
+            self.__changed_ranks = set(self.__cell_ranks.values())
+        if not self.__changed_ranks:
+            return
+        # Go through the changed drop zone cells, and check if the victims are there on the right spot
+        self.__is_satisfied, progress = self.__check_completion(grid_world)
+        # Progress in percentage
+        self.__progress = progress / sum([len(goal_vics) for goal_vics in self.__drop_off.values()])
 
     def __check_completion(self, grid_world):
         # Get the current tick number
         curr_tick = grid_world.current_nr_ticks
-        # loop through all zones, check the victims and set the tick if satisfied
-        for zone_nr, goal_vics in self.__drop_off.items():
-            # Go through all ranks of this drop off zone
-            for rank, vic_data in goal_vics.items():
-                loc = vic_data[0]  # the location, needed to find victims here
-                shape = vic_data[1]  # the desired shape
-                tick = vic_data[2]
-
-                # Retrieve all objects, the object ids at the location and obtain all victims from it
-                all_objs = grid_world.environment_objects
-                obj_ids = grid_world.get_objects_in_range(loc, object_type=EnvObject, sense_range=0)
-                vics = [all_objs[obj_id] for obj_id in obj_ids
-                          if obj_id in all_objs.keys() and "is_collectable" in all_objs[obj_id].properties.keys()]
-                vics = [v for v in vics if v.properties["is_collectable"]]
-
-                # Check if there is a victim, and if so if it is the right one and the tick is not yet set, then set the current tick and increase the score.
-                if len(vics) > 0 and vics[0].properties['img_name'][8:-4] == shape and tick is None:
-                    self.__drop_off[zone_nr][rank][2] = curr_tick
-                    if 'critical' in vics[0].properties['img_name'][8:-4]:
-                        self.__score+=6
-                    if 'mild' in vics[0].properties['img_name'][8:-4]:
-                        self.__score+=3
-                # Deduct points from the score when victims are picked up from drop zone
-                elif len(vics) == 0:
-                    if self.__drop_off[zone_nr][rank][2] != None:
-                        self.__drop_off[zone_nr][rank][2] = None
-                        if rank in [0,1,2,3]:
-                            self.__score-=6
-                        if rank in [4,5,6,7]:
-                            self.__score-=3
+        # loop through the changed ranks of all zones, check the victims and set the tick if satisfied
+        for zone_nr, rank in sorted(self.__changed_ranks):
+            vic_data = self.__drop_off[zone_nr][rank]
+            loc = vic_data[0]  # the location, needed to find victims here
+            shape = vic_data[1]  # the desired shape
+            tick = vic_data[2]
+
+            # Retrieve all objects, the object ids at the location and obtain all victims from it
+            all_objs = grid_world.environment_objects
+            obj_ids = grid_world.get_objects_in_range(loc, object_type=EnvObject, sense_range=0)
+            vics = [all_objs[obj_id] for obj_id in obj_ids
+                      if obj_id in all_objs.keys() and "is_collectable" in all_objs[obj_id].properties.keys()]
+            vics = [v for v in vics if v.properties["is_collectable"]]
+
+            # Check if there is a victim, and if so if it is the right one and the tick is not yet set, then set the current tick and increase the score.
+            if len(vics) > 0 and vics[0].properties['img_name'][8:-4] == shape and tick is None:
+                self.__drop_off[zone_nr][rank][2] = curr_tick
+                if 'critical' in vics[0].properties['img_name'][8:-4]:
+                    self.__score+=6
+                if 'mild' in vics[0].properties['img_name'][8:-4]:
+                    self.__score+=3
+            # Deduct points from the score when victims are picked up from drop zone
+            elif len(vics) == 0:
+                if self.__drop_off[zone_nr][rank][2] != None:
+                    self.__drop_off[zone_nr][rank][2] = None
+                    if rank in [0,1,2,3]:
+                        self.__score-=6
+                    if rank in [4,5,6,7]:
+                        self.__score-=3
+        self.__changed_ranks = set()
 
         # Now check if all victims are collected
         is_satisfied = True